@@ -0,0 +1,90 @@
+"""
+Action Event Store - Durable, append-only history of actions.
+Every state an action reaches is written as a new row; rows are never updated.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import aliased
+
+from ..database import AsyncSessionLocal
+from ..db_models import ActionEventDB
+
+PENDING = "pending"
+
+
+class ActionEventStore:
+    """
+    Append-only action event log on SQLite.
+
+    The log ("history") is every non-pending event in sequence order. Pending
+    events are recorded too, so actions awaiting approval survive a restart.
+    """
+
+    async def append(self, action) -> int:
+        """Record the current state of an action. Returns its sequence number."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(insert(ActionEventDB).values(
+                action_id=action.id,
+                type=action.type.value,
+                source=action.source.value,
+                status=action.status.value,
+                params=action.params,
+                result=action.result,
+                error=action.error,
+                created_at=action.created_at,
+                executed_at=action.executed_at
+            ))
+            await db.commit()
+            return result.inserted_primary_key[0]
+
+    async def page(self, limit: int, before_seq: Optional[int] = None) -> Tuple[List[Tuple[int, Dict[str, Any]]], Optional[int]]:
+        """
+        Read up to `limit` history entries older than `before_seq`, oldest first.
+        Returns the entries as (seq, action dict) and the cursor for the previous page.
+        """
+        stmt = select(ActionEventDB).where(ActionEventDB.status != PENDING)
+        if before_seq is not None:
+            stmt = stmt.where(ActionEventDB.seq < before_seq)
+        stmt = stmt.order_by(ActionEventDB.seq.desc()).limit(limit + 1)
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(stmt)).scalars().all()
+        entries = [(row.seq, self._to_dict(row)) for row in rows[:limit]]
+        entries.reverse()
+        next_cursor = entries[0][0] if len(rows) > limit else None
+        return entries, next_cursor
+
+    async def count_history(self) -> int:
+        async with AsyncSessionLocal() as db:
+            return (await db.execute(
+                select(func.count()).select_from(ActionEventDB).where(ActionEventDB.status != PENDING)
+            )).scalar()
+
+    async def open_pending(self) -> List[Dict[str, Any]]:
+        """Pending events not followed by any later event for the same action."""
+        later = aliased(ActionEventDB)
+        stmt = select(ActionEventDB).where(
+            ActionEventDB.status == PENDING,
+            ~select(later.seq).where(
+                later.action_id == ActionEventDB.action_id,
+                later.seq > ActionEventDB.seq
+            ).exists()
+        ).order_by(ActionEventDB.seq)
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(stmt)).scalars().all()
+        return [self._to_dict(row) for row in rows]
+
+    @staticmethod
+    def _to_dict(row: ActionEventDB) -> Dict[str, Any]:
+        return {
+            "id": row.action_id,
+            "type": row.type,
+            "source": row.source,
+            "params": row.params or {},
+            "status": row.status,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "executed_at": row.executed_at.isoformat() if row.executed_at else None,
+            "result": row.result,
+            "error": row.error
+        }
@@ -3,18 +3,26 @@ Action Executor - Handles all operational commands.
 Provides a unified interface for both human operators and AI agents.
 """
 
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Deque, Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+import asyncio
 import uuid
 
+from ..config import settings
+from ..services.concurrency import retry_on_conflict
+from ..services.response_times import FIRST_ASSIGNMENT, ON_SCENE, RESOLUTION, response_time_service
+from .event_store import ActionEventStore
+
 
 class ActionType(str, Enum):
     DEPLOY_ASSET = "deploy_asset"
     RECALL_ASSET = "recall_asset"
     ASSIGN_ASSET = "assign_asset"
     UNASSIGN_ASSET = "unassign_asset"
+    ARRIVE_ON_SCENE = "arrive_on_scene"
     CREATE_INCIDENT = "create_incident"
     RESOLVE_INCIDENT = "resolve_incident"
     UPDATE_PRIORITY = "update_priority"
@@ -61,18 +69,69 @@ class Action:
             "error": self.error
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Action":
+        return cls(
+            id=data["id"],
+            type=ActionType(data["type"]),
+            source=ActionSource(data["source"]),
+            params=data.get("params") or {},
+            status=ActionStatus(data["status"]),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            executed_at=datetime.fromisoformat(data["executed_at"]) if data.get("executed_at") else None,
+            result=data.get("result"),
+            error=data.get("error")
+        )
+
 
 class ActionExecutor:
     """
     Executes actions on the system.
     Acts as the central command processor for all operations.
+    
+    Every logged action is appended to a durable event store. Only the most
+    recent entries are kept in memory (a ring buffer); older history is paged
+    from disk. Pending actions are indexed by id.
     """
     
-    def __init__(self):
-        self.action_log: List[Action] = []
-        self.pending_actions: List[Action] = []
+    def __init__(self, event_store: ActionEventStore = None):
+        self.event_store = event_store or ActionEventStore()
+        # Recent history as (seq, action dict), oldest first
+        self.recent_log: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=settings.ACTION_LOG_BUFFER_SIZE)
+        self.pending_actions: Dict[str, Action] = {}
+        self.total_logged = 0
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+    
+    async def _ensure_loaded(self):
+        """Restore recent history and open pending actions from the event store once."""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            entries, _ = await self.event_store.page(self.recent_log.maxlen)
+            self.recent_log.extend(entries)
+            self.total_logged = await self.event_store.count_history()
+            for data in await self.event_store.open_pending():
+                self.pending_actions[data["id"]] = Action.from_dict(data)
+            self._loaded = True
     
-    def create_action(
+    def reset(self):
+        """Drop cached history and pending actions; they are re-read from the event store on next use."""
+        self.recent_log.clear()
+        self.pending_actions.clear()
+        self.total_logged = 0
+        self._loaded = False
+    
+    async def _log(self, action: Action):
+        """Append a finished action to the durable log and the recent buffer."""
+        await self._ensure_loaded()
+        seq = await self.event_store.append(action)
+        self.recent_log.append((seq, action.to_dict()))
+        self.total_logged += 1
+    
+    async def create_action(
         self,
         action_type: ActionType,
         params: Dict[str, Any],
@@ -87,13 +146,15 @@ class ActionExecutor:
         )
         
         if auto_execute:
-            return self.execute(action)
+            return await self.execute(action)
         else:
+            await self._ensure_loaded()
             action.status = ActionStatus.PENDING
-            self.pending_actions.append(action)
+            await self.event_store.append(action)
+            self.pending_actions[action.id] = action
             return action
     
-    def execute(self, action: Action) -> Action:
+    async def execute(self, action: Action) -> Action:
         """Execute an action and update system state"""
         from ..services.data_feeds import data_feed_service
         
@@ -101,19 +162,21 @@ class ActionExecutor:
         
         try:
             if action.type == ActionType.DEPLOY_ASSET:
-                result = self._deploy_asset(action.params, data_feed_service)
+                result = await self._deploy_asset(action.params, data_feed_service)
             elif action.type == ActionType.RECALL_ASSET:
-                result = self._recall_asset(action.params, data_feed_service)
+                result = await self._recall_asset(action.params, data_feed_service)
             elif action.type == ActionType.ASSIGN_ASSET:
-                result = self._assign_asset(action.params, data_feed_service)
+                result = await self._assign_asset(action.params, data_feed_service)
             elif action.type == ActionType.UNASSIGN_ASSET:
-                result = self._unassign_asset(action.params, data_feed_service)
+                result = await self._unassign_asset(action.params, data_feed_service)
+            elif action.type == ActionType.ARRIVE_ON_SCENE:
+                result = await self._arrive_on_scene(action.params, data_feed_service)
             elif action.type == ActionType.CREATE_INCIDENT:
-                result = self._create_incident(action.params, data_feed_service)
+                result = await self._create_incident(action.params, data_feed_service)
             elif action.type == ActionType.RESOLVE_INCIDENT:
-                result = self._resolve_incident(action.params, data_feed_service)
+                result = await self._resolve_incident(action.params, data_feed_service)
             elif action.type == ActionType.UPDATE_PRIORITY:
-                result = self._update_priority(action.params, data_feed_service)
+                result = await self._update_priority(action.params, data_feed_service)
             else:
                 raise ValueError(f"Unknown action type: {action.type}")
             
@@ -125,30 +188,27 @@ class ActionExecutor:
             action.status = ActionStatus.FAILED
             action.error = str(e)
         
-        self.action_log.append(action)
+        await self._log(action)
         
         # Broadcast real-time update
         try:
-            import asyncio
             from ..services.websocket import manager
             
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                msg = {
-                    "type": "action_log",
-                    "action": action.type.value,
-                    "message": action.result.get("message") if action.result else "Action executed"
-                }
-                asyncio.run_coroutine_threadsafe(manager.broadcast(msg), loop)
-                
-                # Also trigger data refresh
-                asyncio.run_coroutine_threadsafe(manager.broadcast({"type": "update"}), loop)
+            msg = {
+                "type": "action_log",
+                "action": action.type.value,
+                "message": action.result.get("message") if action.result else "Action executed"
+            }
+            await manager.broadcast(msg)
+            
+            # Also trigger data refresh
+            await manager.broadcast({"type": "update"})
         except Exception as e:
             print(f"WS Broadcast failed: {e}")
 
         return action
     
-    def _deploy_asset(self, params: Dict, service) -> Dict:
+    async def _deploy_asset(self, params: Dict, service) -> Dict:
         """Deploy an asset to an incident location"""
         asset_id = params.get("asset_id")
         incident_id = params.get("incident_id")
@@ -161,13 +221,23 @@ class ActionExecutor:
         if not incident:
             raise ValueError(f"Incident {incident_id} not found")
         
-        # Update asset status and location
-        service.update_asset(
-            asset_id,
-            status="en_route",
-            assigned_incident=incident_id,
-            eta_minutes=params.get("eta_minutes", 15)
-        )
+        # Assign the asset; it goes en route to the incident. The write is
+        # conditional on the asset version we decided on; if another dispatcher
+        # moved the asset meanwhile, give up rather than take it from them.
+        observed_incident = asset.assigned_incident
+        
+        async def attempt():
+            current = service.get_asset(asset_id)
+            if current is None:
+                raise ValueError(f"Asset {asset_id} not found")
+            if current.assigned_incident not in (observed_incident, incident_id):
+                raise ValueError(f"{current.name} was dispatched to {current.assigned_incident} concurrently")
+            if not await service.aassign_asset(asset_id, incident_id, params.get("eta_minutes", 15),
+                                               expected_version=current.version):
+                raise ValueError(f"Incident {incident_id} not found")
+        
+        await retry_on_conflict(attempt)
+        self._observe_assignment(incident, asset)
         
         return {
             "asset_id": asset_id,
@@ -176,7 +246,7 @@ class ActionExecutor:
             "message": f"{asset.name} deployed to {incident_id}"
         }
     
-    def _recall_asset(self, params: Dict, service) -> Dict:
+    async def _recall_asset(self, params: Dict, service) -> Dict:
         """Recall an asset back to base"""
         asset_id = params.get("asset_id")
         asset = service.get_asset(asset_id)
@@ -184,12 +254,7 @@ class ActionExecutor:
         if not asset:
             raise ValueError(f"Asset {asset_id} not found")
         
-        service.update_asset(
-            asset_id,
-            status="returning",
-            assigned_incident=None,
-            eta_minutes=None
-        )
+        await retry_on_conflict(lambda: self._release(service, asset_id, "returning"))
         
         return {
             "asset_id": asset_id,
@@ -197,12 +262,20 @@ class ActionExecutor:
             "message": f"{asset.name} recalled to base"
         }
     
-    def _assign_asset(self, params: Dict, service) -> Dict:
+    async def _assign_asset(self, params: Dict, service) -> Dict:
         """Assign an asset to an incident"""
         asset_id = params.get("asset_id")
         incident_id = params.get("incident_id")
+        incident = service.get_incident(incident_id)
         
-        service.assign_asset(asset_id, incident_id)
+        async def attempt():
+            asset = service.get_asset(asset_id)
+            if asset is None or not await service.aassign_asset(asset_id, incident_id,
+                                                                  expected_version=asset.version):
+                raise ValueError(f"Asset {asset_id} or incident {incident_id} not found")
+        
+        await retry_on_conflict(attempt)
+        self._observe_assignment(incident, service.get_asset(asset_id))
         
         return {
             "asset_id": asset_id,
@@ -210,18 +283,52 @@ class ActionExecutor:
             "message": f"Asset {asset_id} assigned to {incident_id}"
         }
     
-    def _unassign_asset(self, params: Dict, service) -> Dict:
+    async def _unassign_asset(self, params: Dict, service) -> Dict:
         """Unassign an asset from its current incident"""
         asset_id = params.get("asset_id")
         
-        service.release_asset(asset_id)
+        await retry_on_conflict(lambda: self._release(service, asset_id, "available"))
         
         return {
             "asset_id": asset_id,
             "message": f"Asset {asset_id} released"
         }
     
-    def _create_incident(self, params: Dict, service) -> Dict:
+    async def _arrive_on_scene(self, params: Dict, service) -> Dict:
+        """Mark an assigned asset as arrived at its incident"""
+        asset_id = params.get("asset_id")
+        asset = service.get_asset(asset_id)
+        
+        if not asset:
+            raise ValueError(f"Asset {asset_id} not found")
+        if not asset.assigned_incident:
+            raise ValueError(f"{asset.name} is not assigned to an incident")
+        if asset.status == "on_scene":
+            raise ValueError(f"{asset.name} is already on scene")
+        incident_id = asset.assigned_incident
+        
+        async def attempt():
+            current = service.get_asset(asset_id)
+            if current is None:
+                raise ValueError(f"Asset {asset_id} not found")
+            if current.assigned_incident != incident_id:
+                raise ValueError(f"{current.name} was reassigned concurrently")
+            await service.aupdate_asset(asset_id, {"status": "on_scene", "eta_minutes": 0},
+                                        expected_version=current.version)
+        
+        await retry_on_conflict(attempt)
+        incident = service.get_incident(incident_id)
+        if incident is not None:
+            response_time_service.observe(ON_SCENE, incident, [asset.type])
+        
+        return {
+            "asset_id": asset_id,
+            "incident_id": incident_id,
+            "new_status": "on_scene",
+            "message": f"{asset.name} on scene at {incident_id}"
+        }
+    
+    async def _create_incident(self, params: Dict, service) -> Dict:
         """Create a new incident"""
         from ..models import Incident, Location
         
@@ -239,35 +346,40 @@ class ActionExecutor:
             status="active"
         )
         
-        service.add_incident(incident)
+        # Duplicate reports are folded into the matching incident
+        incident, merged = await service.areport_incident(incident)
         
         return {
             "incident_id": incident.id,
-            "message": f"Created incident {incident.id}"
+            "merged": merged,
+            "message": f"Merged report into incident {incident.id}" if merged else f"Created incident {incident.id}"
         }
     
-    def _resolve_incident(self, params: Dict, service) -> Dict:
+    async def _resolve_incident(self, params: Dict, service) -> Dict:
         """Mark an incident as resolved"""
         incident_id = params.get("incident_id")
+        incident = service.get_incident(incident_id)
+        resolved_at = datetime.utcnow()
         
-        service.update_incident(incident_id, status="resolved")
-        
-        # Release any assigned assets
-        for asset in service.get_all_assets():
-            if asset.assigned_incident == incident_id:
-                service.release_asset(asset.id)
+        # Resolving releases every assigned asset in the same transaction
+        await retry_on_conflict(lambda: self._update_incident(
+            service, incident_id, {"status": "resolved", "resolved_at": resolved_at}
+        ))
+        if incident is not None and incident.status != "resolved":
+            assets = [service.get_asset(a) for a in incident.assigned_assets]
+            response_time_service.observe(RESOLUTION, incident, [a.type for a in assets if a], at=resolved_at)
         
         return {
             "incident_id": incident_id,
             "message": f"Incident {incident_id} resolved"
         }
     
-    def _update_priority(self, params: Dict, service) -> Dict:
+    async def _update_priority(self, params: Dict, service) -> Dict:
         """Update incident priority"""
         incident_id = params.get("incident_id")
         new_priority = params.get("priority")
         
-        service.update_incident(incident_id, priority=new_priority)
+        await retry_on_conflict(lambda: self._update_incident(service, incident_id, {"priority": new_priority}))
         
         return {
             "incident_id": incident_id,
@@ -275,31 +387,65 @@ class ActionExecutor:
             "message": f"Priority updated to {new_priority}"
         }
     
-    def get_action_log(self, limit: int = 50) -> List[Dict]:
-        """Get recent action log"""
-        return [a.to_dict() for a in self.action_log[-limit:]]
+    @staticmethod
+    def _observe_assignment(incident, asset):
+        """Count the time to first assignment if `incident` (as read before the write) had no assets yet."""
+        if incident is not None and asset is not None and not incident.assigned_assets:
+            response_time_service.observe(FIRST_ASSIGNMENT, incident, [asset.type])
+
+    # Each write is conditional on the version just read from the store and
+    # retried on conflict, so concurrent dispatchers never overwrite each other.
+    @staticmethod
+    async def _release(service, asset_id: str, status: str):
+        asset = service.get_asset(asset_id)
+        if asset is None or not await service.arelease_asset(asset_id, status=status,
+                                                              expected_version=asset.version):
+            raise ValueError(f"Asset {asset_id} not found")
+
+    @staticmethod
+    async def _update_incident(service, incident_id: str, updates: Dict):
+        incident = service.get_incident(incident_id)
+        if incident is None or not await service.aupdate_incident(incident_id, updates,
+                                                                   expected_version=incident.version):
+            raise ValueError(f"Incident {incident_id} not found")
+
+    async def get_action_log(self, limit: int = 50, cursor: Optional[int] = None) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Get a page of the action log, oldest first.
+        Returns the actions and a cursor for the page before them (None at the start).
+        """
+        await self._ensure_loaded()
+        buffered = len(self.recent_log)
+        if cursor is None and (limit <= buffered or buffered == self.total_logged):
+            entries = list(self.recent_log)[-limit:] if limit > 0 else []
+            older = self.total_logged > len(entries)
+            next_cursor = entries[0][0] if entries and older else None
+        else:
+            entries, next_cursor = await self.event_store.page(limit, before_seq=cursor)
+        return [data for _, data in entries], next_cursor
     
-    def get_pending_actions(self) -> List[Dict]:
+    async def get_pending_actions(self) -> List[Dict]:
         """Get actions awaiting approval"""
-        return [a.to_dict() for a in self.pending_actions]
+        await self._ensure_loaded()
+        return [a.to_dict() for a in self.pending_actions.values()]
     
-    def approve_action(self, action_id: str) -> Action:
+    async def approve_action(self, action_id: str) -> Action:
         """Approve and execute a pending action"""
-        for i, action in enumerate(self.pending_actions):
-            if action.id == action_id:
-                self.pending_actions.pop(i)
-                return self.execute(action)
-        raise ValueError(f"Action {action_id} not found")
+        await self._ensure_loaded()
+        action = self.pending_actions.pop(action_id, None)
+        if action is None:
+            raise ValueError(f"Action {action_id} not found")
+        return await self.execute(action)
     
-    def reject_action(self, action_id: str) -> Action:
+    async def reject_action(self, action_id: str) -> Action:
         """Reject a pending action"""
-        for i, action in enumerate(self.pending_actions):
-            if action.id == action_id:
-                action.status = ActionStatus.REJECTED
-                self.pending_actions.pop(i)
-                self.action_log.append(action)
-                return action
-        raise ValueError(f"Action {action_id} not found")
+        await self._ensure_loaded()
+        action = self.pending_actions.pop(action_id, None)
+        if action is None:
+            raise ValueError(f"Action {action_id} not found")
+        action.status = ActionStatus.REJECTED
+        await self._log(action)
+        return action
 
 
 # Global executor instance
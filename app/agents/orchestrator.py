@@ -41,14 +41,20 @@ class AgentOrchestrator:
     """
     
     def __init__(self):
-        self.agents = {}
+        self._agents = None
         self.session: Optional[AgentSession] = None
         self.message_queue: asyncio.Queue = asyncio.Queue()
-        self._initialize_agents()
+
+    @property
+    def agents(self) -> Dict[AgentRole, Any]:
+        """The specialized agents, created on first use"""
+        if self._agents is None:
+            self._initialize_agents()
+        return self._agents
     
     def _initialize_agents(self):
         """Create all specialized agents"""
-        self.agents = {
+        self._agents = {
             AgentRole.SITUATION_ANALYST: SituationAnalystAgent(cerebras_client),
             AgentRole.RESOURCE_COORDINATOR: ResourceCoordinatorAgent(cerebras_client),
             AgentRole.ROUTING_AGENT: RoutingAgent(cerebras_client),
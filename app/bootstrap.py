@@ -0,0 +1,52 @@
+"""
+Database bootstrap: schema migration and demo data seeding.
+
+Both are explicit steps (`python -m app.cli init`) rather than import-time
+side effects, so a worker starting against a prepared database only has to
+read PRAGMA user_version before it can serve requests.
+"""
+from .config import settings
+from .database import SCHEMA_VERSION, SessionLocal, engine, get_schema_version
+from .services.data_feeds import backfill_assignments, data_feed_service, migrate_database
+from .services.rollups import backfill_incident_rollups
+from .utils.security import seed_default_users
+
+
+def migrate(bind=None) -> int:
+    """Bring the schema and data migrations up to date. Returns the schema version."""
+    migrate_database(bind or engine)
+    return SCHEMA_VERSION
+
+
+def seed() -> dict:
+    """Insert demo incidents, assets, weather and default users where missing."""
+    seeded = {"demo_data": data_feed_service.seed_demo_data()}
+    # Demo assets start out assigned through the legacy column
+    backfill_assignments()
+    # Demo incidents are inserted directly, not through the write paths that maintain rollups
+    backfill_incident_rollups()
+    db = SessionLocal()
+    try:
+        seeded["users"] = seed_default_users(db)
+    finally:
+        db.close()
+    return seeded
+
+
+def ensure_database_ready():
+    """
+    Startup check. A current database costs one PRAGMA read. An outdated one
+    is migrated and seeded in place when AUTO_MIGRATE is on; otherwise startup
+    fails, pointing at the CLI.
+    """
+    current = get_schema_version()
+    if current == SCHEMA_VERSION:
+        return
+    if not settings.AUTO_MIGRATE:
+        raise RuntimeError(
+            f"Database schema is at version {current}, expected {SCHEMA_VERSION}. "
+            "Run `python -m app.cli init` (or set AUTO_MIGRATE=true)."
+        )
+    print(f"Migrating database schema {current} -> {SCHEMA_VERSION}...")
+    migrate()
+    seed()
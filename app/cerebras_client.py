@@ -4,23 +4,40 @@ Provides methods for emergency coordination AI capabilities.
 """
 import json
 import time
-from typing import Optional, List, Dict, Any
-from cerebras.cloud.sdk import Cerebras
+import threading
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
 from .config import settings
 
+if TYPE_CHECKING:
+    from cerebras.cloud.sdk import Cerebras
+
 
 class CerebrasClient:
-    """Wrapper for Cerebras API providing emergency coordination AI capabilities."""
+    """
+    Wrapper for Cerebras API providing emergency coordination AI capabilities.
+    The SDK is imported and its client built on first use, not at startup.
+    """
     
     def __init__(self):
-        self.client: Optional[Cerebras] = None
+        self._client: Optional["Cerebras"] = None
+        self._initialized = False
+        self._init_lock = threading.Lock()
         self.model = settings.CEREBRAS_MODEL
-        self._initialize_client()
+
+    @property
+    def client(self) -> Optional["Cerebras"]:
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self._initialize_client()
+                    self._initialized = True
+        return self._client
     
     def _initialize_client(self):
         """Initialize the Cerebras client if API key is configured."""
         if settings.is_configured:
-            self.client = Cerebras(api_key=settings.CEREBRAS_API_KEY)
+            from cerebras.cloud.sdk import Cerebras
+            self._client = Cerebras(api_key=settings.CEREBRAS_API_KEY)
         else:
             print("⚠️ Cerebras API key not configured. AI features will use mock responses.")
     
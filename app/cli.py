@@ -0,0 +1,97 @@
+"""
+Command line tools for operating the Emergency Coordination System.
+
+Usage:
+    python -m app.cli migrate   # create/upgrade tables, indexes and triggers
+    python -m app.cli seed      # insert demo data and default users if missing
+    python -m app.cli init      # migrate, then seed
+    python -m app.cli status    # show the database's schema version
+    python -m app.cli export FILE    # write a binary snapshot of the operational state
+    python -m app.cli restore FILE   # replace the operational state with a snapshot
+"""
+import argparse
+import sys
+import time
+
+from .config import settings
+from .database import SCHEMA_VERSION, get_schema_version
+
+
+def cmd_migrate(args) -> int:
+    from .bootstrap import migrate
+    before = get_schema_version()
+    migrate()
+    print(f"Schema migrated: version {before} -> {SCHEMA_VERSION} ({settings.DATABASE_PATH})")
+    return 0
+
+
+def cmd_seed(args) -> int:
+    from .bootstrap import seed
+    if get_schema_version() != SCHEMA_VERSION:
+        print("Database is not migrated; run `python -m app.cli migrate` first", file=sys.stderr)
+        return 1
+    seeded = seed()
+    print(f"Demo data: {'inserted' if seeded['demo_data'] else 'already present'}; "
+          f"users: {'created' if seeded['users'] else 'already present'}")
+    return 0
+
+
+def cmd_init(args) -> int:
+    return cmd_migrate(args) or cmd_seed(args)
+
+
+def cmd_status(args) -> int:
+    current = get_schema_version()
+    state = "up to date" if current == SCHEMA_VERSION else "needs migration"
+    print(f"{settings.DATABASE_PATH}: schema version {current} (expected {SCHEMA_VERSION}, {state})")
+    return 0 if current == SCHEMA_VERSION else 1
+
+
+def cmd_export(args) -> int:
+    from .services.snapshot import write_snapshot
+    start = time.perf_counter()
+    with open(args.file, "wb") as f:
+        counts = write_snapshot(f)
+    print(f"Exported {sum(counts.values())} rows to {args.file} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+def cmd_restore(args) -> int:
+    from .services.snapshot import SnapshotError, restore_snapshot
+    if get_schema_version() != SCHEMA_VERSION:
+        print("Database is not migrated; run `python -m app.cli migrate` first", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    try:
+        with open(args.file, "rb") as f:
+            counts = restore_snapshot(f)
+    except SnapshotError as e:
+        print(f"Cannot restore {args.file}: {e}", file=sys.stderr)
+        return 1
+    print(f"Restored {sum(counts.values())} rows from {args.file} in {time.perf_counter() - start:.1f}s")
+    print("Restart running workers so they reload their in-memory state.")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, handler, help_text in (
+        ("migrate", cmd_migrate, "Create or upgrade tables, indexes and search triggers"),
+        ("seed", cmd_seed, "Insert demo data and default users if missing"),
+        ("init", cmd_init, "Migrate, then seed"),
+        ("status", cmd_status, "Show the database schema version"),
+        ("export", cmd_export, "Write a binary snapshot of the operational state to FILE"),
+        ("restore", cmd_restore, "Replace the operational state with the snapshot in FILE"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.set_defaults(handler=handler)
+        if name in ("export", "restore"):
+            command.add_argument("file")
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,59 @@ class Settings:
     PORT: int = int(os.getenv("PORT", "8000"))
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
     
+    # Storage Configuration
+    DATABASE_PATH: str = os.getenv("DATABASE_PATH", "./data/hurricane.db")
+    # "tuned" enables WAL and the pragmas below; "default" keeps SQLite's stock settings
+    SQLITE_PROFILE: str = os.getenv("SQLITE_PROFILE", "tuned")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_MMAP_SIZE_MB: int = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "8"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "8"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Migrate and seed an outdated database on startup. Turn off for production
+    # workers and run `python -m app.cli init` once per deploy instead.
+    AUTO_MIGRATE: bool = os.getenv("AUTO_MIGRATE", "true").lower() == "true"
+    
+    # Weather Feed Configuration
+    WEATHER_INGEST_INTERVAL_SECONDS: int = int(os.getenv("WEATHER_INGEST_INTERVAL_SECONDS", "30"))
+    # Raw observations older than this are compacted into per-bucket rollups
+    WEATHER_RAW_RETENTION_HOURS: int = int(os.getenv("WEATHER_RAW_RETENTION_HOURS", "24"))
+    WEATHER_ROLLUP_BUCKET_MINUTES: int = int(os.getenv("WEATHER_ROLLUP_BUCKET_MINUTES", "60"))
+    
+    # Incident Archive Configuration
+    # Resolved incidents older than this move from `incidents` to `incidents_archive`
+    ARCHIVE_RESOLVED_AFTER_HOURS: int = int(os.getenv("ARCHIVE_RESOLVED_AFTER_HOURS", "24"))
+    ARCHIVE_INTERVAL_MINUTES: int = int(os.getenv("ARCHIVE_INTERVAL_MINUTES", "15"))
+    
+    # Action Log Configuration
+    # Number of recent action log entries kept in memory; older ones are read from disk
+    ACTION_LOG_BUFFER_SIZE: int = int(os.getenv("ACTION_LOG_BUFFER_SIZE", "500"))
+    # Attempts an action makes when its write hits a concurrent version change
+    CONFLICT_RETRY_ATTEMPTS: int = int(os.getenv("CONFLICT_RETRY_ATTEMPTS", "5"))
+    
+    # Asset Telemetry Configuration
+    # Position fixes are coalesced per asset in memory and written in bulk this often
+    TELEMETRY_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("TELEMETRY_FLUSH_INTERVAL_SECONDS", "5"))
+    # Fixes dated further ahead of server time than this are dropped, so a
+    # device with a fast clock cannot pin its asset against newer fixes
+    TELEMETRY_MAX_CLOCK_SKEW_SECONDS: float = float(os.getenv("TELEMETRY_MAX_CLOCK_SKEW_SECONDS", "120"))
+    
+    # Incident Report Clustering
+    # A new report joins an active incident of the same type within this radius
+    # whose reports span to within the window of it, instead of creating a new one (0 disables)
+    INCIDENT_CLUSTER_RADIUS_METERS: float = float(os.getenv("INCIDENT_CLUSTER_RADIUS_METERS", "250"))
+    INCIDENT_CLUSTER_WINDOW_MINUTES: int = int(os.getenv("INCIDENT_CLUSTER_WINDOW_MINUTES", "60"))
+    
+    # Response-Time Metrics
+    # Relative error of the p50/p95/p99 quantile sketches, and how often they are saved
+    RESPONSE_SKETCH_ACCURACY: float = float(os.getenv("RESPONSE_SKETCH_ACCURACY", "0.01"))
+    RESPONSE_SKETCH_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("RESPONSE_SKETCH_FLUSH_INTERVAL_SECONDS", "30"))
+    
+    # Flood Zone Configuration
+    # GeoJSON FeatureCollection of zone polygons; each feature names its zone in properties.zone
+    FLOOD_ZONES_PATH: str = os.getenv("FLOOD_ZONES_PATH", "./data/flood_zones.geojson")
+    
     # Application Settings
     APP_NAME: str = "AI Emergency Coordination System"
     APP_VERSION: str = "1.0.0"
@@ -1,23 +1,153 @@
-from sqlalchemy import create_engine
+from typing import Dict
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 
+from .config import settings
+
 # Create database directory if it doesn't exist
-os.makedirs("data", exist_ok=True)
+os.makedirs(os.path.dirname(settings.DATABASE_PATH) or ".", exist_ok=True)
+
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{settings.DATABASE_PATH}"
+ASYNC_SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///{settings.DATABASE_PATH}"
+
+
+def sqlite_pragmas(profile: str) -> Dict[str, str]:
+    """
+    PRAGMAs applied to every new SQLite connection for a storage profile.
+
+    "tuned" switches to write-ahead logging so readers never block the single
+    writer, relaxes fsync to once per checkpoint (safe in WAL mode), and sizes
+    the page cache and memory map for a read-heavy dashboard workload.
+    "default" applies nothing and keeps SQLite's rollback journal.
+    """
+    if profile == "default":
+        return {}
+    if profile != "tuned":
+        raise ValueError(f"Unknown SQLITE_PROFILE: {profile}")
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": str(settings.SQLITE_BUSY_TIMEOUT_MS),
+        # Negative cache_size is expressed in KiB rather than pages
+        "cache_size": str(-settings.SQLITE_CACHE_SIZE_KB),
+        "mmap_size": str(settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024),
+        "temp_store": "MEMORY",
+    }
+
+
+def _install_pragmas(sync_engine: Engine, pragmas: Dict[str, str]):
+    if not pragmas:
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _pool_args() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+def create_sqlite_engine(url: str = SQLALCHEMY_DATABASE_URL, profile: str = settings.SQLITE_PROFILE) -> Engine:
+    """Create a pooled synchronous engine configured for a storage profile."""
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000},
+        **_pool_args()
+    )
+    _install_pragmas(engine, sqlite_pragmas(profile))
+    return engine
+
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./data/hurricane.db"
+def create_async_sqlite_engine(url: str = ASYNC_SQLALCHEMY_DATABASE_URL,
+                               profile: str = settings.SQLITE_PROFILE) -> AsyncEngine:
+    """Create a pooled aiosqlite engine configured for a storage profile."""
+    engine = create_async_engine(
+        url,
+        connect_args={"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000},
+        **_pool_args()
+    )
+    _install_pragmas(engine.sync_engine, sqlite_pragmas(profile))
+    return engine
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+
+engine = create_sqlite_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (aiosqlite) for use from the event loop
+async_engine = create_async_sqlite_engine()
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
+
+# Recorded in PRAGMA user_version once a database is fully migrated; bump it
+# whenever a model, index, trigger or data migration is added, so startup can
+# tell a current database from a stale one with a single PRAGMA read.
+SCHEMA_VERSION = 7
+
+
+def get_schema_version(bind: Engine = None) -> int:
+    with (bind or engine).connect() as conn:
+        return conn.execute(text("PRAGMA user_version")).scalar() or 0
+
+
+def set_schema_version(bind: Engine = None, version: int = SCHEMA_VERSION):
+    with (bind or engine).begin() as conn:
+        conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+
+
+def migrate_schema(bind: Engine = None):
+    """
+    Bring the database schema up to date with the models.
+
+    Creates missing tables, adds columns that were introduced after a table
+    was first created (SQLite ADD COLUMN) and creates any missing indexes.
+    Models must be imported before calling this so they are registered on Base.
+    """
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                col_type = column.type.compile(dialect=bind.dialect)
+                default = ""
+                if column.server_default is not None:
+                    arg = column.server_default.arg
+                    default = f" DEFAULT {arg.text if hasattr(arg, 'text') else repr(arg)}"
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {col_type}{default}'))
+    # Looked up by name: reflection (checkfirst) cannot see expression indexes
+    with bind.connect() as conn:
+        existing = set(conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=bind)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, JSON, Index, func, literal_column
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -7,6 +7,15 @@ from .database import Base
 def generate_uuid():
     return str(uuid.uuid4())
 
+
+def resolution_minutes(columns):
+    """
+    Minutes from report to resolution, as a SQL expression over a model or a
+    table's columns. The resolution indexes are built on exactly this
+    expression (with an inline literal), so queries must use it to be served from them.
+    """
+    return (func.julianday(columns.resolved_at) - func.julianday(columns.reported_at)) * literal_column("1440")
+
 class IncidentDB(Base):
     __tablename__ = "incidents"
 
@@ -15,9 +24,13 @@ class IncidentDB(Base):
     priority = Column(String, index=True)
     description = Column(String)
     affected_count = Column(Integer, default=1)
-    status = Column(String, default="active")
+    status = Column(String, default="active", index=True)
     reported_at = Column(DateTime, default=datetime.utcnow)
     resolved_at = Column(DateTime, nullable=True)
+
+    # Duplicate reports clustered into this incident (see report_incident)
+    report_count = Column(Integer, nullable=False, default=1, server_default="1")
+    last_reported_at = Column(DateTime, nullable=True)
     
     # Location fields
     latitude = Column(Float)
@@ -25,16 +38,86 @@ class IncidentDB(Base):
     address = Column(String, nullable=True)
     
     # JSON fields for lists
+    # Legacy: assignments live in AssignmentDB and notes in IncidentNoteDB;
+    # these columns are only read once to backfill those tables
     assigned_assets = Column(JSON, default=list)
     notes = Column(JSON, default=list)
 
+    # Stable integer key of the incident's full-text search row (set by trigger)
+    search_rowid = Column(Integer, nullable=True)
+
+    # Optimistic locking: bumped by every write to the row
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Delta sync: global change version of the last write (0 = never changed)
+    change_version = Column(Integer, default=0, server_default="0", index=True)
+
+    __table_args__ = (
+        # Keyset pagination order and bounding-box filtering
+        Index("ix_incidents_reported_at_id", "reported_at", "id"),
+        Index("ix_incidents_lat_lon", "latitude", "longitude"),
+        Index("ux_incidents_search_rowid", "search_rowid", unique=True),
+    )
+
+class IncidentNoteDB(Base):
+    """Append-only notes on incidents. Indexed for full-text search (incident_notes_fts)."""
+    __tablename__ = "incident_notes"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    incident_id = Column(String, nullable=False)
+    author = Column(String, nullable=True)
+    body = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Notes of one incident, in order
+        Index("ix_incident_notes_incident_id_id", "incident_id", "id"),
+    )
+
+class IncidentArchiveDB(Base):
+    """Cold storage for resolved incidents, moved out of `incidents` after ARCHIVE_RESOLVED_AFTER_HOURS."""
+    __tablename__ = "incidents_archive"
+
+    id = Column(String, primary_key=True)
+    type = Column(String, index=True)
+    priority = Column(String, index=True)
+    description = Column(String)
+    affected_count = Column(Integer)
+    status = Column(String)
+    reported_at = Column(DateTime)
+    resolved_at = Column(DateTime)
+    report_count = Column(Integer, nullable=False, default=1, server_default="1")
+    last_reported_at = Column(DateTime, nullable=True)
+    latitude = Column(Float)
+    longitude = Column(Float)
+    address = Column(String, nullable=True)
+    assigned_assets = Column(JSON)
+    notes = Column(JSON)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # History paging order
+        Index("ix_incidents_archive_resolved_at_id", "resolved_at", "id"),
+    )
+
+# Resolution-time analytics: resolved incidents of each type and priority in
+# order of time to resolution, so percentiles are an index walk, not a sort
+Index(
+    "ix_incidents_resolution", IncidentDB.type, IncidentDB.priority, resolution_minutes(IncidentDB),
+    sqlite_where=IncidentDB.resolved_at.is_not(None)
+)
+Index(
+    "ix_incidents_archive_resolution", IncidentArchiveDB.type, IncidentArchiveDB.priority,
+    resolution_minutes(IncidentArchiveDB), sqlite_where=IncidentArchiveDB.resolved_at.is_not(None)
+)
+
 class AssetDB(Base):
     __tablename__ = "assets"
 
     id = Column(String, primary_key=True, default=generate_uuid)
     name = Column(String)
     type = Column(String, index=True)
-    status = Column(String, default="available")
+    status = Column(String, default="available", index=True)
     capacity = Column(Integer, default=4)
     crew_size = Column(Integer, default=2)
     
@@ -48,11 +131,70 @@ class AssetDB(Base):
     longitude = Column(Float)
     address = Column(String, nullable=True)
 
+    # Optimistic locking: bumped by every write to the row
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Delta sync: global change version of the last write (0 = never changed)
+    change_version = Column(Integer, default=0, server_default="0", index=True)
+
+    __table_args__ = (
+        Index("ix_assets_lat_lon", "latitude", "longitude"),
+    )
+
+class AssetStatusEventDB(Base):
+    """
+    Append-only log of asset status changes, written by triggers on `assets`
+    (app.services.asset_history). A status holds until the asset's next event.
+    """
+    __tablename__ = "asset_status_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    asset_id = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    changed_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # One asset's history in order, and its status as of a given time.
+        # Deliberately no index on changed_at alone: it would lure the planner
+        # into visiting every event before the window for utilization queries.
+        Index("ix_asset_status_events_asset_changed", "asset_id", "changed_at"),
+    )
+
+class AssignmentDB(Base):
+    """
+    Which asset serves (or served) which incident. Rows with released_at NULL
+    are live, and an asset has at most one; released rows are the history.
+    """
+    __tablename__ = "assignments"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    asset_id = Column(String, nullable=False)
+    incident_id = Column(String, nullable=False)
+    assigned_at = Column(DateTime, default=datetime.utcnow)
+    released_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # incident -> assets lookups (covering)
+        Index("ix_assignments_incident_id", "incident_id", "released_at", "asset_id"),
+        # An asset serves at most one incident at a time
+        Index("ux_assignments_live_asset", "asset_id", unique=True, sqlite_where=released_at.is_(None)),
+    )
+
+class TombstoneDB(Base):
+    """Deleted incidents/assets, kept so delta sync can tell clients to drop them."""
+    __tablename__ = "tombstones"
+
+    entity = Column(String, primary_key=True)  # 'incident' or 'asset'
+    entity_id = Column(String, primary_key=True)
+    change_version = Column(Integer, index=True)
+    deleted_at = Column(DateTime, default=datetime.utcnow)
+
 class WeatherDB(Base):
+    """Raw weather observations. Append-only; old rows are compacted into WeatherRollupDB."""
     __tablename__ = "weather"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
     hurricane_category = Column(Integer)
     wind_speed_mph = Column(Float)
     rainfall_inches = Column(Float)
@@ -60,6 +202,69 @@ class WeatherDB(Base):
     flood_zones_affected = Column(JSON)
     forecast_summary = Column(String)
 
+class WeatherRollupDB(Base):
+    """Per-bucket min/max/avg of weather observations that aged out of the raw table."""
+    __tablename__ = "weather_rollups"
+
+    bucket_start = Column(DateTime, primary_key=True)
+    bucket_seconds = Column(Integer)
+    sample_count = Column(Integer)
+    hurricane_category = Column(Integer)
+    wind_speed_min = Column(Float)
+    wind_speed_max = Column(Float)
+    wind_speed_avg = Column(Float)
+    rainfall_min = Column(Float)
+    rainfall_max = Column(Float)
+    rainfall_avg = Column(Float)
+    storm_surge_min = Column(Float)
+    storm_surge_max = Column(Float)
+    storm_surge_avg = Column(Float)
+
+class IncidentRollupDB(Base):
+    """
+    Incidents reported and resolved per hour, type and priority, with the
+    summed time to resolution of those resolved. Maintained by the incident
+    write paths (app.services.rollups); trend analytics read only this table.
+    """
+    __tablename__ = "incident_rollups"
+
+    hour = Column(DateTime, primary_key=True)
+    type = Column(String, primary_key=True)
+    priority = Column(String, primary_key=True)
+    reported = Column(Integer, nullable=False, default=0, server_default="0")
+    resolved = Column(Integer, nullable=False, default=0, server_default="0")
+    resolution_minutes = Column(Float, nullable=False, default=0.0, server_default="0")
+
+class ResponseSketchDB(Base):
+    """
+    Quantile sketch of one response-time metric for one slice (e.g. zone
+    'Zone AE'), flushed periodically by app.services.response_times so the
+    distributions survive restarts.
+    """
+    __tablename__ = "response_sketches"
+
+    metric = Column(String, primary_key=True)
+    dimension = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    sketch = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class ActionEventDB(Base):
+    """Append-only log of action state changes (queued, executed, failed, rejected)."""
+    __tablename__ = "action_events"
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    action_id = Column(String, index=True)
+    type = Column(String)
+    source = Column(String)
+    status = Column(String, index=True)
+    params = Column(JSON)
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime)
+    executed_at = Column(DateTime, nullable=True)
+    recorded_at = Column(DateTime, default=datetime.utcnow)
+
 class UserDB(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True, index=True)
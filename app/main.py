@@ -2,15 +2,22 @@
 FastAPI Application Entry Point
 AI-Assisted Emergency Coordination System powered by Cerebras
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 import os
 
+from .bootstrap import ensure_database_ready
 from .config import settings
-from .routers import incidents, assets, ai, actions, auth, analytics
+from .routers import incidents, assets, ai, actions, auth, analytics, weather, sync, snapshot, telemetry
 from .services.data_feeds import data_feed_service
+from .services.weather import weather_service
+from .services.archive import incident_archive_service
+from .services.telemetry import telemetry_service
+from .services.response_times import response_time_service
+from .services.concurrency import ConcurrencyConflict
+from .utils.etag import etag_headers, not_modified
 
 # Create FastAPI app
 app = FastAPI(
@@ -41,6 +48,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(ConcurrencyConflict)
+async def concurrency_conflict_handler(request: Request, exc: ConcurrencyConflict):
+    """A conditional update lost the race: the client should re-read and retry."""
+    return JSONResponse(
+        status_code=409,
+        content={"detail": str(exc), "current_version": exc.current_version}
+    )
+
 # Include routers
 app.include_router(incidents.router, prefix="/api")
 app.include_router(assets.router, prefix="/api")
@@ -48,6 +63,10 @@ app.include_router(ai.router, prefix="/api")
 app.include_router(auth.router, prefix="/api/auth")
 app.include_router(actions.router, prefix="/api")
 app.include_router(analytics.router, prefix="/api")
+app.include_router(weather.router, prefix="/api")
+app.include_router(sync.router, prefix="/api")
+app.include_router(snapshot.router, prefix="/api")
+app.include_router(telemetry.router, prefix="/api")
 
 # WebSocket Endpoint
 from fastapi import WebSocket, WebSocketDisconnect
@@ -90,21 +109,21 @@ async def health_check():
 
 
 @app.get("/api/summary")
-async def get_summary():
-    """Get summary statistics for the dashboard."""
+async def get_summary(request: Request, response: Response):
+    """Get summary statistics for the dashboard. Supports If-None-Match."""
+    etag = data_feed_service.get_etag("incidents", "assets", "weather")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers.update(etag_headers(etag))
     return data_feed_service.get_summary_stats()
 
 
-@app.get("/api/weather")
-async def get_weather():
-    """Get current weather conditions."""
-    return data_feed_service.get_weather()
-
-
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup."""
     print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} starting...")
+    ensure_database_ready()
     if settings.is_configured:
         print("✅ Cerebras API configured")
     else:
@@ -112,3 +131,17 @@ async def startup_event():
     print(f"📊 Loaded {len(data_feed_service.get_all_incidents())} demo incidents")
     print(f"🚁 Loaded {len(data_feed_service.get_all_assets())} demo assets")
     print(f"📡 API docs available at http://{settings.HOST}:{settings.PORT}/docs")
+    weather_service.start()
+    incident_archive_service.start()
+    telemetry_service.start()
+    response_time_service.load()
+    response_time_service.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks."""
+    await weather_service.stop()
+    await incident_archive_service.stop()
+    await telemetry_service.stop()
+    await response_time_service.stop()
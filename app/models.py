@@ -2,10 +2,10 @@
 Pydantic models for the Emergency Coordination System.
 Defines data structures for incidents, assets, recommendations, and scenarios.
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 import uuid
 
 
@@ -63,6 +63,12 @@ class Incident(BaseModel):
     status: str = "active"
     assigned_assets: List[str] = Field(default_factory=list)
     notes: List[str] = Field(default_factory=list)
+    # Reports merged into this incident by clustering, and when the latest arrived
+    report_count: int = Field(default=1, ge=1)
+    last_reported_at: Optional[datetime] = None
+    # Derived from the location and the flood-zone map; not stored
+    flood_zone: Optional[str] = None
+    version: int = 1
 
 
 class IncidentCreate(BaseModel):
@@ -85,6 +91,34 @@ class Asset(BaseModel):
     assigned_incident: Optional[str] = None
     eta_minutes: Optional[int] = None
     last_updated: datetime = Field(default_factory=datetime.utcnow)
+    # Derived from the location and the flood-zone map; not stored
+    flood_zone: Optional[str] = None
+    version: int = 1
+
+
+class NearestAsset(BaseModel):
+    asset: Asset
+    distance_km: float
+
+
+# Telemetry models
+class PositionFix(BaseModel):
+    asset_id: str
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    recorded_at: datetime = Field(default_factory=datetime.utcnow)
+
+    @field_validator("recorded_at")
+    @classmethod
+    def _to_naive_utc(cls, value: datetime) -> datetime:
+        # Devices send offsets; everything else here is naive UTC
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+class TelemetryBatch(BaseModel):
+    fixes: List[PositionFix] = Field(..., max_length=10000)
 
 
 # AI Recommendation models
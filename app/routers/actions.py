@@ -4,7 +4,7 @@ Allows operators and AI agents to execute actions on the system.
 """
 from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel
 
 from ..actions.executor import action_executor, ActionType, ActionSource
@@ -48,7 +48,7 @@ class UpdatePriorityRequest(BaseModel):
 @router.post("/deploy")
 async def deploy_asset(request: DeployRequest, current_user: UserDB = Depends(get_current_active_user)):
     """Deploy an asset to an incident - sends the asset en route"""
-    action = action_executor.create_action(
+    action = await action_executor.create_action(
         action_type=ActionType.DEPLOY_ASSET,
         params=request.model_dump(),
         source=ActionSource.OPERATOR
@@ -59,7 +59,7 @@ async def deploy_asset(request: DeployRequest, current_user: UserDB = Depends(ge
 @router.post("/recall")
 async def recall_asset(request: RecallRequest, current_user: UserDB = Depends(get_current_active_user)):
     """Recall an asset back to base"""
-    action = action_executor.create_action(
+    action = await action_executor.create_action(
         action_type=ActionType.RECALL_ASSET,
         params=request.model_dump(),
         source=ActionSource.OPERATOR
@@ -70,7 +70,7 @@ async def recall_asset(request: RecallRequest, current_user: UserDB = Depends(ge
 @router.post("/assign")
 async def assign_asset(request: AssignRequest, current_user: UserDB = Depends(get_current_active_user)):
     """Assign an asset to an incident"""
-    action = action_executor.create_action(
+    action = await action_executor.create_action(
         action_type=ActionType.ASSIGN_ASSET,
         params=request.model_dump(),
         source=ActionSource.OPERATOR
@@ -81,7 +81,7 @@ async def assign_asset(request: AssignRequest, current_user: UserDB = Depends(ge
 @router.post("/unassign/{asset_id}")
 async def unassign_asset(asset_id: str, current_user: UserDB = Depends(get_current_active_user)):
     """Unassign an asset from its current incident"""
-    action = action_executor.create_action(
+    action = await action_executor.create_action(
         action_type=ActionType.UNASSIGN_ASSET,
         params={"asset_id": asset_id},
         source=ActionSource.OPERATOR
@@ -89,10 +89,21 @@ async def unassign_asset(asset_id: str, current_user: UserDB = Depends(get_curre
     return action.to_dict()
 
 
+@router.post("/arrive/{asset_id}")
+async def arrive_on_scene(asset_id: str, current_user: UserDB = Depends(get_current_active_user)):
+    """Mark an assigned asset as on scene at its incident"""
+    action = await action_executor.create_action(
+        action_type=ActionType.ARRIVE_ON_SCENE,
+        params={"asset_id": asset_id},
+        source=ActionSource.OPERATOR
+    )
+    return action.to_dict()
+
+
 @router.post("/incident/create")
 async def create_incident(request: CreateIncidentRequest, current_user: UserDB = Depends(get_current_active_user)):
     """Create a new incident"""
-    action = action_executor.create_action(
+    action = await action_executor.create_action(
         action_type=ActionType.CREATE_INCIDENT,
         params=request.model_dump(),
         source=ActionSource.OPERATOR
@@ -103,7 +114,7 @@ async def create_incident(request: CreateIncidentRequest, current_user: UserDB =
 @router.post("/incident/{incident_id}/resolve")
 async def resolve_incident(incident_id: str, current_user: UserDB = Depends(get_current_active_user)):
     """Resolve/close an incident"""
-    action = action_executor.create_action(
+    action = await action_executor.create_action(
         action_type=ActionType.RESOLVE_INCIDENT,
         params={"incident_id": incident_id},
         source=ActionSource.OPERATOR
@@ -117,7 +128,7 @@ async def update_priority(request: UpdatePriorityRequest, current_user: UserDB =
     if request.priority not in ["critical", "high", "medium", "low"]:
         raise HTTPException(status_code=400, detail="Invalid priority")
     
-    action = action_executor.create_action(
+    action = await action_executor.create_action(
         action_type=ActionType.UPDATE_PRIORITY,
         params=request.model_dump(),
         source=ActionSource.OPERATOR
@@ -126,20 +137,26 @@ async def update_priority(request: UpdatePriorityRequest, current_user: UserDB =
 
 
 @router.get("/log")
-async def get_action_log(limit: int = 50):
-    """Get recent action log"""
+async def get_action_log(limit: int = Query(50, ge=1, le=500), cursor: Optional[int] = None):
+    """
+    Get the action log, oldest first.
+    Pass the returned `next_cursor` as `cursor` to page further back in history.
+    """
+    actions, next_cursor = await action_executor.get_action_log(limit, cursor)
     return {
-        "actions": action_executor.get_action_log(limit),
-        "total": len(action_executor.action_log)
+        "actions": actions,
+        "total": action_executor.total_logged,
+        "next_cursor": next_cursor
     }
 
 
 @router.get("/pending")
 async def get_pending_actions():
     """Get actions awaiting approval"""
+    pending = await action_executor.get_pending_actions()
     return {
-        "pending": action_executor.get_pending_actions(),
-        "count": len(action_executor.pending_actions)
+        "pending": pending,
+        "count": len(pending)
     }
 
 
@@ -147,7 +164,7 @@ async def get_pending_actions():
 async def approve_action(action_id: str):
     """Approve and execute a pending action"""
     try:
-        action = action_executor.approve_action(action_id)
+        action = await action_executor.approve_action(action_id)
         return action.to_dict()
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -157,7 +174,7 @@ async def approve_action(action_id: str):
 async def reject_action(action_id: str):
     """Reject a pending action"""
     try:
-        action = action_executor.reject_action(action_id)
+        action = await action_executor.reject_action(action_id)
         return action.to_dict()
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -1,10 +1,111 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from ..database import get_db
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List, Literal, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from ..database import AsyncSessionLocal, SessionLocal
+from ..models import AssetType, IncidentType, Priority
 from ..services.analytics import analytics_service
+from ..services.data_feeds import data_feed_service
+from ..services.response_times import response_time_service
+from ..services.rollups import hour_of
+from ..utils.etag import etag_headers, not_modified
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
+
+async def _in_thread(query, *args):
+    """
+    Run a CPU-heavy analytics query (numpy, large scans) on a worker thread
+    with a session of its own, so it does not stall the event loop.
+    """
+    def run():
+        db = SessionLocal()
+        try:
+            return query(db, *args)
+        finally:
+            db.close()
+    return await asyncio.to_thread(run)
+
+
 @router.get("/dashboard")
-async def get_analytics_dashboard(db: Session = Depends(get_db)):
-    return analytics_service.get_dashboard_stats(db)
+async def get_analytics_dashboard(request: Request, response: Response):
+    # Only recompute when incidents or assets changed since the client's copy,
+    # or the hour rolled over (the 24h trend ends at the current hour)
+    current_hour = hour_of(datetime.utcnow())
+    etag = data_feed_service.get_etag("incidents", "assets", extra=(current_hour.strftime("%Y%m%d%H"),))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers.update(etag_headers(etag))
+    stats = await _in_thread(analytics_service.get_dashboard_stats, current_hour)
+    stats["flood_zones"] = data_feed_service.get_flood_zone_summary()
+    return stats
+
+
+# Span and default bucket size of each trend window
+TREND_WINDOWS = {"24h": (timedelta(hours=24), 1), "7d": (timedelta(days=7), 6)}
+
+
+@router.get("/trend")
+async def get_incident_trend(
+    window: Literal["24h", "7d"] = "24h",
+    bucket_hours: Optional[int] = Query(None, ge=1, le=24, description="Defaults to 1 for 24h and 6 for 7d"),
+    type: Optional[List[IncidentType]] = Query(None),
+    priority: Optional[List[Priority]] = Query(None),
+    group_by: Optional[Literal["type", "priority"]] = None
+):
+    """
+    Incidents reported and resolved per bucket over the last 24 hours or 7
+    days, up to and including the current hour. Served from the hourly
+    rollups, so its cost does not grow with the number of incidents.
+    """
+    span, default_bucket = TREND_WINDOWS[window]
+    end = hour_of(datetime.utcnow()) + timedelta(hours=1)
+    async with AsyncSessionLocal() as db:
+        return await db.run_sync(
+            analytics_service.get_trend, end - span, end, bucket_hours or default_bucket,
+            [t.value for t in type] if type else None,
+            [p.value for p in priority] if priority else None,
+            group_by
+        )
+
+
+@router.get("/response-times")
+async def get_response_times(by: Optional[Literal["incident_type", "asset_type", "zone"]] = None):
+    """
+    Live p50/p95/p99 minutes from report to first assignment, to each asset
+    arriving on scene and to resolution, overall and optionally per slice.
+    Read from streaming quantile sketches (within 1% by default), not history.
+    """
+    return response_time_service.get_percentiles(by)
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Stored timestamps are naive UTC
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@router.get("/utilization")
+async def get_fleet_utilization(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket_minutes: int = Query(60, ge=1, le=10080),
+    type: Optional[List[AssetType]] = Query(None),
+    per_asset: bool = False
+):
+    """
+    Time in each status and fleet utilization (share of asset-time deployed,
+    en route or on scene) over a window, per bucket, from the asset status
+    history. Defaults to the last 24 hours; `per_asset` adds each asset's time in state.
+    """
+    end = _naive_utc(end) or datetime.utcnow()
+    start = _naive_utc(start) or end - timedelta(hours=24)
+    try:
+        return await _in_thread(
+            analytics_service.get_utilization, start, end, bucket_minutes,
+            [t.value for t in type] if type else None, per_asset
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
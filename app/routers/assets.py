@@ -1,18 +1,58 @@
 """
 Assets router - REST endpoints for asset tracking and management.
 """
-from typing import List
-from fastapi import APIRouter, HTTPException
-from ..models import Asset, AssetStatus
-from ..services.data_feeds import data_feed_service
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from ..models import Asset, AssetStatus, AssetType, NearestAsset
+from ..services.data_feeds import data_feed_service, parse_bbox
+from ..services.telemetry import telemetry_service
+from ..utils.etag import etag_headers, not_modified
+from ..utils.serialization import FastJSONResponse
 
 router = APIRouter(prefix="/assets", tags=["Assets"])
 
 
-@router.get("", response_model=List[Asset])
-async def get_all_assets():
-    """Get all assets."""
-    return data_feed_service.get_all_assets()
+@router.get("")
+async def get_all_assets(
+    request: Request,
+    status: Optional[List[AssetStatus]] = Query(None),
+    type: Optional[List[AssetType]] = Query(None),
+    bbox: Optional[str] = Query(None, description="min_lat,min_lon,max_lat,max_lon"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,status,location"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000)
+):
+    """
+    Get assets.
+    
+    Without query parameters returns every asset. With any filter, `fields`,
+    `cursor` or `limit` the query is paged by id (default 100 per page); the
+    `X-Next-Cursor` response header carries the cursor of the next page.
+    Rows are encoded directly from plain dicts, without per-row model validation.
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
+    """
+    etag = data_feed_service.get_etag("assets")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    if not any(p is not None for p in (status, type, bbox, fields, cursor, limit)):
+        return FastJSONResponse(data_feed_service.get_all_asset_rows(), headers=etag_headers(etag))
+    try:
+        items, next_cursor = await data_feed_service.aquery_assets(
+            status=[s.value for s in status] if status else None,
+            asset_type=[t.value for t in type] if type else None,
+            bbox=parse_bbox(bbox) if bbox else None,
+            cursor=cursor,
+            limit=limit or 100,
+            fields=fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = etag_headers(etag)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return FastJSONResponse(items, headers=headers)
 
 
 @router.get("/available", response_model=List[Asset])
@@ -21,6 +61,44 @@ async def get_available_assets():
     return data_feed_service.get_available_assets()
 
 
+@router.get("/nearest", response_model=List[NearestAsset])
+async def get_nearest_assets(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(5, ge=1, le=100),
+    type: Optional[AssetType] = None,
+    status: Optional[AssetStatus] = None,
+    max_distance_km: Optional[float] = Query(None, gt=0)
+):
+    """Get the k assets closest to a position, optionally filtered by type and status."""
+    hits = data_feed_service.find_nearest_assets(
+        lat, lon, k, asset_type=type, status=status, max_distance_km=max_distance_km
+    )
+    return [NearestAsset(asset=asset, distance_km=round(dist, 3)) for asset, dist in hits]
+
+
+@router.get("/positions")
+async def get_asset_positions(
+    status: Optional[List[AssetStatus]] = Query(None),
+    type: Optional[List[AssetType]] = Query(None),
+    bbox: Optional[str] = Query(None, description="min_lat,min_lon,max_lat,max_lon"),
+    since: Optional[datetime] = Query(None, description="Only positions updated after this time"),
+    flood_zone: Optional[List[str]] = Query(None, description="Only assets in these flood zones")
+):
+    """
+    Live position, status, type and flood zone of every asset, for the map.
+    Includes telemetry fixes not yet written to the database; served from memory.
+    """
+    try:
+        positions = telemetry_service.get_positions(
+            statuses=status, types=type, bbox=parse_bbox(bbox) if bbox else None, since=since,
+            zones=flood_zone
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse(positions)
+
+
 @router.get("/{asset_id}", response_model=Asset)
 async def get_asset(asset_id: str):
     """Get a specific asset by ID."""
@@ -32,50 +110,44 @@ async def get_asset(asset_id: str):
 
 @router.patch("/{asset_id}", response_model=Asset)
 async def update_asset(asset_id: str, updates: dict):
-    """Update an asset's status or location."""
-    asset = data_feed_service.update_asset(asset_id, updates)
+    """
+    Update an asset's status or location.
+    Include the `version` you last read to make the update conditional:
+    if the asset has changed since, nothing is written and 409 is returned.
+    """
+    expected_version = updates.pop("version", None)
+    asset = await data_feed_service.aupdate_asset(asset_id, updates, expected_version)
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
     return asset
 
 
 @router.post("/{asset_id}/assign/{incident_id}", response_model=Asset)
-async def assign_asset_to_incident(asset_id: str, incident_id: str, eta_minutes: int = None):
-    """Assign an asset to an incident."""
-    asset = data_feed_service.get_asset(asset_id)
-    if not asset:
+async def assign_asset_to_incident(
+    asset_id: str,
+    incident_id: str,
+    eta_minutes: int = None,
+    version: Optional[int] = Query(None, description="Asset version last read; 409 if it has changed")
+):
+    """Assign an asset to an incident (reassigning it if it already serves another)."""
+    if not data_feed_service.get_asset(asset_id):
         raise HTTPException(status_code=404, detail="Asset not found")
-    
-    incident = data_feed_service.get_incident(incident_id)
-    if not incident:
+    if not data_feed_service.get_incident(incident_id):
         raise HTTPException(status_code=404, detail="Incident not found")
     
-    # Update asset
-    updated_asset = data_feed_service.assign_asset(asset_id, incident_id, eta_minutes)
-    
-    # Update incident's assigned assets
-    assigned = incident.assigned_assets + [asset_id]
-    data_feed_service.update_incident(incident_id, {"assigned_assets": assigned})
-    
-    return updated_asset
+    asset = await data_feed_service.aassign_asset(asset_id, incident_id, eta_minutes, expected_version=version)
+    if not asset:
+        raise HTTPException(status_code=404, detail="Asset or incident not found")
+    return asset
 
 
 @router.post("/{asset_id}/release", response_model=Asset)
-async def release_asset(asset_id: str):
+async def release_asset(
+    asset_id: str,
+    version: Optional[int] = Query(None, description="Asset version last read; 409 if it has changed")
+):
     """Release an asset from its current assignment."""
-    asset = data_feed_service.get_asset(asset_id)
+    asset = await data_feed_service.arelease_asset(asset_id, expected_version=version)
     if not asset:
         raise HTTPException(status_code=404, detail="Asset not found")
-    
-    # If assigned to an incident, remove from that incident's list
-    if asset.assigned_incident:
-        incident = data_feed_service.get_incident(asset.assigned_incident)
-        if incident:
-            assigned = [a for a in incident.assigned_assets if a != asset_id]
-            data_feed_service.update_incident(asset.assigned_incident, {"assigned_assets": assigned})
-    
-    return data_feed_service.update_asset(asset_id, {
-        "status": AssetStatus.AVAILABLE,
-        "assigned_incident": None,
-        "eta_minutes": None
-    })
+    return asset
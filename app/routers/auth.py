@@ -1,17 +1,21 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from ..database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
 from ..db_models import UserDB
-from ..utils.security import verify_password, create_access_token, get_password_hash, ACCESS_TOKEN_EXPIRE_MINUTES
+from ..utils.security import verify_password, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 
 router = APIRouter()
 
 @router.post("/token")
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(UserDB).filter(UserDB.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(UserDB).where(UserDB.username == form_data.username))
+    user = result.scalars().first()
+    # bcrypt is deliberately slow; keep it off the event loop
+    if not user or not await run_in_threadpool(verify_password, form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -22,31 +26,3 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
         data={"sub": user.username, "role": user.role}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer", "role": user.role}
-
-@router.on_event("startup")
-async def create_default_users():
-    # Helper to seed users if they don't exist
-    from ..database import SessionLocal
-    db = SessionLocal()
-    try:
-        if not db.query(UserDB).first():
-            admin = UserDB(
-                username="admin", 
-                hashed_password=get_password_hash("admin"), 
-                role="admin"
-            )
-            dispatcher = UserDB(
-                username="operator", 
-                hashed_password=get_password_hash("operator"), 
-                role="dispatcher"
-            )
-            viewer = UserDB(
-                username="viewer", 
-                hashed_password=get_password_hash("viewer"), 
-                role="viewer"
-            )
-            db.add_all([admin, dispatcher, viewer])
-            db.commit()
-            print("Default users created: admin/admin, operator/operator")
-    finally:
-        db.close()
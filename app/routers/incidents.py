@@ -1,18 +1,106 @@
 """
 Incidents router - REST endpoints for incident management.
 """
-from typing import List
-from fastapi import APIRouter, HTTPException
-from ..models import Incident, IncidentCreate
-from ..services.data_feeds import data_feed_service
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from ..models import Incident, IncidentCreate, IncidentType, Priority
+from ..services.archive import incident_archive_service
+from ..services.data_feeds import data_feed_service, parse_bbox
+from ..utils.etag import etag_headers, not_modified
+from ..utils.serialization import FastJSONResponse
 
 router = APIRouter(prefix="/incidents", tags=["Incidents"])
 
 
-@router.get("", response_model=List[Incident])
-async def get_all_incidents():
-    """Get all active incidents."""
-    return data_feed_service.get_all_incidents()
+@router.get("")
+async def get_all_incidents(
+    request: Request,
+    status: Optional[List[str]] = Query(None),
+    priority: Optional[List[Priority]] = Query(None),
+    type: Optional[List[IncidentType]] = Query(None),
+    bbox: Optional[str] = Query(None, description="min_lat,min_lon,max_lat,max_lon"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,priority,location"),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000)
+):
+    """
+    Get incidents.
+    
+    Without query parameters returns every incident. With any filter, `fields`,
+    `cursor` or `limit` the query is paged (default 100 per page, oldest first);
+    the `X-Next-Cursor` response header carries the cursor of the next page.
+    Rows are encoded directly from plain dicts, without per-row model validation.
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
+    """
+    etag = data_feed_service.get_etag("incidents")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    if not any(p is not None for p in (status, priority, type, bbox, fields, cursor, limit)):
+        return FastJSONResponse(data_feed_service.get_all_incident_rows(), headers=etag_headers(etag))
+    try:
+        items, next_cursor = await data_feed_service.aquery_incidents(
+            status=status,
+            priority=[p.value for p in priority] if priority else None,
+            incident_type=[t.value for t in type] if type else None,
+            bbox=parse_bbox(bbox) if bbox else None,
+            cursor=cursor,
+            limit=limit or 100,
+            fields=fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = etag_headers(etag)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return FastJSONResponse(items, headers=headers)
+
+
+@router.get("/history")
+async def get_incident_history(
+    priority: Optional[List[Priority]] = Query(None),
+    type: Optional[List[IncidentType]] = Query(None),
+    resolved_from: Optional[datetime] = None,
+    resolved_to: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """
+    Get archived (resolved and aged-out) incidents, ordered by resolution time.
+    Paged like the incident list; the `X-Next-Cursor` header carries the next cursor.
+    """
+    try:
+        items, next_cursor = await incident_archive_service.aquery_history(
+            priority=[p.value for p in priority] if priority else None,
+            incident_type=[t.value for t in type] if type else None,
+            resolved_from=resolved_from,
+            resolved_to=resolved_to,
+            cursor=cursor,
+            limit=limit,
+            fields=fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return FastJSONResponse(items, headers=headers)
+
+
+@router.get("/search")
+async def search_incidents(
+    q: str = Query(..., min_length=1, description="Words to find in descriptions and notes"),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Full-text search over active incidents' descriptions and notes.
+    Results are ranked by relevance and include highlighted snippets.
+    """
+    try:
+        results = await data_feed_service.asearch_incidents(q, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse({"query": q, "results": results})
 
 
 @router.get("/{incident_id}", response_model=Incident)
@@ -25,16 +113,34 @@ async def get_incident(incident_id: str):
 
 
 @router.post("", response_model=Incident)
-async def create_incident(incident_data: IncidentCreate):
-    """Create a new incident."""
+async def create_incident(
+    incident_data: IncidentCreate,
+    response: Response,
+    cluster: bool = Query(True, description="Merge into a matching nearby incident instead of creating a duplicate")
+):
+    """
+    Report an incident. A report of the same type close to an unresolved
+    incident, within the clustering time window, is merged into it (its
+    affected count is added and `report_count` goes up) and that incident is
+    returned with `X-Incident-Merged: true`. Pass `cluster=false` to always create one.
+    """
     incident = Incident(**incident_data.model_dump())
-    return data_feed_service.add_incident(incident)
+    if not cluster:
+        return await data_feed_service.aadd_incident(incident)
+    incident, merged = await data_feed_service.areport_incident(incident)
+    response.headers["X-Incident-Merged"] = "true" if merged else "false"
+    return incident
 
 
 @router.patch("/{incident_id}", response_model=Incident)
 async def update_incident(incident_id: str, updates: dict):
-    """Update an existing incident."""
-    incident = data_feed_service.update_incident(incident_id, updates)
+    """
+    Update an existing incident.
+    Include the `version` you last read to make the update conditional:
+    if the incident has changed since, nothing is written and 409 is returned.
+    """
+    expected_version = updates.pop("version", None)
+    incident = await data_feed_service.aupdate_incident(incident_id, updates, expected_version)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     return incident
@@ -43,18 +149,22 @@ async def update_incident(incident_id: str, updates: dict):
 @router.delete("/{incident_id}")
 async def delete_incident(incident_id: str):
     """Delete an incident."""
-    if not data_feed_service.delete_incident(incident_id):
+    if not await data_feed_service.adelete_incident(incident_id):
         raise HTTPException(status_code=404, detail="Incident not found")
     return {"status": "deleted", "incident_id": incident_id}
 
 
 @router.post("/{incident_id}/notes")
-async def add_note(incident_id: str, note: str):
-    """Add a note to an incident."""
-    incident = data_feed_service.get_incident(incident_id)
-    if not incident:
+async def add_note(incident_id: str, note: str, author: Optional[str] = None):
+    """Add a note to an incident. Returns the updated incident."""
+    if not await data_feed_service.aadd_note(incident_id, note, author):
         raise HTTPException(status_code=404, detail="Incident not found")
-    
-    notes = incident.notes + [note]
-    updated = data_feed_service.update_incident(incident_id, {"notes": notes})
-    return updated
+    return data_feed_service.get_incident(incident_id)
+
+
+@router.get("/{incident_id}/notes")
+async def get_notes(incident_id: str):
+    """Get an incident's notes with authors and timestamps, oldest first."""
+    if not data_feed_service.get_incident(incident_id):
+        raise HTTPException(status_code=404, detail="Incident not found")
+    return await data_feed_service.aget_notes(incident_id)
@@ -0,0 +1,54 @@
+"""
+Snapshot router - export and restore the full operational state.
+"""
+import asyncio
+import tempfile
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from ..actions.executor import action_executor
+from ..services.data_feeds import data_feed_service
+from ..services.snapshot import SnapshotError, iter_snapshot, restore_snapshot
+from ..services.telemetry import telemetry_service
+from ..utils.security import require_role, UserDB
+
+router = APIRouter(prefix="/snapshot", tags=["Snapshot"])
+
+# Uploads larger than this are spooled to disk while they arrive
+SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+
+@router.get("")
+async def export_snapshot(current_user: UserDB = Depends(require_role("admin"))):
+    """
+    Download a binary snapshot of incidents, notes, assets, assignments,
+    weather history, the incident archive and the action log.
+    The file is streamed while it is encoded. Admins only.
+    """
+    filename = f"hurricaneops-{datetime.utcnow():%Y%m%dT%H%M%S}.snap"
+    return StreamingResponse(
+        iter_snapshot(),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.post("/restore")
+async def restore(request: Request, current_user: UserDB = Depends(require_role("admin"))):
+    """
+    Replace the operational state with a snapshot sent as the raw request body
+    (e.g. `curl --data-binary @file.snap`). Returns the rows restored per table. Admins only.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as upload:
+        async for chunk in request.stream():
+            await asyncio.to_thread(upload.write, chunk)
+        upload.seek(0)
+        try:
+            counts = await data_feed_service.areplace_all(restore_snapshot, upload)
+        except SnapshotError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    action_executor.reset()
+    # Fixes buffered before the restore must not be written over the restored positions
+    telemetry_service.discard_pending()
+    return {"status": "restored", "rows": counts}
@@ -0,0 +1,21 @@
+"""
+Sync router - delta synchronization of incidents and assets for dashboards.
+"""
+from fastapi import APIRouter, Query
+from ..services.data_feeds import data_feed_service
+from ..utils.serialization import FastJSONResponse
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+@router.get("")
+async def sync(since: int = Query(0, ge=0, description="Last change version the client has seen")):
+    """
+    Get incidents and assets changed after a change version.
+    
+    Returns `version` (pass it as `since` next time), the changed `incidents`
+    and `assets`, and the ids `deleted` since then. With `since=0`, or a
+    version this server does not know, the response is a full snapshot and
+    `full` is true.
+    """
+    return FastJSONResponse(await data_feed_service.aget_changes(since))
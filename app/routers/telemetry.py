@@ -0,0 +1,46 @@
+"""
+Telemetry router - batched asset position reports over HTTP and WebSocket.
+"""
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from ..models import TelemetryBatch
+from ..services.telemetry import telemetry_service
+
+router = APIRouter(prefix="/telemetry", tags=["Telemetry"])
+
+
+@router.post("")
+async def ingest_telemetry(batch: TelemetryBatch):
+    """
+    Report position fixes for any number of assets.
+    Fixes are coalesced per asset and written in bulk every few seconds;
+    `GET /api/assets/positions` serves them immediately.
+    """
+    return telemetry_service.ingest(batch.fixes)
+
+
+@router.get("/stats")
+async def get_telemetry_stats():
+    """Fixes received, rows written and fixes waiting for the next flush."""
+    return telemetry_service.get_stats()
+
+
+@router.websocket("/ws")
+async def telemetry_stream(websocket: WebSocket):
+    """
+    Stream of batches for feeds that report continuously.
+    Each text message is a batch like the POST body and is acknowledged with its result.
+    """
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                batch = TelemetryBatch.model_validate_json(message)
+            except ValidationError as e:
+                await websocket.send_json({"error": e.errors(include_url=False, include_context=False)})
+                continue
+            await websocket.send_json(telemetry_service.ingest(batch.fixes))
+    except WebSocketDisconnect:
+        pass
@@ -0,0 +1,46 @@
+"""
+Weather router - current conditions and observation history.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from ..services.data_feeds import data_feed_service
+from ..services.weather import weather_service
+
+router = APIRouter(prefix="/weather", tags=["Weather"])
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Observations are stored with naive UTC timestamps
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@router.get("")
+async def get_weather():
+    """Get current weather conditions."""
+    return data_feed_service.get_weather()
+
+
+@router.get("/history")
+async def get_weather_history(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket_minutes: int = Query(15, ge=1, le=1440)
+):
+    """
+    Get weather observations downsampled to min/max/avg per bucket.
+    Defaults to the last 24 hours.
+    """
+    end = _naive_utc(end) or datetime.utcnow()
+    start = _naive_utc(start) or end - timedelta(hours=24)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    points = await weather_service.aget_history(start, end, bucket_minutes * 60)
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "bucket_minutes": bucket_minutes,
+        "points": points
+    }
@@ -1,30 +1,50 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from itertools import chain
+
+import numpy as np
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import case, func, literal_column, select, union_all
 from datetime import datetime, timedelta
-from ..db_models import IncidentDB, AssetDB
+from typing import Dict, List, Optional, Tuple
+from ..db_models import (
+    IncidentDB, IncidentArchiveDB, IncidentRollupDB, AssetDB, AssetStatusEventDB, resolution_minutes
+)
+from ..models import AssetStatus
+from .counters import DEPLOYED_STATUSES
+from .rollups import hour_of
+
+# Every incident ever reported is in one of these. Analytics aggregate over
+# both so archiving never changes the totals.
+HISTORY_MODELS = (IncidentDB, IncidentArchiveDB)
+
+# Resolution-time percentiles reported per incident type and priority
+RESOLUTION_PERCENTILES = (50, 90, 99)
+
+# Keys a trend can be split by
+TREND_GROUPS = {"type": IncidentRollupDB.type, "priority": IncidentRollupDB.priority}
+
+# Most buckets one utilization query may return
+MAX_UTILIZATION_BUCKETS = 10_000
+
 
 class AnalyticsService:
-    def get_dashboard_stats(self, db: Session):
-        # Incident Stats
-        total_incidents = db.query(IncidentDB).count()
+    def get_dashboard_stats(self, db: Session, current_hour: datetime = None):
+        # Incident Stats (active ones live in the hot table, history spans both).
+        # Counted per table and summed: each count is an index scan, whereas
+        # aggregating over the UNION ALL would materialize every row first.
+        total_incidents = sum(
+            db.execute(select(func.count()).select_from(model)).scalar() for model in HISTORY_MODELS
+        )
         active_incidents = db.query(IncidentDB).filter(IncidentDB.status != 'resolved').count()
-        resolved_incidents = db.query(IncidentDB).filter(IncidentDB.status == 'resolved').count()
-        
-        # Calculate Mean Time to Resolution (MTTR)
-        # We fetch resolved incidents directly for simplicity in SQLite 
-        # (func.avg across datediff might be tricky depending on sqlite version/extensions)
-        resolved_objs = db.query(IncidentDB).filter(IncidentDB.status == 'resolved', IncidentDB.resolved_at != None).all()
+        # Only resolved incidents are archived
+        resolved_incidents = db.query(IncidentDB).filter(IncidentDB.status == 'resolved').count() + (
+            db.execute(select(func.count()).select_from(IncidentArchiveDB)).scalar()
+        )
         
-        total_resolution_seconds = 0
-        resolved_count_with_time = 0
-        
-        for inc in resolved_objs:
-            if inc.reported_at and inc.resolved_at:
-                delta = inc.resolved_at - inc.reported_at
-                total_resolution_seconds += delta.total_seconds()
-                resolved_count_with_time += 1
-                
-        avg_resolution_minutes = round((total_resolution_seconds / 60) / resolved_count_with_time) if resolved_count_with_time > 0 else 0
+        # Time to resolution by type and priority, computed in SQL
+        resolution = self.get_resolution_stats(db)
+        resolved_count = sum(group["count"] for group in resolution)
+        total_minutes = sum(group["mean_mins"] * group["count"] for group in resolution)
+        avg_resolution_minutes = round(total_minutes / resolved_count) if resolved_count else 0
         
         # Asset Stats
         total_assets = db.query(AssetDB).count()
@@ -32,12 +52,14 @@ class AnalyticsService:
         utilization_rate = round((deployed_assets / total_assets * 100), 1) if total_assets > 0 else 0
         
         # Incidents by Type
-        type_counts = db.query(IncidentDB.type, func.count(IncidentDB.type)).group_by(IncidentDB.type).all()
-        incidents_by_type = {t: c for t, c in type_counts}
+        incidents_by_type = {}
+        for model in HISTORY_MODELS:
+            for incident_type, count in db.execute(select(model.type, func.count()).group_by(model.type)):
+                incidents_by_type[incident_type] = incidents_by_type.get(incident_type, 0) + count
         
-        # Recent Trend (Last 24h, grouped by hour - simplified)
-        # For demo, returning simple mock trend if not enough data, 
-        # basically count of incidents reported in last few hours
+        # Recent Trend (last 24h by hour, up to and including `current_hour`), from the hourly rollups
+        end = (current_hour or hour_of(datetime.utcnow())) + timedelta(hours=1)
+        trend = self.get_trend(db, end - timedelta(hours=24), end)
         
         return {
             "incidents": {
@@ -45,7 +67,9 @@ class AnalyticsService:
                 "active": active_incidents,
                 "resolved": resolved_incidents,
                 "by_type": incidents_by_type,
-                "avg_resolution_time_mins": avg_resolution_minutes
+                "avg_resolution_time_mins": avg_resolution_minutes,
+                "resolution_times": resolution,
+                "trend_24h": trend["points"]
             },
             "assets": {
                 "total": total_assets,
@@ -54,4 +78,216 @@ class AnalyticsService:
             }
         }
 
+    def get_resolution_stats(self, db: Session) -> List[dict]:
+        """
+        Count, mean and p50/p90/p99 minutes from report to resolution for each
+        incident type and priority, over hot and archived incidents.
+
+        Both tables have an index on (type, priority, resolution_minutes), so:
+        counts and sums are one covering index scan per table; and the
+        nearest-rank percentile of a group is a LIMIT 1 OFFSET k over the
+        UNION ALL of both tables' slices ordered by duration, which SQLite
+        answers by merging the two index walks rather than sorting. Ranks past
+        the median walk down from the longest, so p90 and p99 read only the tail.
+        """
+        groups: Dict[Tuple[str, str], List[float]] = {}
+        for model in HISTORY_MODELS:
+            minutes = resolution_minutes(model)
+            rows = db.execute(
+                select(model.type, model.priority, func.count(minutes), func.sum(minutes))
+                .where(*self._resolved(model)).group_by(model.type, model.priority)
+            )
+            for incident_type, priority, count, total in rows:
+                group = groups.setdefault((incident_type, priority), [0, 0.0])
+                group[0] += count
+                group[1] += total or 0.0
+
+        stats = []
+        for (incident_type, priority), (count, total) in sorted(groups.items()):
+            if not count:
+                continue
+            row = {"type": incident_type, "priority": priority, "count": count,
+                   "mean_mins": round(total / count, 1)}
+            for p in RESOLUTION_PERCENTILES:
+                rank = max(1, -(-count * p // 100))  # ceil(count * p / 100), 1-based
+                value = self._ranked_resolution(db, incident_type, priority, rank, count)
+                row[f"p{p}_mins"] = round(value, 1) if value is not None else None
+            stats.append(row)
+        return stats
+
+    def get_trend(self, db: Session, start: datetime, end: datetime, bucket_hours: int = 1,
+                  types: List[str] = None, priorities: List[str] = None, group_by: str = None) -> dict:
+        """
+        Incidents reported and resolved per bucket of `bucket_hours` in
+        [start, end), with the mean time to resolution of those resolved, read
+        from the hourly rollups (at most one row per hour, type and priority,
+        however many incidents there are). Every bucket is listed, empty ones
+        as zeros. With `group_by` ('type' or 'priority') each point also
+        carries the counts per value of that key.
+        """
+        start = hour_of(start)
+        bucket = timedelta(hours=bucket_hours)
+        n_buckets = max(0, -(-(end - start) // bucket))
+        points = [
+            {"bucket_start": (start + i * bucket).isoformat(), "reported": 0, "resolved": 0,
+             "resolution_minutes": 0.0, **({"groups": {}} if group_by else {})}
+            for i in range(n_buckets)
+        ]
+
+        columns = [IncidentRollupDB.hour]
+        if group_by:
+            columns.append(TREND_GROUPS[group_by])
+        conditions = [IncidentRollupDB.hour >= start, IncidentRollupDB.hour < end]
+        if types:
+            conditions.append(IncidentRollupDB.type.in_(types))
+        if priorities:
+            conditions.append(IncidentRollupDB.priority.in_(priorities))
+        rows = db.execute(
+            select(*columns, func.sum(IncidentRollupDB.reported), func.sum(IncidentRollupDB.resolved),
+                   func.sum(IncidentRollupDB.resolution_minutes))
+            .where(*conditions).group_by(*columns)
+        )
+        for row in rows:
+            point = points[(row[0] - start) // bucket]
+            reported, resolved, minutes = row[-3:]
+            point["reported"] += reported
+            point["resolved"] += resolved
+            point["resolution_minutes"] += minutes
+            if group_by:
+                group = point["groups"].setdefault(row[1], {"reported": 0, "resolved": 0})
+                group["reported"] += reported
+                group["resolved"] += resolved
+
+        for point in points:
+            minutes = point.pop("resolution_minutes")
+            point["mean_resolution_mins"] = round(minutes / point["resolved"], 1) if point["resolved"] else None
+        return {"start": start.isoformat(), "end": end.isoformat(), "bucket_hours": bucket_hours, "points": points}
+
+    def get_utilization(self, db: Session, start: datetime, end: datetime, bucket_minutes: int = 60,
+                        asset_types: List[str] = None, per_asset: bool = False) -> dict:
+        """
+        Time in each status and fleet utilization over [start, end), from the
+        asset status history. Utilization is the share of asset-time spent
+        deployed, en route or on scene, overall and per bucket of
+        `bucket_minutes`. Assets count from their first recorded status.
+
+        SQL returns, per asset, its status as of `start` (one index seek)
+        and its changes in the window, already numeric and in order. Those
+        become one interval per status, and all the arithmetic is done on
+        arrays: time in state is a weighted bincount, and per-bucket busy
+        time comes from the integral of the busy-asset count sampled at the
+        bucket edges.
+        """
+        if start >= end:
+            raise ValueError("start must be before end")
+        span = (end - start).total_seconds()
+        bucket = bucket_minutes * 60
+        n_buckets = int(-(-span // bucket))
+        if n_buckets > MAX_UTILIZATION_BUCKETS:
+            raise ValueError(f"At most {MAX_UTILIZATION_BUCKETS} buckets per query; use larger buckets")
+
+        statuses = [s.value for s in AssetStatus]
+        status_codes = {status: code for code, status in enumerate(statuses)}
+        events, previous = AssetStatusEventDB, aliased(AssetStatusEventDB)
+        asset_key = literal_column("assets.rowid")
+        carried_in_at = select(func.max(previous.changed_at)).where(
+            previous.asset_id == AssetDB.id, previous.changed_at < start
+        ).scalar_subquery()
+        stmt = select(
+            asset_key,
+            case(status_codes, value=events.status, else_=-1),
+            (func.julianday(events.changed_at) - func.julianday(start)) * literal_column("86400")
+        ).select_from(AssetDB).join(events, events.asset_id == AssetDB.id).where(
+            events.changed_at >= func.coalesce(carried_in_at, start), events.changed_at < end
+        ).order_by(asset_key, events.changed_at)
+        if asset_types:
+            stmt = stmt.where(AssetDB.type.in_(asset_types))
+        rows = db.execute(stmt).all()
+        rows = np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=3 * len(rows)).reshape(-1, 3)
+        asset_index, status = rows[:, 0].astype(np.int64), rows[:, 1].astype(np.int64)
+        # A status carried in from before the window counts from its start
+        at = np.maximum(rows[:, 2], 0.0)
+
+        # One interval per event: from the change to the asset's next change
+        until = np.full(len(at), span)
+        same_asset = asset_index[1:] == asset_index[:-1]
+        until[:-1][same_asset] = at[1:][same_asset]
+        known = status >= 0
+        asset_index, status, at, until = asset_index[known], status[known], at[known], until[known]
+        duration = until - at
+
+        in_state = np.bincount(status, weights=duration, minlength=len(statuses))
+        busy = np.isin(status, [status_codes[s] for s in DEPLOYED_STATUSES])
+        edges = np.minimum(np.arange(n_buckets + 1) * bucket, span)
+        busy_time = np.diff(self._occupancy_integral(at[busy], until[busy], edges))
+        fleet_time = np.diff(self._occupancy_integral(at, until, edges))
+
+        def pct(part, whole):
+            return round(float(part) / float(whole) * 100, 1) if whole > 0 else None
+
+        result = {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "bucket_minutes": bucket_minutes,
+            "assets": int(np.count_nonzero(np.diff(asset_index)) + 1) if len(asset_index) else 0,
+            "utilization_pct": pct(duration[busy].sum(), duration.sum()),
+            "time_in_state_hours": {s: round(float(h) / 3600, 2) for s, h in zip(statuses, in_state)},
+            "points": [
+                {"bucket_start": (start + timedelta(seconds=float(edge))).isoformat(),
+                 "utilization_pct": pct(b, f), "busy_assets": round(float(b) / (e1 - edge), 2)}
+                for edge, e1, b, f in zip(edges[:-1].tolist(), edges[1:].tolist(), busy_time, fleet_time)
+            ],
+        }
+        if per_asset:
+            keys, asset_index = np.unique(asset_index, return_inverse=True)
+            cells = np.bincount(asset_index * len(statuses) + status, weights=duration,
+                                minlength=len(keys) * len(statuses)).reshape(len(keys), len(statuses))
+            asset_ids = dict(db.execute(select(asset_key, AssetDB.id).where(asset_key.in_(keys.tolist()))).all())
+            result["by_asset"] = {
+                asset_ids[key]: {s: round(h / 3600, 2) for s, h in zip(statuses, row) if h > 0}
+                for key, row in zip(keys.tolist(), cells.tolist())
+            }
+        return result
+
+    @staticmethod
+    def _occupancy_integral(starts: np.ndarray, ends: np.ndarray, at: np.ndarray) -> np.ndarray:
+        """
+        Integral from 0 to each point of `at` of the number of [start, end)
+        intervals open at that time. The count is a step function changing
+        only at interval bounds, so its integral is piecewise linear between
+        them and interpolation at the sample points is exact.
+        """
+        if len(starts) == 0:
+            return np.zeros(len(at))
+        bounds = np.concatenate([starts, ends])
+        steps = np.concatenate([np.ones(len(starts)), -np.ones(len(ends))])
+        order = np.argsort(bounds, kind="stable")
+        bounds, open_count = bounds[order], np.cumsum(steps[order])
+        integral = np.concatenate([[0.0], np.cumsum(open_count[:-1] * np.diff(bounds))])
+        return np.interp(at, bounds, integral)
+
+    @staticmethod
+    def _resolved(model) -> list:
+        """Conditions selecting resolved rows from the resolution index of `model`."""
+        conditions = [model.resolved_at.is_not(None), resolution_minutes(model).is_not(None)]
+        if model is IncidentDB:
+            # Archived incidents are always resolved; hot ones may have been reopened
+            conditions.append(model.status == 'resolved')
+        return conditions
+
+    def _ranked_resolution(self, db: Session, incident_type: str, priority: str,
+                           rank: int, count: int) -> Optional[float]:
+        """The rank-th shortest resolution time (1-based) of one type and priority."""
+        descending = rank > (count + 1) // 2
+        offset = count - rank if descending else rank - 1
+        parts = [
+            select(resolution_minutes(model).label("minutes")).where(
+                *self._resolved(model), model.type == incident_type, model.priority == priority
+            )
+            for model in HISTORY_MODELS
+        ]
+        order = literal_column("minutes").desc() if descending else literal_column("minutes")
+        return db.execute(union_all(*parts).order_by(order).limit(1).offset(offset)).scalar()
+
+
 analytics_service = AnalyticsService()
@@ -0,0 +1,113 @@
+"""
+Hot/cold partitioning of incidents.
+Moves resolved incidents into the archive table after a configurable age and
+serves history queries from it.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import AsyncSessionLocal
+from ..db_models import IncidentArchiveDB
+from .data_feeds import DataFeedService, data_feed_service, decode_cursor, notes_column, parse_fields
+
+# Columns backing each field of an archived incident, for sparse fieldsets
+ARCHIVE_FIELDS = {
+    "id": (IncidentArchiveDB.id,),
+    "type": (IncidentArchiveDB.type,),
+    "priority": (IncidentArchiveDB.priority,),
+    "location": (IncidentArchiveDB.latitude, IncidentArchiveDB.longitude, IncidentArchiveDB.address),
+    "description": (IncidentArchiveDB.description,),
+    "affected_count": (IncidentArchiveDB.affected_count,),
+    "reported_at": (IncidentArchiveDB.reported_at,),
+    "report_count": (IncidentArchiveDB.report_count,),
+    "last_reported_at": (IncidentArchiveDB.last_reported_at,),
+    "resolved_at": (IncidentArchiveDB.resolved_at,),
+    "status": (IncidentArchiveDB.status,),
+    "assigned_assets": (IncidentArchiveDB.assigned_assets,),
+    "notes": (notes_column(IncidentArchiveDB.id),),
+    "archived_at": (IncidentArchiveDB.archived_at,),
+}
+
+
+class IncidentArchiveService:
+    """
+    Keeps the `incidents` table (and the in-memory store) down to the hot set.
+
+    A background task periodically moves incidents resolved more than
+    ARCHIVE_RESOLVED_AFTER_HOURS ago into `incidents_archive`. Active-path
+    reads never see archived rows; history and analytics query the archive
+    explicitly.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    async def archive_once(self, now: datetime = None) -> int:
+        cutoff = (now or datetime.utcnow()) - timedelta(hours=settings.ARCHIVE_RESOLVED_AFTER_HOURS)
+        return await data_feed_service.aarchive_resolved_incidents(cutoff)
+
+    async def _run(self, interval_seconds: float):
+        while True:
+            try:
+                moved = await self.archive_once()
+                if moved:
+                    print(f"Archived {moved} resolved incidents")
+            except Exception as e:
+                print(f"Incident archiving failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    def start(self, interval_seconds: float = None):
+        """Start the background archiving task on the running event loop."""
+        if self._task is None or self._task.done():
+            interval = interval_seconds or settings.ARCHIVE_INTERVAL_MINUTES * 60
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # --- History ---
+    async def aquery_history(self, **filters) -> Tuple[List[dict], Optional[str]]:
+        async with AsyncSessionLocal() as db:
+            return await db.run_sync(lambda session: self.query_history(session, **filters))
+
+    def query_history(self, db: Session, priority: List[str] = None, incident_type: List[str] = None,
+                      resolved_from: datetime = None, resolved_to: datetime = None,
+                      cursor: str = None, limit: int = 100, fields: str = None) -> Tuple[List[dict], Optional[str]]:
+        """Page archived incidents by (resolved_at, id), oldest first."""
+        conditions = []
+        if priority:
+            conditions.append(IncidentArchiveDB.priority.in_(priority))
+        if incident_type:
+            conditions.append(IncidentArchiveDB.type.in_(incident_type))
+        if resolved_from:
+            conditions.append(IncidentArchiveDB.resolved_at >= resolved_from)
+        if resolved_to:
+            conditions.append(IncidentArchiveDB.resolved_at < resolved_to)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 2:
+                raise ValueError("Invalid cursor")
+            try:
+                after = (datetime.fromisoformat(values[0]), values[1])
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            conditions.append(tuple_(IncidentArchiveDB.resolved_at, IncidentArchiveDB.id) > after)
+        return DataFeedService._page(
+            db, ARCHIVE_FIELDS, parse_fields(fields, ARCHIVE_FIELDS), conditions,
+            order_by=(IncidentArchiveDB.resolved_at, IncidentArchiveDB.id), limit=limit
+        )
+
+
+# Singleton instance
+incident_archive_service = IncidentArchiveService()
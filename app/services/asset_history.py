@@ -0,0 +1,61 @@
+"""
+Asset status-transition history.
+
+Every change of assets.status is appended to asset_status_events by
+triggers, so all write paths (ORM updates, assignment changes, the bulk
+release when an incident is resolved, seeding) log it in the same
+transaction. Each status holds from its changed_at until the asset's next event.
+"""
+import re
+
+from sqlalchemy.engine import Engine
+
+from ..database import engine
+
+# Same text as SQLAlchemy's DATETIME storage format, for rows written without last_updated
+_NOW = "strftime('%Y-%m-%d %H:%M:%S', 'now') || '.000000'"
+
+_LOG = (
+    "INSERT INTO asset_status_events (asset_id, status, changed_at) "
+    f"VALUES (new.id, new.status, COALESCE(new.last_updated, {_NOW}));"
+)
+
+_TRIGGERS = (
+    f"""CREATE TRIGGER IF NOT EXISTS asset_status_ai AFTER INSERT ON assets BEGIN
+        {_LOG}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS asset_status_au AFTER UPDATE OF status ON assets
+    WHEN new.status IS NOT old.status BEGIN
+        {_LOG}
+    END""",
+)
+
+_TRIGGER_NAMES = tuple(re.search(r"EXISTS (\w+)", sql).group(1) for sql in _TRIGGERS)
+
+# Assets without any history start with their current status as of their last update
+_SEED = (
+    "INSERT INTO asset_status_events (asset_id, status, changed_at) "
+    f"SELECT a.id, a.status, COALESCE(a.last_updated, {_NOW}) FROM assets a "
+    "WHERE NOT EXISTS (SELECT 1 FROM asset_status_events e WHERE e.asset_id = a.id)"
+)
+
+
+def ensure_status_history(bind: Engine = None):
+    """Create the status triggers and give every asset without history its current status. Idempotent."""
+    with (bind or engine).begin() as conn:
+        conn.exec_driver_sql(_SEED)
+        for trigger in _TRIGGERS:
+            conn.exec_driver_sql(trigger)
+
+
+def drop_status_triggers(cursor):
+    """Stop logging status changes, e.g. before a bulk load (DBAPI cursor, inside a transaction)."""
+    for name in _TRIGGER_NAMES:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def rebuild_status_history(cursor):
+    """Seed history for assets that have none and reinstate the triggers (DBAPI cursor)."""
+    cursor.execute(_SEED)
+    for trigger in _TRIGGERS:
+        cursor.execute(trigger)
@@ -0,0 +1,73 @@
+"""
+Optimistic concurrency control for incidents and assets.
+Rows carry a `version` that every write bumps; conditional writes compare-and-swap it.
+"""
+import asyncio
+import random
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+
+T = TypeVar("T")
+
+
+class ConcurrencyConflict(Exception):
+    """A conditional write found the row at a different version than expected."""
+
+    def __init__(self, entity: str, entity_id: str, expected_version: int, current_version: int):
+        super().__init__(
+            f"{entity} {entity_id} was modified concurrently "
+            f"(expected version {expected_version}, current version {current_version})"
+        )
+        self.entity = entity
+        self.entity_id = entity_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+
+
+def claim_version(db: Session, model, row_id: str, expected_version: Optional[int] = None) -> Optional[int]:
+    """
+    Bump a row's version, only if it still equals `expected_version` when one is given.
+
+    This is a single UPDATE ... WHERE version = ?, so it is atomic across
+    sessions and processes, and it takes SQLite's write lock for the rest of
+    the transaction. Returns the new version, or None if the row does not
+    exist; raises ConcurrencyConflict if the version no longer matches.
+    """
+    stmt = update(model).where(model.id == row_id)
+    if expected_version is not None:
+        stmt = stmt.where(model.version == expected_version)
+    version = db.execute(
+        stmt.values(version=model.version + 1).returning(model.version),
+        execution_options={"synchronize_session": False}
+    ).scalar()
+    if version is None:
+        current = db.execute(select(model.version).where(model.id == row_id)).scalar()
+        db.rollback()
+        if current is not None:
+            raise ConcurrencyConflict(model.__tablename__, row_id, expected_version, current)
+    return version
+
+
+async def retry_on_conflict(attempt: Callable[[], Awaitable[T]], attempts: int = None) -> T:
+    """
+    Await `attempt()` until it finishes without a ConcurrencyConflict.
+
+    Each attempt must re-read the state it depends on and pass the versions it
+    saw, so a retry decides again on fresh data instead of overwriting the
+    concurrent change. The data feed service reloads a conflicting row that
+    another process changed into the state store before the conflict
+    propagates, so re-reading the store is enough. Retries back off with
+    jitter; the last conflict is re-raised.
+    """
+    attempts = attempts or settings.CONFLICT_RETRY_ATTEMPTS
+    for n in range(attempts):
+        try:
+            return await attempt()
+        except ConcurrencyConflict:
+            if n == attempts - 1:
+                raise
+            await asyncio.sleep(random.uniform(0, 0.005 * 2 ** n))
@@ -0,0 +1,91 @@
+"""
+Incrementally maintained summary counters for the dashboard.
+Keeps incident and asset totals current on every mutation so /api/summary is O(1).
+"""
+from collections import Counter
+from typing import Optional
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import Session
+from ..db_models import IncidentDB, AssetDB
+from ..models import Incident, Asset
+
+DEPLOYED_STATUSES = ("deployed", "en_route", "on_scene")
+
+
+def _key(value) -> Optional[str]:
+    """Normalize enum members and raw strings to the stored string value."""
+    return getattr(value, "value", value)
+
+
+class SummaryCounters:
+    """
+    Totals by incident priority, asset status and affected population.
+
+    Loaded once with a single grouped aggregate over both tables, then
+    updated with the (old, new) pair of every incident and asset write.
+    """
+
+    def __init__(self):
+        self.incidents_by_priority: Counter = Counter()
+        self.assets_by_status: Counter = Counter()
+        self.total_affected = 0
+
+    def load(self, db: Session):
+        """Cold start: compute every counter in one grouped SQL aggregate."""
+        incident_groups = select(
+            literal("incident").label("kind"),
+            IncidentDB.priority.label("key"),
+            func.count().label("n"),
+            func.coalesce(func.sum(IncidentDB.affected_count), 0).label("affected")
+        ).group_by(IncidentDB.priority)
+        asset_groups = select(
+            literal("asset").label("kind"),
+            AssetDB.status.label("key"),
+            func.count().label("n"),
+            literal(0).label("affected")
+        ).group_by(AssetDB.status)
+
+        self.incidents_by_priority = Counter()
+        self.assets_by_status = Counter()
+        self.total_affected = 0
+        for kind, key, n, affected in db.execute(union_all(incident_groups, asset_groups)):
+            if kind == "incident":
+                self.incidents_by_priority[key] += n
+                self.total_affected += affected or 0
+            else:
+                self.assets_by_status[key] += n
+
+    def apply_incident(self, old: Optional[Incident], new: Optional[Incident]):
+        """Account for an incident being created, changed (old and new) or deleted."""
+        if old is not None:
+            self.incidents_by_priority[_key(old.priority)] -= 1
+            self.total_affected -= old.affected_count or 0
+        if new is not None:
+            self.incidents_by_priority[_key(new.priority)] += 1
+            self.total_affected += new.affected_count or 0
+
+    def apply_asset(self, old: Optional[Asset], new: Optional[Asset]):
+        """Account for an asset being created, changed (old and new) or deleted."""
+        if old is not None:
+            self.assets_by_status[_key(old.status)] -= 1
+        if new is not None:
+            self.assets_by_status[_key(new.status)] += 1
+
+    @property
+    def total_incidents(self) -> int:
+        return sum(self.incidents_by_priority.values())
+
+    @property
+    def total_assets(self) -> int:
+        return sum(self.assets_by_status.values())
+
+    def snapshot(self) -> dict:
+        return {
+            "total_incidents": self.total_incidents,
+            "critical_incidents": self.incidents_by_priority["critical"],
+            "high_priority_incidents": self.incidents_by_priority["high"],
+            "total_assets": self.total_assets,
+            "available_assets": self.assets_by_status["available"],
+            "deployed_assets": sum(self.assets_by_status[s] for s in DEPLOYED_STATUSES),
+            "total_affected": self.total_affected,
+        }
@@ -2,45 +2,297 @@
 Simulated real-time data feeds for the Emergency Coordination System.
 Provides mock data for incidents, assets, weather, and flood conditions.
 """
+import asyncio
+import base64
+import json
 import random
-from datetime import datetime
-from typing import List, Dict
-from ..models import (
-    Incident, Asset, Location, WeatherData,
-    IncidentType, Priority, AssetType, AssetStatus
-)
-
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
+from sqlalchemy import (
+    JSON, delete, distinct, func, insert, literal, or_, select, text, tuple_, type_coerce, union_all, update
+)
 from sqlalchemy.orm import Session
-from ..database import SessionLocal, engine, Base
-from ..db_models import IncidentDB, AssetDB, WeatherDB
+
+from ..config import settings
+from ..database import SessionLocal, AsyncSessionLocal, engine, migrate_schema, set_schema_version
+from ..db_models import (
+    IncidentDB, IncidentArchiveDB, IncidentNoteDB, AssetDB, AssignmentDB, WeatherDB, TombstoneDB
+)
 from ..models import (
-    Incident, Asset, Location, WeatherData,
+    Incident, Asset, Location, WeatherData, PositionFix,
     IncidentType, Priority, AssetType, AssetStatus
 )
-import random
-from datetime import datetime
-from typing import List, Dict
+from ..utils.etag import make_etag
+from .asset_history import ensure_status_history
+from .concurrency import ConcurrencyConflict, claim_version
+from .counters import SummaryCounters
+from .rollups import backfill_incident_rollups, incident_contribution, move_incident, record_incident, record_report
+from .search import ensure_search_index, search_incidents
+from .state_store import OperationalStateStore
+
+
+def served_by(status_column=IncidentDB.status):
+    """
+    Which assignment rows make up an incident's assigned_assets: the live
+    ones or, once it is resolved, every asset that served it.
+    """
+    return or_(AssignmentDB.released_at.is_(None), status_column == "resolved")
+
+
+def assigned_assets_column(incident_id_column=IncidentDB.id, status_column=IncidentDB.status):
+    """Correlated subquery returning an incident's assigned asset ids (see served_by) as a list."""
+    return type_coerce(
+        select(func.json_group_array(distinct(AssignmentDB.asset_id)))
+        .where(AssignmentDB.incident_id == incident_id_column, served_by(status_column))
+        .scalar_subquery(),
+        JSON
+    )
+
+
+def notes_column(incident_id_column=IncidentDB.id):
+    """Correlated subquery returning an incident's note bodies, oldest first, as a list."""
+    return type_coerce(
+        select(func.json_group_array(IncidentNoteDB.body))
+        .where(IncidentNoteDB.incident_id == incident_id_column)
+        .scalar_subquery(),
+        JSON
+    )
+
+
+def migrate_database(bind=None):
+    """
+    Create or upgrade every table, index, search and status-history trigger,
+    run the data migrations below and record SCHEMA_VERSION. Idempotent.
+    """
+    bind = bind or engine
+    upgrade_assignments(bind)
+    migrate_schema(bind)
+    ensure_search_index(bind)
+    ensure_status_history(bind)
+    backfill_assignments(bind)
+    backfill_notes(bind)
+    backfill_incident_rollups(bind)
+    set_schema_version(bind)
+
+
+def backfill_notes(bind=None):
+    """
+    Move notes from the legacy incidents.notes JSON list into incident_notes.
+    Idempotent; the JSON lists are emptied once copied.
+    """
+    legacy = "json_type(i.notes) = 'array' AND json_array_length(i.notes) > 0"
+    with (bind or engine).begin() as conn:
+        conn.execute(text(
+            "INSERT INTO incident_notes (incident_id, author, body, created_at) "
+            "SELECT i.id, NULL, j.value, i.reported_at FROM incidents i, json_each(i.notes) j "
+            f"WHERE {legacy} ORDER BY i.id, j.key"
+        ))
+        conn.execute(text(f"UPDATE incidents AS i SET notes = '[]' WHERE {legacy}"))
+
+
+def upgrade_assignments(bind=None):
+    """
+    Rebuild an `assignments` table from before assignment history (one row
+    per asset, keyed by asset_id) with a row id and released_at, keeping its
+    rows as the live assignments. Runs before migrate_schema. Idempotent.
+    """
+    with (bind or engine).begin() as conn:
+        columns = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(assignments)")}
+        if not columns or "released_at" in columns:
+            return
+        conn.exec_driver_sql("ALTER TABLE assignments RENAME TO assignments_previous")
+        conn.exec_driver_sql("DROP INDEX IF EXISTS ix_assignments_incident_id")
+        AssignmentDB.__table__.create(conn)
+        conn.exec_driver_sql(
+            "INSERT INTO assignments (asset_id, incident_id, assigned_at) "
+            "SELECT asset_id, incident_id, assigned_at FROM assignments_previous ORDER BY assigned_at"
+        )
+        conn.exec_driver_sql("DROP TABLE assignments_previous")
+
+
+def backfill_assignments(bind=None):
+    """
+    Populate `assignments` from the legacy columns: assets.assigned_incident and
+    the incidents.assigned_assets JSON list (released as of the resolution for
+    resolved incidents). Idempotent; JSON lists are emptied once copied so
+    released assignments are never resurrected.
+    """
+    with (bind or engine).begin() as conn:
+        conn.execute(text(
+            "INSERT OR IGNORE INTO assignments (asset_id, incident_id, assigned_at) "
+            "SELECT a.id, a.assigned_incident, a.last_updated FROM assets a "
+            "JOIN incidents i ON i.id = a.assigned_incident"
+        ))
+        legacy = "json_type(i.assigned_assets) = 'array' AND json_array_length(i.assigned_assets) > 0"
+        conn.execute(text(
+            "INSERT OR IGNORE INTO assignments (asset_id, incident_id, assigned_at, released_at) "
+            "SELECT j.value, i.id, i.reported_at, "
+            "CASE WHEN i.status = 'resolved' THEN COALESCE(i.resolved_at, i.reported_at) END "
+            "FROM incidents i, json_each(i.assigned_assets) j "
+            f"WHERE {legacy} AND j.value IN (SELECT id FROM assets)"
+        ))
+        conn.execute(text(f"UPDATE incidents AS i SET assigned_assets = '[]' WHERE {legacy}"))
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+
+# Columns backing each field of the Incident / Asset API models, used to push
+# sparse fieldsets (`fields=`) down into the SELECT list
+INCIDENT_FIELDS = {
+    "id": (IncidentDB.id,),
+    "type": (IncidentDB.type,),
+    "priority": (IncidentDB.priority,),
+    "location": (IncidentDB.latitude, IncidentDB.longitude, IncidentDB.address),
+    "description": (IncidentDB.description,),
+    "affected_count": (IncidentDB.affected_count,),
+    "reported_at": (IncidentDB.reported_at,),
+    "report_count": (IncidentDB.report_count,),
+    "last_reported_at": (IncidentDB.last_reported_at,),
+    "status": (IncidentDB.status,),
+    "assigned_assets": (assigned_assets_column(),),
+    "notes": (notes_column(),),
+    "version": (IncidentDB.version,),
+}
+
+ASSET_FIELDS = {
+    "id": (AssetDB.id,),
+    "name": (AssetDB.name,),
+    "type": (AssetDB.type,),
+    "status": (AssetDB.status,),
+    "location": (AssetDB.latitude, AssetDB.longitude, AssetDB.address),
+    "capacity": (AssetDB.capacity,),
+    "crew_size": (AssetDB.crew_size,),
+    "assigned_incident": (AssetDB.assigned_incident,),
+    "eta_minutes": (AssetDB.eta_minutes,),
+    "last_updated": (AssetDB.last_updated,),
+    "version": (AssetDB.version,),
+}
+
+MAX_PAGE_SIZE = 1000
+
+# Most to least severe
+PRIORITY_ORDER = list(Priority)
+
+
+def encode_cursor(values: list) -> str:
+    """Encode a keyset position as an opaque URL-safe cursor."""
+    raw = json.dumps(values, default=lambda v: v.isoformat()).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def parse_bbox(value: str) -> Tuple[float, float, float, float]:
+    """Parse 'min_lat,min_lon,max_lat,max_lon'. Raises ValueError if malformed."""
+    try:
+        min_lat, min_lon, max_lat, max_lon = (float(v) for v in value.split(","))
+    except ValueError:
+        raise ValueError("bbox must be min_lat,min_lon,max_lat,max_lon")
+    if min_lat > max_lat or min_lon > max_lon:
+        raise ValueError("bbox minimums must not exceed maximums")
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def parse_fields(value: Optional[str], allowed: dict) -> List[str]:
+    """Parse a comma-separated sparse fieldset; `id` is always included."""
+    if not value:
+        return list(allowed)
+    fields = ["id"]
+    for name in (f.strip() for f in value.split(",")):
+        if not name or name in fields:
+            continue
+        if name not in allowed:
+            raise ValueError(f"Unknown field: {name}")
+        fields.append(name)
+    return fields
+
+
+def current_change_version(db: Session) -> int:
+    """Highest change version committed to incidents, assets or tombstones."""
+    arms = union_all(*(
+        select(func.max(model.change_version).label("v"))
+        for model in (IncidentDB, AssetDB, TombstoneDB)
+    )).subquery()
+    return db.execute(select(func.max(arms.c.v))).scalar() or 0
+
+
+def stamp_change(db: Session, db_obj) -> int:
+    """
+    Give a pending insert/update the next change version.
+    The flush takes SQLite's write lock first, so versions are handed out and
+    committed in the same order no matter which session or thread writes.
+    Versions come from MAX(), so a row holding the current version may only
+    be removed together with a record that keeps it (e.g. its tombstone).
+    """
+    db.flush()
+    db_obj.change_version = current_change_version(db) + 1
+    return db_obj.change_version
 
 class DataFeedService:
-    """Service providing simulated real-time data feeds using SQLite database."""
+    """
+    Service providing simulated real-time data feeds.
+    Reads are served from an in-memory state store; SQLite is the durable log behind it.
+    Construction is cheap: the store loads on first use, and the schema and demo
+    data are prepared by app.bootstrap (`python -m app.cli init`).
+    """
     
     def __init__(self):
-        self._initialize_demo_data()
+        self.state = OperationalStateStore()
+        # Serializes DB write + cache apply so the store sees commits in order
+        self._write_lock = threading.Lock()
+        self._async_write_lock = asyncio.Lock()
     
     def get_db(self):
         return SessionLocal()
+
+    def _state(self) -> OperationalStateStore:
+        """Return the state store, loading it from the database on first use."""
+        if not self.state.loaded:
+            with self._write_lock:
+                if not self.state.loaded:
+                    self.reload_state()
+        return self.state
+
+    def reload_state(self):
+        """(Re)load the in-memory state store from the database."""
+        db = self.get_db()
+        try:
+            assigned = self._assigned_asset_ids(db)
+            notes = defaultdict(list)
+            for incident_id, body in db.execute(
+                select(IncidentNoteDB.incident_id, IncidentNoteDB.body).order_by(IncidentNoteDB.id)
+            ):
+                notes[incident_id].append(body)
+            incidents = [
+                self._to_incident_model(i, assigned.get(i.id), notes.get(i.id))
+                for i in db.query(IncidentDB).all()
+            ]
+            assets = [self._to_asset_model(a) for a in db.query(AssetDB).all()]
+            weather = db.query(WeatherDB).order_by(WeatherDB.timestamp.desc()).first()
+            counters = SummaryCounters()
+            counters.load(db)
+            self.state.load(incidents, assets, self._to_weather_model(weather), counters)
+        finally:
+            db.close()
         
-    def _initialize_demo_data(self):
-        """Initialize demo data if database is empty."""
+    def seed_demo_data(self) -> bool:
+        """Insert the demo incidents, assets and weather if the database is empty."""
         db = self.get_db()
         try:
             # Check if data exists
             if db.query(IncidentDB).first():
-                return
+                return False
 
             # Create demo incidents
             demo_incidents = [
@@ -272,13 +524,16 @@ class DataFeedService:
             db.add(weather)
             
             db.commit()
+            return True
         except Exception as e:
             db.rollback()
             print(f"Error initializing data: {e}")
+            return False
         finally:
             db.close()
     
-    def _to_incident_model(self, db_obj: IncidentDB) -> Incident:
+    def _to_incident_model(self, db_obj: IncidentDB, assigned_assets: List[str] = None,
+                           notes: List[str] = None) -> Incident:
         if not db_obj: return None
         return Incident(
             id=db_obj.id,
@@ -289,8 +544,11 @@ class DataFeedService:
             affected_count=db_obj.affected_count,
             status=db_obj.status,
             reported_at=db_obj.reported_at,
-            assigned_assets=db_obj.assigned_assets or [],
-            notes=db_obj.notes or []
+            assigned_assets=assigned_assets or [],
+            notes=notes or [],
+            report_count=db_obj.report_count or 1,
+            last_reported_at=db_obj.last_reported_at,
+            version=db_obj.version
         )
 
     def _to_asset_model(self, db_obj: AssetDB) -> Asset:
@@ -305,7 +563,8 @@ class DataFeedService:
             crew_size=db_obj.crew_size,
             assigned_incident=db_obj.assigned_incident,
             eta_minutes=db_obj.eta_minutes,
-            last_updated=db_obj.last_updated
+            last_updated=db_obj.last_updated,
+            version=db_obj.version
         )
 
     def _to_weather_model(self, db_obj: WeatherDB) -> WeatherData:
@@ -320,203 +579,821 @@ class DataFeedService:
             forecast_summary=db_obj.forecast_summary
         )
 
+    # --- Write plumbing ---
+    # Each *_tx method takes a synchronous Session and the state store, commits
+    # its change and applies the result to the store. The sync API runs them on
+    # a plain Session; the async API runs the very same code on an aiosqlite
+    # connection through AsyncSession.run_sync, so the event loop never blocks.
+    # Sync writers are meant for code running off the event loop (CLI, threads).
+    def _write(self, tx, *args):
+        state = self._state()
+        with self._write_lock:
+            db = self.get_db()
+            try:
+                return tx(db, state, *args)
+            except ConcurrencyConflict as conflict:
+                self._refresh_conflicted(db, state, conflict)
+                raise
+            finally:
+                db.close()
+
+    async def _awrite(self, tx, *args):
+        state = self._state()
+        async with self._async_write_lock:
+            async with AsyncSessionLocal() as db:
+                try:
+                    return await db.run_sync(tx, state, *args)
+                except ConcurrencyConflict as conflict:
+                    await db.run_sync(self._refresh_conflicted, state, conflict)
+                    raise
+
+    def _refresh_conflicted(self, db: Session, state: OperationalStateStore, conflict: ConcurrencyConflict):
+        """
+        Reload the row a conditional write conflicted on if the database holds
+        a newer version than the store, i.e. another process changed it. The
+        retry (or the client's next read) then decides on the current row
+        rather than failing again on the version this process last saw.
+        """
+        row_id = conflict.entity_id
+        if conflict.entity == IncidentDB.__tablename__:
+            held = state.get_incident(row_id)
+            if held is None or held.version < conflict.current_version:
+                db_obj = db.get(IncidentDB, row_id)
+                if db_obj is not None:
+                    state.put_incident(self._to_incident_model(
+                        db_obj, self._assigned_asset_ids(db, [row_id]).get(row_id), self._incident_notes(db, row_id)
+                    ))
+        elif conflict.entity == AssetDB.__tablename__:
+            held = state.get_asset(row_id)
+            if held is None or held.version < conflict.current_version:
+                self._put_assets(db, state, [row_id])
+
+    async def _aread(self, fn, *args):
+        async with AsyncSessionLocal() as db:
+            return await db.run_sync(fn, *args)
+
+    def replace_all(self, loader, *args):
+        """
+        Run a bulk loader that rewrites the database behind the store (e.g. a
+        snapshot restore), then reload the store. No other write interleaves.
+        """
+        with self._write_lock:
+            result = loader(*args)
+            self.reload_state()
+            return result
+
+    async def areplace_all(self, loader, *args):
+        async with self._async_write_lock:
+            return await asyncio.to_thread(self.replace_all, loader, *args)
+
+    @staticmethod
+    def _apply_location(db_obj, value):
+        if isinstance(value, dict):
+            if 'latitude' in value: db_obj.latitude = value['latitude']
+            if 'longitude' in value: db_obj.longitude = value['longitude']
+            if 'address' in value: db_obj.address = value['address']
+        else: # Assumed object
+            db_obj.latitude = value.latitude
+            db_obj.longitude = value.longitude
+            db_obj.address = value.address
+
     # --- Incident Methods ---
     def get_all_incidents(self) -> List[Incident]:
-        db = self.get_db()
-        try:
-            incidents = db.query(IncidentDB).all()
-            return [self._to_incident_model(i) for i in incidents]
-        finally:
-            db.close()
+        return self._state().list_incidents()
+
+    def get_all_incident_rows(self) -> List[dict]:
+        """Every incident as a plain dict, ready for FastJSONResponse."""
+        return self._state().list_incident_rows()
     
     def get_incident(self, incident_id: str) -> Incident:
-        db = self.get_db()
-        try:
-            incident = db.query(IncidentDB).filter(IncidentDB.id == incident_id).first()
-            return self._to_incident_model(incident)
-        finally:
-            db.close()
+        return self._state().get_incident(incident_id)
     
     def add_incident(self, incident: Incident) -> Incident:
-        db = self.get_db()
-        try:
-            db_obj = IncidentDB(
-                id=incident.id,
-                type=incident.type,
-                priority=incident.priority,
-                description=incident.description,
-                affected_count=incident.affected_count,
-                latitude=incident.location.latitude,
-                longitude=incident.location.longitude,
-                address=incident.location.address,
-                status=incident.status,
-                reported_at=incident.reported_at,
-                assigned_assets=incident.assigned_assets,
-                notes=incident.notes
-            )
-            db.add(db_obj)
-            db.commit()
-            return incident
-        finally:
-            db.close()
+        return self._write(self._add_incident_tx, incident)
+
+    async def aadd_incident(self, incident: Incident) -> Incident:
+        return await self._awrite(self._add_incident_tx, incident)
+
+    def _add_incident_tx(self, db: Session, state: OperationalStateStore, incident: Incident) -> Incident:
+        db_obj = IncidentDB(
+            id=incident.id,
+            type=incident.type,
+            priority=incident.priority,
+            description=incident.description,
+            affected_count=incident.affected_count,
+            latitude=incident.location.latitude,
+            longitude=incident.location.longitude,
+            address=incident.location.address,
+            status=incident.status,
+            reported_at=incident.reported_at,
+            last_reported_at=incident.reported_at,
+            assigned_assets=[],
+            notes=[],
+            version=1
+        )
+        # Assignments are made through assign_asset, never on creation; clustering
+        # starts every incident as a single report
+        incident = incident.model_copy(update={
+            "assigned_assets": [], "report_count": 1, "last_reported_at": incident.reported_at, "version": 1
+        })
+        db.add(db_obj)
+        for note in incident.notes:
+            db.add(IncidentNoteDB(incident_id=incident.id, body=note, created_at=incident.reported_at))
+        record_report(db, incident.type, incident.priority, incident.reported_at)
+        stamp_change(db, db_obj)
+        # Stamped first, so dropping the tombstone never lowers the current version
+        db.query(TombstoneDB).filter(
+            TombstoneDB.entity == "incident", TombstoneDB.entity_id == incident.id
+        ).delete(synchronize_session=False)
+        db.commit()
+        state.put_incident(incident)
+        return incident
     
-    def update_incident(self, incident_id: str, updates: dict) -> Incident:
-        db = self.get_db()
-        try:
-            db_obj = db.query(IncidentDB).filter(IncidentDB.id == incident_id).first()
-            if db_obj:
-                for key, value in updates.items():
-                    if key == 'location':
-                        # Handle location update specially
-                         if isinstance(value, dict):
-                            if 'latitude' in value: db_obj.latitude = value['latitude']
-                            if 'longitude' in value: db_obj.longitude = value['longitude']
-                            if 'address' in value: db_obj.address = value['address']
-                         else: # Assumed object
-                            db_obj.latitude = value.latitude
-                            db_obj.longitude = value.longitude
-                            db_obj.address = value.address
-                    elif hasattr(db_obj, key):
-                        setattr(db_obj, key, value)
-                db.commit()
-                db.refresh(db_obj)
-            return self._to_incident_model(db_obj)
-        finally:
-            db.close()
+    # --- Report clustering ---
+    # During landfall many callers report the same flooded street. A report
+    # that matches an unresolved incident of the same type nearby and within
+    # the time window (OperationalStateStore.match_incident, a lookup in the
+    # type's cells of the incident grid) is folded into it: affected counts add
+    # up, the higher priority wins and the description is kept as a note, so
+    # the incident count tracks real events rather than call volume.
+    def report_incident(self, incident: Incident) -> Tuple[Incident, bool]:
+        return self._write(self._report_incident_tx, incident)
+
+    async def areport_incident(self, incident: Incident) -> Tuple[Incident, bool]:
+        return await self._awrite(self._report_incident_tx, incident)
+
+    def _report_incident_tx(self, db: Session, state: OperationalStateStore,
+                            incident: Incident) -> Tuple[Incident, bool]:
+        """
+        Merge a new report into a matching incident, or add it as a new one.
+        Returns the resulting incident and whether the report was merged.
+        """
+        match = None
+        if settings.INCIDENT_CLUSTER_RADIUS_METERS > 0:
+            match = state.match_incident(
+                incident.type, incident.location.latitude, incident.location.longitude, incident.reported_at,
+                settings.INCIDENT_CLUSTER_RADIUS_METERS / 1000,
+                timedelta(minutes=settings.INCIDENT_CLUSTER_WINDOW_MINUTES)
+            )
+        # The version bump takes the write lock, so the row cannot change under the merge
+        if match is None or claim_version(db, IncidentDB, match.id) is None:
+            return self._add_incident_tx(db, state, incident), False
+        db_obj = db.get(IncidentDB, match.id)
+        if db_obj.status == "resolved":
+            # Resolved by another process since the state store last saw it
+            db.rollback()
+            return self._add_incident_tx(db, state, incident), False
+        before = incident_contribution(db_obj)
+        db_obj.affected_count = (db_obj.affected_count or 0) + incident.affected_count
+        db_obj.report_count = (db_obj.report_count or 1) + 1
+        db_obj.last_reported_at = max(db_obj.last_reported_at or db_obj.reported_at, incident.reported_at)
+        if PRIORITY_ORDER.index(Priority(incident.priority)) < PRIORITY_ORDER.index(Priority(db_obj.priority)):
+            db_obj.priority = incident.priority
+            move_incident(db, before, incident_contribution(db_obj))
+        note = f"Linked report: {incident.description}"
+        db.add(IncidentNoteDB(incident_id=match.id, body=note, created_at=incident.reported_at))
+        stamp_change(db, db_obj)
+        assigned = self._assigned_asset_ids(db, [match.id]).get(match.id)
+        db.commit()
+        db.refresh(db_obj)
+        merged = self._to_incident_model(db_obj, assigned, match.notes + [note])
+        state.put_incident(merged)
+        return merged, True
+
+    def update_incident(self, incident_id: str, updates: dict, expected_version: int = None) -> Incident:
+        return self._write(self._update_incident_tx, incident_id, updates, expected_version)
+
+    async def aupdate_incident(self, incident_id: str, updates: dict, expected_version: int = None) -> Incident:
+        return await self._awrite(self._update_incident_tx, incident_id, updates, expected_version)
+
+    def _update_incident_tx(self, db: Session, state: OperationalStateStore, incident_id: str,
+                            updates: dict, expected_version: int = None) -> Incident:
+        """
+        Apply updates; returns None if the incident does not exist. With
+        `expected_version`, raises ConcurrencyConflict if the incident changed since.
+        """
+        if claim_version(db, IncidentDB, incident_id, expected_version) is None:
+            return None
+        db_obj = db.get(IncidentDB, incident_id)
+        was_resolved = db_obj.status == "resolved"
+        # Captured before the updates, so a change of type or priority takes back the right buckets
+        before = incident_contribution(db_obj)
+        for key, value in updates.items():
+            if key == 'location':
+                self._apply_location(db_obj, value)
+            elif key in ('assigned_assets', 'notes'):
+                continue  # Derived from the assignments / incident_notes tables
+            elif key in ('version', 'change_version'):
+                continue  # Managed by claim_version / stamp_change
+            elif hasattr(db_obj, key):
+                setattr(db_obj, key, value)
+        if db_obj.status == "resolved" and not was_resolved:
+            # Resolution analytics need the time whichever path resolved it
+            if db_obj.resolved_at is None:
+                db_obj.resolved_at = datetime.utcnow()
+        elif was_resolved and db_obj.status != "resolved":
+            db_obj.resolved_at = None
+        # Resolve, reopen, or a change of type, priority or times moves the incident in the trend
+        move_incident(db, before, incident_contribution(db_obj))
+        version = stamp_change(db, db_obj)
+        released = []
+        if db_obj.status == "resolved":
+            released = self._release_incident_assets(db, incident_id, version)
+        # The assets listed depend on the new status
+        db.flush()
+        assigned = self._assigned_asset_ids(db, [incident_id]).get(incident_id)
+        current = state.get_incident(incident_id)
+        notes = current.notes if current else self._incident_notes(db, incident_id)
+        db.commit()
+        db.refresh(db_obj)
+        incident = self._to_incident_model(db_obj, assigned, notes)
+        state.put_incident(incident)
+        self._put_assets(db, state, released)
+        return incident
     
     def delete_incident(self, incident_id: str) -> bool:
+        return self._write(self._delete_incident_tx, incident_id)
+
+    async def adelete_incident(self, incident_id: str) -> bool:
+        return await self._awrite(self._delete_incident_tx, incident_id)
+
+    def _delete_incident_tx(self, db: Session, state: OperationalStateStore, incident_id: str) -> bool:
+        db_obj = db.query(IncidentDB).filter(IncidentDB.id == incident_id).first()
+        if not db_obj:
+            return False
+        # The tombstone inherits the row's final version, so it is never reused
+        version = stamp_change(db, db_obj)
+        db.merge(TombstoneDB(
+            entity="incident",
+            entity_id=incident_id,
+            change_version=version,
+            deleted_at=datetime.utcnow()
+        ))
+        released = self._release_incident_assets(db, incident_id, version)
+        db.query(AssignmentDB).filter(AssignmentDB.incident_id == incident_id).delete(synchronize_session=False)
+        db.query(IncidentNoteDB).filter(IncidentNoteDB.incident_id == incident_id).delete(synchronize_session=False)
+        # Its report (and resolution) leave the trend with it
+        record_incident(db, incident_contribution(db_obj), sign=-1)
+        db.delete(db_obj)
+        db.commit()
+        state.remove_incident(incident_id)
+        self._put_assets(db, state, released)
+        return True
+    
+    # --- Notes ---
+    # Notes are append-only rows in incident_notes: adding one is a single
+    # INSERT, never a rewrite of the incident's whole note list.
+    def add_note(self, incident_id: str, body: str, author: str = None) -> Optional[dict]:
+        return self._write(self._add_note_tx, incident_id, body, author)
+
+    async def aadd_note(self, incident_id: str, body: str, author: str = None) -> Optional[dict]:
+        return await self._awrite(self._add_note_tx, incident_id, body, author)
+
+    def _add_note_tx(self, db: Session, state: OperationalStateStore,
+                     incident_id: str, body: str, author: str = None) -> Optional[dict]:
+        """Append a note; returns it as a dict, or None if the incident does not exist."""
+        note = IncidentNoteDB(incident_id=incident_id, author=author, body=body, created_at=datetime.utcnow())
+        db.add(note)
+        db.flush()
+        incident_obj = db.get(IncidentDB, incident_id)
+        if incident_obj is None:
+            db.rollback()
+            return None
+        # The incident's notes changed, so delta sync must resend it
+        stamp_change(db, incident_obj)
+        result = self._note_dict(note)
+        db.commit()
+        state.append_incident_note(incident_id, body)
+        return result
+
+    def get_notes(self, incident_id: str) -> List[dict]:
         db = self.get_db()
         try:
-            db_obj = db.query(IncidentDB).filter(IncidentDB.id == incident_id).first()
-            if db_obj:
-                db.delete(db_obj)
-                db.commit()
-                return True
-            return False
+            return self._get_notes(db, incident_id)
         finally:
             db.close()
+
+    async def aget_notes(self, incident_id: str) -> List[dict]:
+        return await self._aread(self._get_notes, incident_id)
+
+    def _get_notes(self, db: Session, incident_id: str) -> List[dict]:
+        rows = db.query(IncidentNoteDB).filter(IncidentNoteDB.incident_id == incident_id).order_by(IncidentNoteDB.id)
+        return [self._note_dict(n) for n in rows]
+
+    @staticmethod
+    def _incident_notes(db: Session, incident_id: str) -> List[str]:
+        return list(db.execute(
+            select(IncidentNoteDB.body).where(IncidentNoteDB.incident_id == incident_id).order_by(IncidentNoteDB.id)
+        ).scalars())
+
+    @staticmethod
+    def _note_dict(note: IncidentNoteDB) -> dict:
+        return {
+            "id": note.id,
+            "incident_id": note.incident_id,
+            "author": note.author,
+            "body": note.body,
+            "created_at": note.created_at,
+        }
+
+    async def asearch_incidents(self, query: str, limit: int = 20) -> List[dict]:
+        """
+        Full-text search over descriptions and notes of active incidents.
+        Ranking runs in SQLite FTS5; incidents are attached from the state store.
+        """
+        hits = await self._aread(search_incidents, query, limit)
+        state = self._state()
+        results = []
+        for hit in hits:
+            row = state.incident_rows.get(hit["incident_id"])
+            if row is not None:
+                results.append({"incident": row, "score": hit["score"], "matches": hit["matches"]})
+        return results
+
+    def archive_resolved_incidents(self, resolved_before: datetime, batch_size: int = 500) -> int:
+        total = 0
+        while True:
+            moved = self._write(self._archive_resolved_tx, resolved_before, batch_size)
+            total += moved
+            if moved < batch_size:
+                return total
+
+    async def aarchive_resolved_incidents(self, resolved_before: datetime, batch_size: int = 500) -> int:
+        """
+        Move incidents resolved before `resolved_before` to the archive table,
+        one batch per transaction so writers are never blocked for long.
+        Returns the number of incidents archived.
+        """
+        total = 0
+        while True:
+            moved = await self._awrite(self._archive_resolved_tx, resolved_before, batch_size)
+            total += moved
+            if moved < batch_size:
+                return total
+
+    def _archive_resolved_tx(self, db: Session, state: OperationalStateStore,
+                             resolved_before: datetime, batch_size: int) -> int:
+        ids = db.execute(
+            select(IncidentDB.id).where(
+                IncidentDB.status == "resolved", IncidentDB.resolved_at < resolved_before
+            ).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            return 0
+        hot = IncidentDB.__table__
+        # The legacy assigned_assets column is always empty: the list comes from the assignment history
+        derived = {"assigned_assets": assigned_assets_column(hot.c.id, hot.c.status)}
+        columns = [c.name for c in IncidentArchiveDB.__table__.columns if c.name in hot.c]
+        db.execute(
+            insert(IncidentArchiveDB).prefix_with("OR REPLACE").from_select(
+                columns + ["archived_at"],
+                select(*(derived.get(name, hot.c[name]) for name in columns), literal(datetime.utcnow()))
+                .where(hot.c.id.in_(ids))
+            )
+        )
+        # Archived with the incident, so its assignment history goes
+        db.query(AssignmentDB).filter(AssignmentDB.incident_id.in_(ids)).delete(synchronize_session=False)
+        # Delta-sync clients drop archived incidents like deleted ones
+        version = current_change_version(db)
+        now = datetime.utcnow()
+        for offset, incident_id in enumerate(ids, start=1):
+            db.merge(TombstoneDB(entity="incident", entity_id=incident_id,
+                                 change_version=version + offset, deleted_at=now))
+        db.query(IncidentDB).filter(IncidentDB.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        for incident_id in ids:
+            state.remove_incident(incident_id)
+        return len(ids)
     
     # --- Asset Methods ---
     def get_all_assets(self) -> List[Asset]:
-        db = self.get_db()
-        try:
-            assets = db.query(AssetDB).all()
-            return [self._to_asset_model(a) for a in assets]
-        finally:
-            db.close()
+        return self._state().list_assets()
+
+    def get_all_asset_rows(self) -> List[dict]:
+        """Every asset as a plain dict, ready for FastJSONResponse."""
+        return self._state().list_asset_rows()
     
     def get_asset(self, asset_id: str) -> Asset:
+        return self._state().get_asset(asset_id)
+    
+    def get_available_assets(self) -> List[Asset]:
+        return self._state().list_assets_where(statuses=[AssetStatus.AVAILABLE])
+
+    def get_asset_positions(self, **filters) -> List[dict]:
+        """Live positions from the in-memory position store; see PositionStore.mask for filters."""
+        return self._state().position_records(**filters)
+
+    def get_asset_position(self, asset_id: str) -> Optional[Tuple[float, float]]:
+        return self._state().asset_position(asset_id)
+
+    def move_assets(self, asset_ids: List[str], latitudes: List[float], longitudes: List[float],
+                    recorded_at: List[datetime]):
+        """Apply live position fixes in memory; apply_positions makes them durable."""
+        return self._state().move_assets(asset_ids, latitudes, longitudes, recorded_at)
+
+    def find_nearest_assets(self, latitude: float, longitude: float, k: int = 5,
+                            asset_type: AssetType = None, status: AssetStatus = None,
+                            max_distance_km: float = None) -> List[Tuple[Asset, float]]:
+        """Find the k closest assets to a position, optionally filtered by type and status."""
+        return self._state().nearest_assets(
+            latitude, longitude, k,
+            asset_type=asset_type, status=status, max_distance_km=max_distance_km
+        )
+    
+    def update_asset(self, asset_id: str, updates: dict, expected_version: int = None) -> Asset:
+        return self._write(self._update_asset_tx, asset_id, updates, expected_version)
+
+    async def aupdate_asset(self, asset_id: str, updates: dict, expected_version: int = None) -> Asset:
+        return await self._awrite(self._update_asset_tx, asset_id, updates, expected_version)
+
+    def _update_asset_tx(self, db: Session, state: OperationalStateStore, asset_id: str,
+                         updates: dict, expected_version: int = None) -> Asset:
+        """
+        Apply updates; returns None if the asset does not exist. With
+        `expected_version`, raises ConcurrencyConflict if the asset changed since.
+        """
+        if claim_version(db, AssetDB, asset_id, expected_version) is None:
+            return None
+        db_obj = db.get(AssetDB, asset_id)
+        for key, value in updates.items():
+            if key == 'location':
+                self._apply_location(db_obj, value)
+            elif key == 'assigned_incident':
+                continue  # Changed only through assign_asset / release_asset
+            elif key in ('version', 'change_version'):
+                continue  # Managed by claim_version / stamp_change
+            elif hasattr(db_obj, key):
+                setattr(db_obj, key, value)
+        db_obj.last_updated = datetime.utcnow()
+        stamp_change(db, db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        asset = self._to_asset_model(db_obj)
+        state.put_asset(asset)
+        return asset
+
+    def apply_positions(self, fixes: Dict[str, PositionFix]) -> int:
+        return self._write(self._apply_positions_tx, fixes)
+
+    async def aapply_positions(self, fixes: Dict[str, PositionFix]) -> int:
+        return await self._awrite(self._apply_positions_tx, fixes)
+
+    def _apply_positions_tx(self, db: Session, state: OperationalStateStore,
+                            fixes: Dict[str, PositionFix]) -> int:
+        """
+        Write the latest position fix of many assets in one executemany UPDATE.
+        Positions do not bump the optimistic-lock version, so telemetry never
+        makes a dispatcher's conditional write fail. Returns the assets moved.
+        """
+        # Skip fixes superseded since they were buffered, e.g. by a PATCH of the location
+        ids = list(fixes)
+        current = state.current_positions(ids, [fixes[i].recorded_at for i in ids]).tolist()
+        ids = [asset_id for asset_id, ok in zip(ids, current) if ok]
+        if not ids:
+            return 0
+        db.execute(update(AssetDB), [
+            {"id": asset_id, "latitude": fixes[asset_id].latitude, "longitude": fixes[asset_id].longitude,
+             "last_updated": fixes[asset_id].recorded_at}
+            for asset_id in ids
+        ])
+        # The UPDATE holds the write lock, so the next change version is ours
+        version = current_change_version(db) + 1
+        db.execute(
+            update(AssetDB).where(AssetDB.id.in_(ids)).values(change_version=version),
+            execution_options={"synchronize_session": False}
+        )
+        db.commit()
+        for asset_id in ids:
+            asset = state.get_asset(asset_id)
+            if asset is not None:
+                fix = fixes[asset_id]
+                state.put_asset(asset.model_copy(update={
+                    "location": asset.location.model_copy(update={"latitude": fix.latitude, "longitude": fix.longitude}),
+                    "last_updated": fix.recorded_at
+                }))
+        return len(ids)
+
+    # --- Assignments ---
+    # The assignments table is the source of truth for which asset serves which
+    # incident (assets.assigned_incident mirrors it). Releasing an assignment
+    # stamps its released_at rather than deleting it, so a resolved incident
+    # still lists the assets that served it. Assign, release and
+    # resolve each change it with one indexed statement, in the same
+    # transaction as the asset and incident rows they affect. Each starts with
+    # the asset's version compare-and-swap, so the rest of the transaction runs
+    # under SQLite's write lock and two dispatchers cannot both win the asset.
+    def assign_asset(self, asset_id: str, incident_id: str, eta_minutes: int = None,
+                     expected_version: int = None) -> Asset:
+        return self._write(self._assign_asset_tx, asset_id, incident_id, eta_minutes, expected_version)
+
+    async def aassign_asset(self, asset_id: str, incident_id: str, eta_minutes: int = None,
+                            expected_version: int = None) -> Asset:
+        return await self._awrite(self._assign_asset_tx, asset_id, incident_id, eta_minutes, expected_version)
+
+    def _assign_asset_tx(self, db: Session, state: OperationalStateStore, asset_id: str,
+                         incident_id: str, eta_minutes: int = None, expected_version: int = None) -> Asset:
+        """Assign (or reassign) an asset; returns None if the asset or incident does not exist."""
+        if claim_version(db, AssetDB, asset_id, expected_version) is None:
+            return None
+        now = datetime.utcnow()
+        previous = self._release_assignment(db, asset_id, now)
+        db_obj = db.get(AssetDB, asset_id)
+        if db.get(IncidentDB, incident_id) is None:
+            db.rollback()
+            return None
+        db.add(AssignmentDB(asset_id=asset_id, incident_id=incident_id, assigned_at=now))
+        db_obj.status = "en_route"
+        db_obj.assigned_incident = incident_id
+        db_obj.eta_minutes = eta_minutes or random.randint(5, 20)
+        db_obj.last_updated = now
+        return self._finish_assignment_change(db, state, db_obj, {incident_id, previous})
+
+    def release_asset(self, asset_id: str, status: str = "available", expected_version: int = None) -> Asset:
+        return self._write(self._release_asset_tx, asset_id, status, expected_version)
+
+    async def arelease_asset(self, asset_id: str, status: str = "available",
+                             expected_version: int = None) -> Asset:
+        return await self._awrite(self._release_asset_tx, asset_id, status, expected_version)
+
+    def _release_asset_tx(self, db: Session, state: OperationalStateStore, asset_id: str,
+                          status: str = "available", expected_version: int = None) -> Asset:
+        """Release an asset from its incident and set its status; returns None if it does not exist."""
+        if claim_version(db, AssetDB, asset_id, expected_version) is None:
+            return None
+        now = datetime.utcnow()
+        previous = self._release_assignment(db, asset_id, now)
+        db_obj = db.get(AssetDB, asset_id)
+        db_obj.status = status
+        db_obj.assigned_incident = None
+        db_obj.eta_minutes = None
+        db_obj.last_updated = now
+        return self._finish_assignment_change(db, state, db_obj, {previous})
+
+    @staticmethod
+    def _release_assignment(db: Session, asset_id: str, now: datetime) -> Optional[str]:
+        """End an asset's live assignment, if any. Returns the incident it served."""
+        return db.execute(
+            update(AssignmentDB).where(AssignmentDB.asset_id == asset_id, AssignmentDB.released_at.is_(None))
+            .values(released_at=now).returning(AssignmentDB.incident_id),
+            execution_options={"synchronize_session": False}
+        ).scalar()
+
+    def _finish_assignment_change(self, db: Session, state: OperationalStateStore,
+                                  db_obj: AssetDB, incident_ids: set) -> Asset:
+        """Stamp the asset and affected incidents, commit and update the store."""
+        incident_ids = [i for i in incident_ids if i]
+        version = stamp_change(db, db_obj)
+        if incident_ids:
+            # Their assigned_assets changed, so delta sync must resend them
+            db.execute(update(IncidentDB).where(IncidentDB.id.in_(incident_ids)).values(change_version=version))
+        assigned = self._assigned_asset_ids(db, incident_ids)
+        db.commit()
+        db.refresh(db_obj)
+        asset = self._to_asset_model(db_obj)
+        state.put_asset(asset)
+        for incident_id in incident_ids:
+            incident = state.get_incident(incident_id)
+            if incident is not None:
+                state.put_incident(incident.model_copy(update={"assigned_assets": assigned.get(incident_id, [])}))
+        return asset
+
+    @staticmethod
+    def _release_incident_assets(db: Session, incident_id: str, version: int) -> List[str]:
+        """Release every asset assigned to an incident (resolve/delete). Returns their ids."""
+        now = datetime.utcnow()
+        released = db.execute(
+            update(AssignmentDB).where(AssignmentDB.incident_id == incident_id, AssignmentDB.released_at.is_(None))
+            .values(released_at=now).returning(AssignmentDB.asset_id),
+            execution_options={"synchronize_session": False}
+        ).scalars().all()
+        if released:
+            db.execute(
+                update(AssetDB).where(AssetDB.id.in_(released)).values(
+                    status="available", assigned_incident=None, eta_minutes=None,
+                    last_updated=now, change_version=version, version=AssetDB.version + 1
+                ),
+                execution_options={"synchronize_session": False}
+            )
+        return released
+
+    @staticmethod
+    def _assigned_asset_ids(db: Session, incident_ids: List[str] = None) -> Dict[str, List[str]]:
+        """assigned_assets of the given incidents (all with None), in assignment order; see served_by."""
+        assigned = defaultdict(list)
+        if incident_ids is not None and not incident_ids:
+            return assigned
+        stmt = (
+            select(AssignmentDB.incident_id, AssignmentDB.asset_id)
+            .join(IncidentDB, IncidentDB.id == AssignmentDB.incident_id)
+            .where(served_by())
+            .order_by(AssignmentDB.id)
+        )
+        if incident_ids is not None:
+            stmt = stmt.where(AssignmentDB.incident_id.in_(incident_ids))
+        for incident_id, asset_id in db.execute(stmt):
+            if asset_id not in assigned[incident_id]:
+                assigned[incident_id].append(asset_id)
+        return assigned
+
+    def _put_assets(self, db: Session, state: OperationalStateStore, asset_ids: List[str]):
+        """Reload committed asset rows into the store."""
+        if asset_ids:
+            for db_obj in db.query(AssetDB).filter(AssetDB.id.in_(asset_ids)):
+                state.put_asset(self._to_asset_model(db_obj))
+    
+    # --- Paged Queries ---
+    # Filtering, keyset pagination and column projection all happen in SQL.
+    # Rows come back as plain dicts shaped like the API models (restricted to
+    # the requested fields) together with the cursor of the next page.
+    def query_incidents(self, **filters) -> Tuple[List[dict], Optional[str]]:
         db = self.get_db()
         try:
-            asset = db.query(AssetDB).filter(AssetDB.id == asset_id).first()
-            return self._to_asset_model(asset)
+            return self._query_incidents(db, **filters)
         finally:
             db.close()
-    
-    def get_available_assets(self) -> List[Asset]:
+
+    async def aquery_incidents(self, **filters) -> Tuple[List[dict], Optional[str]]:
+        return await self._aread(lambda db: self._query_incidents(db, **filters))
+
+    def _query_incidents(self, db: Session, status: List[str] = None, priority: List[str] = None,
+                         incident_type: List[str] = None, bbox: Tuple[float, float, float, float] = None,
+                         cursor: str = None, limit: int = 100, fields: str = None) -> Tuple[List[dict], Optional[str]]:
+        conditions = []
+        if status:
+            conditions.append(IncidentDB.status.in_(status))
+        if priority:
+            conditions.append(IncidentDB.priority.in_(priority))
+        if incident_type:
+            conditions.append(IncidentDB.type.in_(incident_type))
+        if bbox:
+            conditions.extend(self._bbox_conditions(IncidentDB, bbox))
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 2:
+                raise ValueError("Invalid cursor")
+            try:
+                after = (datetime.fromisoformat(values[0]), values[1])
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            conditions.append(tuple_(IncidentDB.reported_at, IncidentDB.id) > after)
+        return self._page(
+            db, INCIDENT_FIELDS, parse_fields(fields, INCIDENT_FIELDS), conditions,
+            order_by=(IncidentDB.reported_at, IncidentDB.id), limit=limit
+        )
+
+    def query_assets(self, **filters) -> Tuple[List[dict], Optional[str]]:
         db = self.get_db()
         try:
-            assets = db.query(AssetDB).filter(AssetDB.status == "available").all()
-            return [self._to_asset_model(a) for a in assets]
+            return self._query_assets(db, **filters)
         finally:
             db.close()
-    
-    def update_asset(self, asset_id: str, updates: dict) -> Asset:
+
+    async def aquery_assets(self, **filters) -> Tuple[List[dict], Optional[str]]:
+        return await self._aread(lambda db: self._query_assets(db, **filters))
+
+    def _query_assets(self, db: Session, status: List[str] = None, asset_type: List[str] = None,
+                      bbox: Tuple[float, float, float, float] = None, cursor: str = None,
+                      limit: int = 100, fields: str = None) -> Tuple[List[dict], Optional[str]]:
+        conditions = []
+        if status:
+            conditions.append(AssetDB.status.in_(status))
+        if asset_type:
+            conditions.append(AssetDB.type.in_(asset_type))
+        if bbox:
+            conditions.extend(self._bbox_conditions(AssetDB, bbox))
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 1:
+                raise ValueError("Invalid cursor")
+            conditions.append(AssetDB.id > values[0])
+        return self._page(
+            db, ASSET_FIELDS, parse_fields(fields, ASSET_FIELDS), conditions,
+            order_by=(AssetDB.id,), limit=limit
+        )
+
+    @staticmethod
+    def _bbox_conditions(model, bbox: Tuple[float, float, float, float]) -> list:
+        min_lat, min_lon, max_lat, max_lon = bbox
+        return [
+            model.latitude.between(min_lat, max_lat),
+            model.longitude.between(min_lon, max_lon),
+        ]
+
+    @staticmethod
+    def _page(db: Session, field_map: dict, fields: List[str], conditions: list,
+              order_by: tuple, limit: int) -> Tuple[List[dict], Optional[str]]:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        columns = [col for name in fields for col in field_map[name]]
+        # Sort key columns are selected too so the next cursor can be built
+        stmt = select(*columns, *order_by).where(*conditions).order_by(*order_by).limit(limit + 1)
+        rows = db.execute(stmt).all()
+        items = DataFeedService._project(rows[:limit], fields)
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(list(last[len(columns):]))
+        return items, next_cursor
+
+    @staticmethod
+    def _project(rows, fields: List[str]) -> List[dict]:
+        """Shape projected rows into dicts matching the API models."""
+        items = []
+        for row in rows:
+            item = {}
+            i = 0
+            for name in fields:
+                if name == "location":
+                    item["location"] = {"latitude": row[i], "longitude": row[i + 1], "address": row[i + 2]}
+                    i += 3
+                else:
+                    item[name] = row[i]
+                    i += 1
+            items.append(item)
+        return items
+
+    # --- Delta Sync ---
+    # Every incident/asset write is stamped with a global, monotonically
+    # increasing change version; deletes leave a tombstone with their own
+    # version. Clients remember the last version they saw and ask only for
+    # what changed after it, which the change_version indexes answer directly.
+    def get_changes(self, since: int = 0) -> dict:
         db = self.get_db()
         try:
-            db_obj = db.query(AssetDB).filter(AssetDB.id == asset_id).first()
-            if db_obj:
-                for key, value in updates.items():
-                    if key == 'location':
-                         if isinstance(value, dict):
-                            if 'latitude' in value: db_obj.latitude = value['latitude']
-                            if 'longitude' in value: db_obj.longitude = value['longitude']
-                            if 'address' in value: db_obj.address = value['address']
-                         else:
-                            db_obj.latitude = value.latitude
-                            db_obj.longitude = value.longitude
-                            db_obj.address = value.address
-                    elif hasattr(db_obj, key):
-                        setattr(db_obj, key, value)
-                db_obj.last_updated = datetime.utcnow()
-                db.commit()
-                db.refresh(db_obj)
-            return self._to_asset_model(db_obj)
+            return self._get_changes(db, since)
         finally:
             db.close()
-    
-    def assign_asset(self, asset_id: str, incident_id: str, eta_minutes: int = None) -> Asset:
-        return self.update_asset(asset_id, {
-            "status": "en_route", # Use string matching DB defaults
-            "assigned_incident": incident_id,
-            "eta_minutes": eta_minutes or random.randint(5, 20)
-        })
-    
-    def release_asset(self, asset_id: str) -> Asset:
-        return self.update_asset(asset_id, {
-            "status": "available",
-            "assigned_incident": None,
-            "eta_minutes": None
-        })
+
+    async def aget_changes(self, since: int = 0) -> dict:
+        return await self._aread(self._get_changes, since)
+
+    def _get_changes(self, db: Session, since: int = 0) -> dict:
+        """
+        Incidents and assets changed after `since`, plus ids deleted since then.
+        since=0 (or a version from a different database) returns a full
+        snapshot with `full` set, telling the client to replace its state.
+        All reads run in one transaction, so `version` matches the rows.
+        """
+        version = current_change_version(db)
+        full = since <= 0 or since > version
+        changes = {"version": version, "full": full}
+        for key, model, field_map in (("incidents", IncidentDB, INCIDENT_FIELDS),
+                                      ("assets", AssetDB, ASSET_FIELDS)):
+            fields = list(field_map)
+            stmt = select(*(col for name in fields for col in field_map[name]))
+            if not full:
+                stmt = stmt.where(model.change_version > since).order_by(model.change_version)
+            changes[key] = self._project(db.execute(stmt).all(), fields)
+
+        deleted = {"incidents": [], "assets": []}
+        if not full:
+            stmt = select(TombstoneDB.entity, TombstoneDB.entity_id).where(
+                TombstoneDB.change_version > since
+            ).order_by(TombstoneDB.change_version)
+            for entity, entity_id in db.execute(stmt):
+                deleted[f"{entity}s"].append(entity_id)
+        changes["deleted"] = deleted
+        return changes
     
     # --- Weather Methods ---
     def get_weather(self) -> WeatherData:
-        db = self.get_db()
-        try:
-            weather = db.query(WeatherDB).order_by(WeatherDB.timestamp.desc()).first()
-            
-            # Simulate slight variations if weather exists
-            if weather:
-                 # In a real app we'd trigger a new reading or logic here, 
-                 # for now let's just update the DB object slightly to mimic the original 'live' feel
-                 weather.wind_speed_mph += random.uniform(-0.5, 0.5)
-                 weather.storm_surge_feet += random.uniform(-0.05, 0.05)
-                 weather.timestamp = datetime.utcnow()
-                 db.commit()
-                 
-            return self._to_weather_model(weather)
-        finally:
-            db.close()
+        """Latest weather observation, served from memory."""
+        return self._state().weather
+
+    async def arecord_weather(self, observation: WeatherData) -> WeatherData:
+        """Append a weather observation and make it the latest reading."""
+        return await self._awrite(self._record_weather_tx, observation)
+
+    def _record_weather_tx(self, db: Session, state: OperationalStateStore,
+                           observation: WeatherData) -> WeatherData:
+        db.add(WeatherDB(
+            timestamp=observation.timestamp,
+            hurricane_category=observation.hurricane_category,
+            wind_speed_mph=observation.wind_speed_mph,
+            rainfall_inches=observation.rainfall_inches,
+            storm_surge_feet=observation.storm_surge_feet,
+            flood_zones_affected=observation.flood_zones_affected,
+            forecast_summary=observation.forecast_summary
+        ))
+        db.commit()
+        state.set_weather(observation)
+        return observation
     
+    def get_etag(self, *scopes: str, extra: tuple = ()) -> str:
+        """
+        Strong ETag for a response built from the given state scopes
+        ('incidents', 'assets', 'weather'), plus any `extra` parts the
+        response also depends on (e.g. the current hour). Served from memory, no DB access.
+        """
+        return make_etag(*self._state().etag_parts(*scopes), *extra)
+
     def get_summary_stats(self) -> dict:
-        db = self.get_db()
-        try:
-            total_incidents = db.query(IncidentDB).count()
-            critical_incidents = db.query(IncidentDB).filter(IncidentDB.priority == "critical").count()
-            high_priority = db.query(IncidentDB).filter(IncidentDB.priority == "high").count()
-            
-            total_assets = db.query(AssetDB).count()
-            available_assets = db.query(AssetDB).filter(AssetDB.status == "available").count()
-            deployed_assets = db.query(AssetDB).filter(AssetDB.status.in_(["deployed", "en_route", "on_scene"])).count()
-            
-            incidents = db.query(IncidentDB).all()
-            total_affected = sum(i.affected_count for i in incidents)
-            
-            weather = db.query(WeatherDB).order_by(WeatherDB.timestamp.desc()).first()
-            weather_data = {
-                 "hurricane_category": 0,
-                 "wind_speed_mph": 0,
-                 "storm_surge_feet": 0
-            }
-            if weather:
-                weather_data = {
-                    "hurricane_category": weather.hurricane_category,
-                    "wind_speed_mph": round(weather.wind_speed_mph),
-                    "storm_surge_feet": round(weather.storm_surge_feet, 1)
-                }
-
-            return {
-                "total_incidents": total_incidents,
-                "critical_incidents": critical_incidents,
-                "high_priority_incidents": high_priority,
-                "total_assets": total_assets,
-                "available_assets": available_assets,
-                "deployed_assets": deployed_assets,
-                "total_affected": total_affected,
-                "weather": weather_data
-            }
-        finally:
-            db.close()
+        """Dashboard summary served from incrementally maintained counters."""
+        return self._state().summary()
+
+    def get_flood_zone_summary(self) -> dict:
+        """Incidents, people affected and assets per flood zone, from memory."""
+        return self._state().flood_zone_summary()
 
 
 # Singleton instance
@@ -0,0 +1,156 @@
+"""
+Flood-zone lookup for incidents and assets.
+Zone polygons are read from a GeoJSON file and points are classified in bulk
+with a vectorized even-odd (crossing number) test.
+"""
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from ..config import settings
+
+NO_ZONE = -1
+
+
+class _Polygon:
+    """Edges of one polygon (outer ring plus holes) as parallel arrays."""
+
+    __slots__ = ("code", "bbox", "x1", "y1", "y2", "slope")
+
+    def __init__(self, code: int, rings: List[List[List[float]]]):
+        x1, y1, x2, y2 = [], [], [], []
+        for ring in rings:
+            points = np.asarray(ring, dtype=np.float64)[:, :2]
+            if len(points) and not np.array_equal(points[0], points[-1]):
+                points = np.vstack([points, points[:1]])
+            x1.append(points[:-1, 0])
+            y1.append(points[:-1, 1])
+            x2.append(points[1:, 0])
+            y2.append(points[1:, 1])
+        self.code = code
+        self.x1 = np.concatenate(x1)
+        self.y1 = np.concatenate(y1)
+        self.y2 = np.concatenate(y2)
+        dy = self.y2 - self.y1
+        # Horizontal edges never cross a ray; their slope is never used
+        self.slope = np.divide(np.concatenate(x2) - self.x1, dy, out=np.zeros_like(dy), where=dy != 0)
+        outer = np.asarray(rings[0], dtype=np.float64)
+        self.bbox = (outer[:, 1].min(), outer[:, 0].min(), outer[:, 1].max(), outer[:, 0].max())
+
+    def contains(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Even-odd test of many points against every edge at once."""
+        py = lats[:, None]
+        straddles = (self.y1 > py) != (self.y2 > py)
+        crosses = straddles & (lons[:, None] < self.x1 + (py - self.y1) * self.slope)
+        return (np.count_nonzero(crosses, axis=1) & 1).astype(bool)
+
+
+class FloodZoneIndex:
+    """
+    Flood-zone polygons with bulk point classification.
+
+    Each GeoJSON feature is a Polygon or MultiPolygon (holes allowed) whose
+    `properties.zone` names the zone. Zones are numbered in order of first
+    appearance; where features overlap, the one earlier in the file wins, so
+    list the most specific zones first. Points are tested against a polygon
+    only if they fall inside its bounding box, and those candidates are
+    checked against all of its edges in one NumPy expression, a chunk of
+    points at a time to bound memory.
+    """
+
+    # Points x edges compared per chunk
+    CHUNK_CELLS = 1 << 20
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.zones: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._polygons: List[_Polygon] = []
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._ensure_loaded()._polygons)
+
+    def load(self, path: str = None):
+        """(Re)load polygons from a GeoJSON file; a missing file leaves the index empty."""
+        path = path or self.path or settings.FLOOD_ZONES_PATH
+        features = []
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                features = json.load(f).get("features", [])
+        zones: List[str] = []
+        polygons: List[_Polygon] = []
+        for feature in features:
+            geometry = feature.get("geometry") or {}
+            zone = (feature.get("properties") or {}).get("zone")
+            if zone is None:
+                raise ValueError(f"Flood zone feature without a 'zone' property in {path}")
+            if geometry.get("type") == "Polygon":
+                parts = [geometry["coordinates"]]
+            elif geometry.get("type") == "MultiPolygon":
+                parts = geometry["coordinates"]
+            else:
+                raise ValueError(f"Unsupported flood zone geometry {geometry.get('type')!r} in {path}")
+            if zone not in zones:
+                zones.append(zone)
+            polygons.extend(_Polygon(zones.index(zone), rings) for rings in parts if rings)
+        with self._lock:
+            self.path = path
+            self.zones, self._polygons = zones, polygons
+            self._codes = {zone: code for code, zone in enumerate(zones)}
+            self.loaded = True
+        return self
+
+    def _ensure_loaded(self) -> "FloodZoneIndex":
+        if not self.loaded:
+            self.load()
+        return self
+
+    def classify(self, latitudes: Sequence[float], longitudes: Sequence[float]) -> np.ndarray:
+        """Zone code of every point (NO_ZONE outside all polygons) as an int16 array."""
+        self._ensure_loaded()
+        lats = np.asarray(latitudes, dtype=np.float64)
+        lons = np.asarray(longitudes, dtype=np.float64)
+        codes = np.full(len(lats), NO_ZONE, dtype=np.int16)
+        for polygon in self._polygons:
+            min_lat, min_lon, max_lat, max_lon = polygon.bbox
+            candidates = np.flatnonzero(
+                (codes == NO_ZONE) & (lats >= min_lat) & (lats <= max_lat) & (lons >= min_lon) & (lons <= max_lon)
+            )
+            chunk = max(1, self.CHUNK_CELLS // len(polygon.x1))
+            for start in range(0, len(candidates), chunk):
+                rows = candidates[start:start + chunk]
+                codes[rows[polygon.contains(lats[rows], lons[rows])]] = polygon.code
+        return codes
+
+    def zone_of(self, latitude: float, longitude: float) -> Optional[str]:
+        """Name of the zone containing a point, or None."""
+        return self.name(int(self.classify([latitude], [longitude])[0]))
+
+    def code(self, zone: Optional[str]) -> int:
+        return self._codes.get(zone, NO_ZONE)
+
+    def name(self, code: int) -> Optional[str]:
+        return self.zones[code] if code != NO_ZONE else None
+
+    def names(self, codes: Iterable[int]) -> List[Optional[str]]:
+        zones = self.zones
+        return [zones[c] if c != NO_ZONE else None for c in codes]
+
+    def tag(self, models: Sequence) -> None:
+        """Set `flood_zone` on incident or asset models from their locations, in one pass."""
+        if not models:
+            return
+        codes = self.classify(
+            [m.location.latitude for m in models], [m.location.longitude for m in models]
+        )
+        for model, zone in zip(models, self.names(codes.tolist())):
+            model.flood_zone = zone
+
+
+# Global instance, loaded from settings.FLOOD_ZONES_PATH on first use
+flood_zone_index = FloodZoneIndex()
@@ -0,0 +1,244 @@
+"""
+Array-backed store of live asset positions.
+Coordinates, status, type and flood-zone codes and fix times of every asset
+live in parallel NumPy arrays, so distance, filter and bulk-update operations are
+vectorized instead of looping over Asset models.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models import AssetStatus, AssetType
+from .flood_zones import FloodZoneIndex, flood_zone_index
+from .spatial import EARTH_RADIUS_KM
+
+STATUSES = list(AssetStatus)
+TYPES = list(AssetType)
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+TYPE_CODES = {asset_type: code for code, asset_type in enumerate(TYPES)}
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_datetime64(values: Sequence[datetime]) -> np.ndarray:
+    """Naive UTC datetimes to datetime64[us], several times faster than np.asarray."""
+    return np.fromiter(
+        ((v - _EPOCH) // _MICROSECOND for v in values), dtype=np.int64, count=len(values)
+    ).view("datetime64[us]")
+
+
+def haversine_km_array(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distances in kilometres from one point to many."""
+    phi1 = np.radians(lat)
+    phi2 = np.radians(lats)
+    dphi = phi2 - phi1
+    dlmb = np.radians(lons - lon)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+class PositionStore:
+    """
+    Live asset positions in parallel arrays with an id-to-row index.
+
+    Row i of `lat`, `lon`, `status`, `type`, `zone` and `updated` describes
+    asset `ids[i]`; only the first `len(self)` rows are in use. Removing an
+    asset moves the last row into its slot. `zone` is the flood-zone code of
+    the position, reclassified whenever the position changes. `updated` is the time of the position:
+    a position older than the stored one is ignored, so fixes applied late or
+    out of order never move an asset backwards.
+    Not thread-safe: the owning OperationalStateStore serializes access.
+    """
+
+    def __init__(self, capacity: int = 256, zones: FloodZoneIndex = None):
+        self.zones = zones or flood_zone_index
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.lat = np.zeros(capacity, dtype=np.float64)
+        self.lon = np.zeros(capacity, dtype=np.float64)
+        self.status = np.zeros(capacity, dtype=np.int8)
+        self.type = np.zeros(capacity, dtype=np.int8)
+        self.zone = np.zeros(capacity, dtype=np.int16)
+        self.updated = np.zeros(capacity, dtype="datetime64[us]")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, asset_id: str) -> bool:
+        return asset_id in self.rows
+
+    def _grow(self, needed: int):
+        capacity = len(self.lat)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for name in ("lat", "lon", "status", "type", "zone", "updated"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(self)] = old[:len(self)]
+            setattr(self, name, new)
+
+    def clear(self):
+        self.ids.clear()
+        self.rows.clear()
+
+    # --- Writes ---
+    def upsert(self, asset_id: str, latitude: float, longitude: float,
+               asset_type: AssetType, status: AssetStatus, updated: datetime, zone: int = None):
+        """
+        Insert an asset or set its codes, and its position unless `updated` is
+        older than the stored one. Pass the position's flood-zone code if known
+        to skip classifying it.
+        """
+        row = self.rows.get(asset_id)
+        stamp = np.datetime64(updated, "us")
+        if row is None:
+            row = len(self.ids)
+            self._grow(row + 1)
+            self.ids.append(asset_id)
+            self.rows[asset_id] = row
+        elif stamp < self.updated[row]:
+            self.set_codes(asset_id, asset_type, status)
+            return
+        self.lat[row] = latitude
+        self.lon[row] = longitude
+        self.zone[row] = self.zones.classify([latitude], [longitude])[0] if zone is None else zone
+        self.updated[row] = stamp
+        self.type[row] = TYPE_CODES[asset_type]
+        self.status[row] = STATUS_CODES[status]
+
+    def set_codes(self, asset_id: str, asset_type: AssetType, status: AssetStatus):
+        """Update an asset's type and status without touching its position."""
+        row = self.rows[asset_id]
+        self.type[row] = TYPE_CODES[asset_type]
+        self.status[row] = STATUS_CODES[status]
+
+    def remove(self, asset_id: str):
+        row = self.rows.pop(asset_id, None)
+        if row is None:
+            return
+        last = len(self.ids) - 1
+        moved = self.ids.pop()
+        if row != last:
+            self.ids[row] = moved
+            self.rows[moved] = row
+            for column in (self.lat, self.lon, self.status, self.type, self.zone, self.updated):
+                column[row] = column[last]
+
+    def _lookup(self, asset_ids: Sequence[str], updated: Sequence[datetime]):
+        """Rows (-1 if unknown), stamps and a mask of positions no older than the stored ones."""
+        rows = np.fromiter((self.rows.get(a, -1) for a in asset_ids), dtype=np.intp, count=len(asset_ids))
+        stamps = to_datetime64(updated)
+        current = rows >= 0
+        current[current] = stamps[current] >= self.updated[rows[current]]
+        return rows, stamps, current
+
+    def is_current(self, asset_ids: Sequence[str], updated: Sequence[datetime]) -> np.ndarray:
+        """Which of these positions belong to known assets and are no older than the stored ones."""
+        return self._lookup(asset_ids, updated)[2]
+
+    def bulk_update(self, asset_ids: Sequence[str], latitudes: Sequence[float],
+                    longitudes: Sequence[float], updated: Sequence[datetime]
+                    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Move many assets at once; ids must be unique within the call.
+        Returns (known, applied, rezoned) boolean arrays aligned with `asset_ids`:
+        unknown ids are skipped, as are positions older than the stored ones,
+        and rezoned marks the applied ones that moved into another flood zone.
+        """
+        rows, stamps, applied = self._lookup(asset_ids, updated)
+        known = rows >= 0
+        target = rows[applied]
+        self.lat[target] = np.asarray(latitudes, dtype=np.float64)[applied]
+        self.lon[target] = np.asarray(longitudes, dtype=np.float64)[applied]
+        zones = self.zones.classify(self.lat[target], self.lon[target])
+        rezoned = np.zeros_like(applied)
+        rezoned[applied] = zones != self.zone[target]
+        self.zone[target] = zones
+        self.updated[target] = stamps[applied]
+        return known, applied, rezoned
+
+    # --- Reads ---
+    def position(self, asset_id: str) -> Optional[Tuple[float, float]]:
+        row = self.rows.get(asset_id)
+        if row is None:
+            return None
+        return float(self.lat[row]), float(self.lon[row])
+
+    def mask(self, types: Iterable[AssetType] = None, statuses: Iterable[AssetStatus] = None,
+             bbox: Tuple[float, float, float, float] = None, since: datetime = None,
+             zones: Iterable[str] = None) -> np.ndarray:
+        """Boolean mask over the rows in use matching every given filter; unknown zone names match nothing."""
+        n = len(self)
+        selected = np.ones(n, dtype=bool)
+        if types is not None:
+            selected &= self._in_codes(self.type[:n], [TYPE_CODES[t] for t in types])
+        if statuses is not None:
+            selected &= self._in_codes(self.status[:n], [STATUS_CODES[s] for s in statuses])
+        if bbox is not None:
+            min_lat, min_lon, max_lat, max_lon = bbox
+            lat, lon = self.lat[:n], self.lon[:n]
+            selected &= (lat >= min_lat) & (lat <= max_lat) & (lon >= min_lon) & (lon <= max_lon)
+        if since is not None:
+            selected &= self.updated[:n] > np.datetime64(since, "us")
+        if zones is not None:
+            known = self.zones.zones
+            selected &= np.isin(self.zone[:n], [known.index(z) for z in zones if z in known])
+        return selected
+
+    @staticmethod
+    def _in_codes(column: np.ndarray, codes: List[int]) -> np.ndarray:
+        if len(codes) == 1:
+            return column == codes[0]
+        return np.isin(column, codes)
+
+    def select(self, **filters) -> List[str]:
+        """Ids of the assets matching `mask(**filters)`."""
+        return [self.ids[row] for row in np.flatnonzero(self.mask(**filters))]
+
+    def distances_km(self, latitude: float, longitude: float, rows: np.ndarray = None) -> np.ndarray:
+        """Distance from a point to every asset (or to the given rows)."""
+        if rows is None:
+            rows = slice(0, len(self))
+        return haversine_km_array(latitude, longitude, self.lat[rows], self.lon[rows])
+
+    def nearest(self, latitude: float, longitude: float, k: int = 5,
+                types: Iterable[AssetType] = None, statuses: Iterable[AssetStatus] = None,
+                max_distance_km: float = None) -> List[Tuple[str, float]]:
+        """The k nearest assets matching the filters, as (id, distance_km) nearest first."""
+        if k <= 0 or not self.ids:
+            return []
+        rows = np.flatnonzero(self.mask(types=types, statuses=statuses))
+        dist = self.distances_km(latitude, longitude, rows)
+        if max_distance_km is not None:
+            within = dist <= max_distance_km
+            rows, dist = rows[within], dist[within]
+        if len(rows) > k:
+            top = np.argpartition(dist, k - 1)[:k]
+            rows, dist = rows[top], dist[top]
+        order = np.lexsort((rows, dist))
+        return [(self.ids[rows[i]], float(dist[i])) for i in order]
+
+    def records(self, selected: np.ndarray = None) -> List[dict]:
+        """Plain dicts for the selected rows (all rows by default), ready for JSON."""
+        rows = np.arange(len(self)) if selected is None else np.flatnonzero(selected)
+        lats = self.lat[rows].tolist()
+        lons = self.lon[rows].tolist()
+        statuses = self.status[rows].tolist()
+        types = self.type[rows].tolist()
+        zones = self.zones.names(self.zone[rows].tolist())
+        updated = np.datetime_as_string(self.updated[rows], unit="us").tolist()
+        return [
+            {
+                "asset_id": self.ids[row],
+                "latitude": lats[i],
+                "longitude": lons[i],
+                "status": STATUSES[statuses[i]].value,
+                "type": TYPES[types[i]].value,
+                "flood_zone": zones[i],
+                "recorded_at": updated[i],
+            }
+            for i, row in enumerate(rows.tolist())
+        ]
@@ -0,0 +1,233 @@
+"""
+Live response-time percentiles.
+Time to first assignment, to on-scene and to resolution, kept as streaming
+quantile sketches per incident type, asset type and flood zone.
+"""
+import asyncio
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, tuple_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ..config import settings
+from ..database import AsyncSessionLocal, SessionLocal
+from ..db_models import ResponseSketchDB
+from ..models import Incident
+from .sketches import DDSketch
+
+FIRST_ASSIGNMENT = "time_to_first_assignment"
+ON_SCENE = "time_to_on_scene"
+RESOLUTION = "time_to_resolution"
+METRICS = (FIRST_ASSIGNMENT, ON_SCENE, RESOLUTION)
+
+DIMENSIONS = ("incident_type", "asset_type", "zone")
+QUANTILES = (0.5, 0.95, 0.99)
+# Slice value of incidents outside every flood zone
+NO_ZONE = "none"
+
+SketchKey = Tuple[str, str, str]
+
+
+def _value(member) -> str:
+    return getattr(member, "value", member)
+
+
+class ResponseTimeService:
+    """
+    Response-time distributions fed by executor action events.
+
+    Every observation is the number of minutes from an incident's report to
+    the event (first asset assigned, an asset on scene, resolution). It is
+    added to one DDSketch per slice it belongs to: its incident type, its
+    flood zone and the type of each asset involved. Percentiles are read
+    from the sketches in microseconds, whatever the history. The overall
+    distribution is the merge of the incident-type sketches, since every
+    observation has exactly one incident type.
+
+    Sketches are loaded from `response_sketches` at startup. Observations
+    since the last flush are also kept as per-slice delta sketches, which
+    are merged into the stored ones every RESPONSE_SKETCH_FLUSH_INTERVAL_SECONDS
+    and on shutdown (read, merge and write in one transaction, which then
+    re-reads all stored sketches). Several workers therefore add up instead
+    of overwriting each other, each sees the others' observations at most
+    one interval late, and a restart keeps the distributions (minus at most
+    one interval after a crash).
+    """
+
+    def __init__(self, relative_accuracy: float = None):
+        self.relative_accuracy = relative_accuracy or settings.RESPONSE_SKETCH_ACCURACY
+        self._lock = threading.RLock()
+        # Stored distributions plus everything observed here since
+        self._sketches: Dict[SketchKey, DDSketch] = {}
+        # Observations not yet merged into the database
+        self._deltas: Dict[SketchKey, DDSketch] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    # --- Load ---
+    def load(self) -> int:
+        """Read the stored sketches (at startup, before serving). Returns how many were loaded."""
+        db = SessionLocal()
+        try:
+            rows = db.execute(select(ResponseSketchDB)).scalars().all()
+        finally:
+            db.close()
+        with self._lock:
+            self._replace(rows)
+            return len(rows)
+
+    def reset(self):
+        """Drop the in-memory sketches and unflushed observations; call load() to re-read."""
+        with self._lock:
+            self._sketches.clear()
+            self._deltas.clear()
+
+    def _replace(self, rows: Iterable):
+        # Caller holds the lock. Observations not yet flushed stay on top.
+        stored = {(row.metric, row.dimension, row.value): self._decode(row.sketch) for row in rows}
+        self._sketches = {key: sketch for key, sketch in stored.items() if sketch is not None}
+        for key, delta in self._deltas.items():
+            sketch = self._sketches.get(key)
+            self._sketches[key] = sketch.merge(delta) if sketch is not None else DDSketch.from_dict(delta.to_dict())
+
+    def _decode(self, data: dict) -> Optional[DDSketch]:
+        sketch = DDSketch.from_dict(data)
+        # Saved at another accuracy: that distribution restarts
+        return sketch if sketch.relative_accuracy == self.relative_accuracy else None
+
+    # --- Observe ---
+    def observe(self, metric: str, incident: Incident, asset_types: Iterable = (), at: datetime = None):
+        """Record the minutes from `incident`'s report to `at` (default now) in every slice it belongs to."""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown response-time metric: {metric}")
+        minutes = ((at or datetime.utcnow()) - incident.reported_at).total_seconds() / 60
+        slices = [("incident_type", _value(incident.type)), ("zone", incident.flood_zone or NO_ZONE)]
+        slices += [("asset_type", value) for value in sorted({_value(t) for t in asset_types})]
+        with self._lock:
+            for dimension, value in slices:
+                key = (metric, dimension, value)
+                for sketches in (self._sketches, self._deltas):
+                    sketch = sketches.get(key)
+                    if sketch is None:
+                        sketch = sketches[key] = DDSketch(self.relative_accuracy)
+                    sketch.add(minutes)
+
+    # --- Read ---
+    def get_percentiles(self, by: str = None) -> dict:
+        """
+        Count, mean, p50, p95 and p99 minutes of each metric overall and, with
+        `by` ('incident_type', 'asset_type' or 'zone'), for every value of that slice.
+        """
+        if by is not None and by not in DIMENSIONS:
+            raise ValueError(f"Cannot slice response times by {by!r}; use one of {', '.join(DIMENSIONS)}")
+        result = {}
+        with self._lock:
+            for metric in METRICS:
+                overall = DDSketch(self.relative_accuracy)
+                for sketch in self._slices(metric, "incident_type").values():
+                    overall.merge(sketch)
+                entry = {"overall": self._summary(overall)}
+                if by is not None:
+                    entry[f"by_{by}"] = {
+                        value: self._summary(sketch)
+                        for value, sketch in sorted(self._slices(metric, by).items())
+                    }
+                result[metric] = entry
+        return {"relative_accuracy": self.relative_accuracy, "metrics": result}
+
+    def _slices(self, metric: str, dimension: str) -> Dict[str, DDSketch]:
+        return {v: s for (m, d, v), s in self._sketches.items() if m == metric and d == dimension}
+
+    @staticmethod
+    def _summary(sketch: DDSketch) -> dict:
+        summary = {"count": sketch.count, "mean_mins": round(sketch.mean, 1) if sketch.count else None}
+        for q, value in sketch.quantiles(QUANTILES).items():
+            summary[f"p{round(q * 100)}_mins"] = round(value, 1) if value is not None else None
+        return summary
+
+    # --- Persistence ---
+    async def flush(self) -> int:
+        """
+        Merge the observations since the last flush into the stored sketches
+        and, in the same transaction, re-read every stored sketch to replace
+        the in-memory ones, so they include what other workers flushed, in
+        every slice. Returns the sketches written.
+        """
+        with self._lock:
+            deltas, self._deltas = self._deltas, {}
+        if not deltas:
+            return 0
+        now = datetime.utcnow()
+        key_columns = tuple_(ResponseSketchDB.metric, ResponseSketchDB.dimension, ResponseSketchDB.value)
+        try:
+            async with AsyncSessionLocal() as db:
+                # Stamping the rows first takes SQLite's write lock, so no other
+                # worker can merge into them between this read and the write
+                await db.execute(
+                    update(ResponseSketchDB).where(key_columns.in_(list(deltas))).values(updated_at=now),
+                    execution_options={"synchronize_session": False}
+                )
+                stored = {
+                    (row.metric, row.dimension, row.value): self._decode(row.sketch)
+                    for row in (await db.execute(
+                        select(ResponseSketchDB).where(key_columns.in_(list(deltas)))
+                    )).scalars()
+                }
+                merged: Dict[SketchKey, DDSketch] = {}
+                for key, delta in deltas.items():
+                    sketch = stored.get(key)
+                    merged[key] = sketch.merge(delta) if sketch is not None else delta
+                rows: List[dict] = [
+                    {"metric": m, "dimension": d, "value": v, "sketch": sketch.to_dict(), "updated_at": now}
+                    for (m, d, v), sketch in merged.items()
+                ]
+                stmt = sqlite_insert(ResponseSketchDB)
+                await db.execute(stmt.on_conflict_do_update(
+                    index_elements=["metric", "dimension", "value"],
+                    set_={"sketch": stmt.excluded.sketch, "updated_at": stmt.excluded.updated_at}
+                ), rows)
+                # Plain columns: the ORM rows read above still hold the pre-merge sketches
+                everything = (await db.execute(select(
+                    ResponseSketchDB.metric, ResponseSketchDB.dimension, ResponseSketchDB.value, ResponseSketchDB.sketch
+                ))).all()
+                await db.commit()
+        except Exception:
+            with self._lock:
+                # Keep them for the next flush, with anything observed meanwhile
+                for key, delta in deltas.items():
+                    pending = self._deltas.get(key)
+                    self._deltas[key] = delta.merge(pending) if pending is not None else delta
+            raise
+        with self._lock:
+            self._replace(everything)
+        return len(rows)
+
+    async def _run(self, interval_seconds: float):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Response-time flush failed: {e}")
+
+    def start(self, interval_seconds: float = None):
+        """Start the background flush task on the running event loop."""
+        if self._task is None or self._task.done():
+            interval = interval_seconds or settings.RESPONSE_SKETCH_FLUSH_INTERVAL_SECONDS
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        """Stop the flush task and write whatever changed since the last flush."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+# Global instance
+response_time_service = ResponseTimeService()
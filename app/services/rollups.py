@@ -0,0 +1,135 @@
+"""
+Hourly incident rollups for trend analytics.
+Counts of incidents reported and resolved per hour, type and priority,
+kept current by the incident write paths so trends never scan raw incidents.
+"""
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..database import engine
+from ..db_models import IncidentRollupDB
+
+# Same text as SQLAlchemy's DATETIME storage format, so rebuilt hours match ORM-written ones
+_HOUR = "strftime('%Y-%m-%d %H:00:00.000000', {})"
+_MINUTES = "(julianday(resolved_at) - julianday(reported_at)) * 1440"
+
+_REBUILD = [
+    "DELETE FROM incident_rollups",
+    f"""
+    INSERT INTO incident_rollups (hour, type, priority, reported, resolved, resolution_minutes)
+    SELECT hour, type, priority, SUM(reported), SUM(resolved), SUM(minutes) FROM (
+        SELECT {_HOUR.format("reported_at")} AS hour, type, priority, 1 AS reported, 0 AS resolved, 0.0 AS minutes
+        FROM incidents WHERE reported_at IS NOT NULL
+        UNION ALL
+        SELECT {_HOUR.format("reported_at")}, type, priority, 1, 0, 0.0
+        FROM incidents_archive WHERE reported_at IS NOT NULL
+        UNION ALL
+        SELECT {_HOUR.format("resolved_at")}, type, priority, 0, 1, COALESCE({_MINUTES}, 0.0)
+        FROM incidents WHERE status = 'resolved' AND resolved_at IS NOT NULL
+        UNION ALL
+        SELECT {_HOUR.format("resolved_at")}, type, priority, 0, 1, COALESCE({_MINUTES}, 0.0)
+        FROM incidents_archive WHERE resolved_at IS NOT NULL
+    ) GROUP BY hour, type, priority
+    """,
+]
+
+
+def hour_of(timestamp: datetime) -> datetime:
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def record_report(db: Session, incident_type: str, priority: str, reported_at: datetime, sign: int = 1):
+    """
+    Count a new incident in the rollup of the hour it was reported, in the
+    caller's transaction. sign=-1 takes it back (the incident was deleted or moved).
+    """
+    _bump(db, reported_at, incident_type, priority, reported=sign)
+    if sign < 0:
+        _prune(db, reported_at, incident_type, priority)
+
+
+def record_resolution(db: Session, incident_type: str, priority: str, reported_at: Optional[datetime],
+                      resolved_at: datetime, sign: int = 1):
+    """
+    Count a resolution, and its time to resolution, in the rollup of the hour
+    it was resolved. sign=-1 takes it back when the incident is reopened.
+    """
+    minutes = (resolved_at - reported_at).total_seconds() / 60 if reported_at is not None else 0.0
+    _bump(db, resolved_at, incident_type, priority, resolved=sign, resolution_minutes=sign * minutes)
+    if sign < 0:
+        _prune(db, resolved_at, incident_type, priority)
+
+
+# An incident's share of the rollups: (type, priority, reported_at, resolved_at or None)
+Contribution = Tuple[str, str, Optional[datetime], Optional[datetime]]
+
+
+def incident_contribution(db_obj) -> Contribution:
+    """What an incident row adds to the rollups, attributed to its current type and priority."""
+    resolved_at = db_obj.resolved_at if db_obj.status == "resolved" else None
+    return (_value(db_obj.type), _value(db_obj.priority), db_obj.reported_at, resolved_at)
+
+
+def record_incident(db: Session, contribution: Contribution, sign: int = 1):
+    """Add (or with sign=-1 take back) an incident's report and, if resolved, its resolution."""
+    incident_type, priority, reported_at, resolved_at = contribution
+    if reported_at is not None:
+        record_report(db, incident_type, priority, reported_at, sign)
+    if resolved_at is not None:
+        record_resolution(db, incident_type, priority, reported_at, resolved_at, sign)
+
+
+def move_incident(db: Session, before: Contribution, after: Contribution):
+    """
+    Re-attribute an incident whose type, priority, times or resolution
+    changed, so the rollups always match rebuild_incident_rollups.
+    """
+    if before != after:
+        record_incident(db, before, sign=-1)
+        record_incident(db, after)
+
+
+def _value(member) -> str:
+    return getattr(member, "value", member)
+
+
+def _bump(db: Session, at: datetime, incident_type: str, priority: str, **counts):
+    table = IncidentRollupDB.__table__
+    stmt = sqlite_insert(table).values(
+        hour=hour_of(at), type=_value(incident_type), priority=_value(priority), **counts
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["hour", "type", "priority"],
+        set_={name: table.c[name] + stmt.excluded[name] for name in counts}
+    ))
+
+
+def _prune(db: Session, at: datetime, incident_type: str, priority: str):
+    """Drop a rollup row whose counts went back to zero, as a rebuild would never create it."""
+    db.execute(delete(IncidentRollupDB).where(
+        IncidentRollupDB.hour == hour_of(at), IncidentRollupDB.type == _value(incident_type),
+        IncidentRollupDB.priority == _value(priority),
+        IncidentRollupDB.reported == 0, IncidentRollupDB.resolved == 0
+    ))
+
+
+def rebuild_incident_rollups(cursor):
+    """
+    Recompute every rollup from the hot and archived incident rows (DBAPI
+    cursor). Both events are attributed to the incident's current type and
+    priority, as the incremental updates do.
+    """
+    for sql in _REBUILD:
+        cursor.execute(sql)
+
+
+def backfill_incident_rollups(bind=None):
+    """Build the rollups from existing incidents if the table is still empty. Idempotent."""
+    with (bind or engine).begin() as conn:
+        if conn.exec_driver_sql("SELECT 1 FROM incident_rollups LIMIT 1").first() is None:
+            for sql in _REBUILD:
+                conn.exec_driver_sql(sql)
@@ -0,0 +1,139 @@
+"""
+Full-text search over incident descriptions and notes (SQLite FTS5).
+
+Two FTS5 tables are kept in sync by triggers, so every write path (ORM,
+bulk inserts, archiving) updates them inside the same transaction:
+
+- incidents_fts: one row per incident description, keyed by incidents.search_rowid
+- incident_notes_fts: external-content index over incident_notes, keyed by note id
+
+Both keys are stable integers, so updates and deletes hit the index by rowid.
+"""
+import re
+from typing import Dict, List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+_INCIDENTS_FTS = "CREATE VIRTUAL TABLE incidents_fts USING fts5(description, tokenize='porter unicode61')"
+
+_TRIGGERS = (
+    # Give each incident a stable integer key for its FTS row
+    """CREATE TRIGGER IF NOT EXISTS incidents_fts_ai AFTER INSERT ON incidents BEGIN
+        UPDATE incidents SET search_rowid = (SELECT COALESCE(MAX(search_rowid), 0) + 1 FROM incidents)
+        WHERE id = new.id AND new.search_rowid IS NULL;
+        INSERT INTO incidents_fts(rowid, description)
+        SELECT search_rowid, new.description FROM incidents WHERE id = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS incidents_fts_au AFTER UPDATE OF description ON incidents BEGIN
+        UPDATE incidents_fts SET description = new.description WHERE rowid = new.search_rowid;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS incidents_fts_ad AFTER DELETE ON incidents BEGIN
+        DELETE FROM incidents_fts WHERE rowid = old.search_rowid;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS incident_notes_fts_ai AFTER INSERT ON incident_notes BEGIN
+        INSERT INTO incident_notes_fts(rowid, body) VALUES (new.id, new.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS incident_notes_fts_ad AFTER DELETE ON incident_notes BEGIN
+        INSERT INTO incident_notes_fts(incident_notes_fts, rowid, body) VALUES ('delete', old.id, old.body);
+    END""",
+)
+
+
+_TRIGGER_NAMES = tuple(re.search(r"EXISTS (\w+)", sql).group(1) for sql in _TRIGGERS)
+
+
+def ensure_search_index(bind: Engine):
+    """Create the FTS5 tables and triggers, indexing existing rows on first run."""
+    existing = set(inspect(bind).get_table_names())
+    with bind.begin() as conn:
+        if "incidents_fts" not in existing:
+            conn.execute(text(_INCIDENTS_FTS))
+            conn.execute(text("UPDATE incidents SET search_rowid = rowid WHERE search_rowid IS NULL"))
+            conn.execute(text(
+                "INSERT INTO incidents_fts(rowid, description) SELECT search_rowid, description FROM incidents"
+            ))
+        if "incident_notes_fts" not in existing:
+            conn.execute(text(
+                "CREATE VIRTUAL TABLE incident_notes_fts USING fts5(body, content='incident_notes', "
+                "content_rowid='id', tokenize='porter unicode61')"
+            ))
+            conn.execute(text("INSERT INTO incident_notes_fts(incident_notes_fts) VALUES ('rebuild')"))
+        for trigger in _TRIGGERS:
+            conn.execute(text(trigger))
+
+
+def drop_search_triggers(cursor):
+    """Stop indexing row by row, e.g. before a bulk load (DBAPI cursor, inside a transaction)."""
+    for name in _TRIGGER_NAMES:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def rebuild_search_index(cursor):
+    """Re-index every incident and note in bulk and reinstate the triggers (DBAPI cursor)."""
+    cursor.execute(
+        "UPDATE incidents SET search_rowid = (SELECT COALESCE(MAX(search_rowid), 0) FROM incidents) + rowid "
+        "WHERE search_rowid IS NULL"
+    )
+    # Recreating the table is much cheaper than deleting every row from it
+    cursor.execute("DROP TABLE incidents_fts")
+    cursor.execute(_INCIDENTS_FTS)
+    cursor.execute("INSERT INTO incidents_fts(rowid, description) SELECT search_rowid, description FROM incidents")
+    cursor.execute("INSERT INTO incident_notes_fts(incident_notes_fts) VALUES ('rebuild')")
+    for trigger in _TRIGGERS:
+        cursor.execute(trigger)
+
+
+def to_match_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: every word must match, the last
+    one as a prefix. FTS operators in user input are treated as plain words.
+    Raises ValueError if the query has no searchable words.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        raise ValueError("Search query must contain at least one word")
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+_SEARCH_SQL = text("""
+    WITH hits AS (
+        SELECT i.id AS incident_id, 'description' AS source, NULL AS note_id,
+               f.rank AS rank, snippet(incidents_fts, 0, '[', ']', '…', 12) AS snippet
+        FROM incidents_fts f JOIN incidents i ON i.search_rowid = f.rowid
+        WHERE incidents_fts MATCH :q
+        UNION ALL
+        SELECT n.incident_id, 'note', n.id,
+               f.rank, snippet(incident_notes_fts, 0, '[', ']', '…', 12)
+        FROM incident_notes_fts f JOIN incident_notes n ON n.id = f.rowid
+        JOIN incidents i ON i.id = n.incident_id
+        WHERE incident_notes_fts MATCH :q
+    ),
+    best AS (
+        SELECT incident_id, MIN(rank) AS rank FROM hits
+        GROUP BY incident_id ORDER BY rank LIMIT :limit
+    )
+    SELECT h.incident_id, b.rank, h.source, h.note_id, h.snippet
+    FROM hits h JOIN best b ON b.incident_id = h.incident_id
+    ORDER BY b.rank, h.incident_id, h.rank
+""")
+
+
+def search_incidents(db: Session, query: str, limit: int = 20) -> List[Dict]:
+    """
+    Rank active incidents by how well their description and notes match.
+    Returns [{"incident_id", "score", "matches": [{"source", "note_id", "snippet"}]}],
+    best match first. Archived incidents are not searched.
+    """
+    results: Dict[str, Dict] = {}
+    rows = db.execute(_SEARCH_SQL, {"q": to_match_query(query), "limit": limit})
+    for incident_id, rank, source, note_id, snippet in rows:
+        result = results.get(incident_id)
+        if result is None:
+            # FTS5 rank is bm25, lower is better
+            result = results[incident_id] = {"incident_id": incident_id, "score": round(-rank, 4), "matches": []}
+        result["matches"].append({"source": source, "note_id": note_id, "snippet": snippet})
+    return list(results.values())
@@ -2,9 +2,14 @@
 Scenario simulation engine leveraging Cerebras for rapid multi-scenario evaluation.
 """
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from ..cerebras_client import cerebras_client
+from ..models import Asset, AssetStatus, Incident
 from .data_feeds import data_feed_service
+from .flood_zones import flood_zone_index
+
+# Available assets offered to the model per incident when none are specified
+CANDIDATES_PER_INCIDENT = 5
 
 
 class SimulatorService:
@@ -21,7 +26,8 @@ class SimulatorService:
         
         Args:
             incident_ids: Specific incident IDs to consider (None = all active)
-            asset_ids: Specific asset IDs to consider (None = all available)
+            asset_ids: Specific asset IDs to consider (None = the available
+                assets nearest to each incident)
             scenario_count: Number of scenarios to simulate
             
         Returns:
@@ -39,6 +45,8 @@ class SimulatorService:
         else:
             incidents = data_feed_service.get_all_incidents()
         
+        nearest = {i.id: self._nearest_available(i) for i in incidents}
+        
         # Get assets
         if asset_ids:
             assets = [
@@ -47,11 +55,17 @@ class SimulatorService:
                 if data_feed_service.get_asset(aid)
             ]
         else:
-            assets = data_feed_service.get_all_assets()
+            assets = list({a.id: a for hits in nearest.values() for a, _ in hits}.values())
         
-        # Convert to dicts for AI
-        incidents_data = [i.model_dump() for i in incidents]
-        assets_data = [a.model_dump() for a in assets]
+        # Convert to dicts for AI, with live positions and distances
+        incidents_data = []
+        for incident in incidents:
+            data = incident.model_dump()
+            data["nearest_available_assets"] = [
+                {"asset_id": asset.id, "distance_km": round(dist, 2)} for asset, dist in nearest[incident.id]
+            ]
+            incidents_data.append(data)
+        assets_data = [self._asset_data(a) for a in assets]
         
         # Run AI simulation
         result = self.client.simulate_scenarios(
@@ -67,6 +81,23 @@ class SimulatorService:
         
         return result
     
+    @staticmethod
+    def _nearest_available(incident: Incident) -> List[Tuple[Asset, float]]:
+        """The available assets closest to an incident, from the live position store."""
+        return data_feed_service.find_nearest_assets(
+            incident.location.latitude, incident.location.longitude,
+            CANDIDATES_PER_INCIDENT, status=AssetStatus.AVAILABLE
+        )
+
+    @staticmethod
+    def _asset_data(asset: Asset) -> Dict[str, Any]:
+        data = asset.model_dump()
+        position = data_feed_service.get_asset_position(asset.id)
+        if position is not None:
+            data["location"]["latitude"], data["location"]["longitude"] = position
+            data["flood_zone"] = flood_zone_index.zone_of(*position)
+        return data
+
     def get_rescue_route(self, asset_id: str, incident_id: str) -> Dict[str, Any]:
         """
         Calculate optimal rescue route for an asset to an incident.
@@ -85,15 +116,17 @@ class SimulatorService:
             return {"error": "Asset or incident not found"}
         
         # Use AI for route optimization
+        asset_data = self._asset_data(asset)
         messages = [{
             "role": "user",
             "content": f"""Calculate optimal rescue route:
 
-FROM: {asset.name} at {asset.location.model_dump()}
-TO: {incident.description} at {incident.location.model_dump()}
+FROM: {asset.name} at {asset_data["location"]} (flood zone: {asset_data["flood_zone"] or "unmapped"})
+TO: {incident.description} at {incident.location.model_dump()} (flood zone: {incident.flood_zone or "unmapped"})
 
 Consider:
-- Current flood conditions (6+ feet storm surge)
+- Current flood conditions (6+ feet storm surge); Zone AE and Zone A flood first and deepest
+- Crossing into or through a high-risk flood zone favours boat or air over ground
 - Road closures and debris
 - Weather: 120 mph winds, heavy rain
 
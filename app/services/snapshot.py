@@ -0,0 +1,314 @@
+"""
+Binary snapshots of the full operational state.
+
+A snapshot holds every row of the operational tables (incidents, notes,
+assignments, assets, tombstones, weather history, the incident archive, the
+action log and asset status history) in a compact columnar file, and
+restores them in bulk.
+User accounts are not included.
+
+File layout (integers little-endian):
+
+    magic    b"HOPSNAP1"
+    header   u32 length + JSON {created_at, schema_version, change_version, tables}
+    blocks   b"B", u16 table index, u32 row count, then for each column:
+             u8 codec, u32 length, zlib-compressed payload
+    trailer  b"E", u32 length + JSON {"rows": {table: count}}
+
+A block holds up to CHUNK_ROWS rows of one table. Each column's codec is
+chosen per block from its values: int64 or float64 arrays, UTF-8 text with
+per-value character lengths, or JSON for anything else. Apart from JSON,
+every payload starts with a one-byte-per-row null mask. Values round-trip
+exactly as SQLite stores them.
+"""
+import json
+import sqlite3
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime
+from itertools import accumulate, repeat
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+from ..database import engine
+from ..db_models import (
+    ActionEventDB, AssetDB, AssetStatusEventDB, AssignmentDB, IncidentArchiveDB, IncidentDB, IncidentNoteDB,
+    TombstoneDB, WeatherDB, WeatherRollupDB
+)
+from .asset_history import drop_status_triggers, rebuild_status_history
+from .rollups import rebuild_incident_rollups
+from .search import drop_search_triggers, rebuild_search_index
+
+MAGIC = b"HOPSNAP1"
+CHUNK_ROWS = 65536
+
+SNAPSHOT_TABLES = tuple(model.__table__ for model in (
+    IncidentDB, IncidentNoteDB, AssignmentDB, AssetDB, TombstoneDB,
+    WeatherDB, WeatherRollupDB, IncidentArchiveDB, ActionEventDB, AssetStatusEventDB
+))
+# Restored rows of these tables are re-stamped as changed (see restore_snapshot)
+REBASED_TABLES = ("incidents", "assets")
+
+CODEC_INT, CODEC_FLOAT, CODEC_TEXT, CODEC_JSON = range(4)
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+class SnapshotError(ValueError):
+    """The file is not a readable snapshot."""
+
+
+# --- Column codecs ---
+def _le_bytes(values: array) -> bytes:
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if _BIG_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def encode_column(values: list) -> Tuple[int, bytes]:
+    """Pick a codec for one block of a column and encode it (uncompressed)."""
+    kinds = {type(v) for v in values if v is not None}
+    mask = bytes(v is None for v in values)
+    if kinds <= {int}:
+        return CODEC_INT, mask + _le_bytes(array("q", (0 if v is None else v for v in values)))
+    if kinds == {float}:
+        return CODEC_FLOAT, mask + _le_bytes(array("d", (0.0 if v is None else v for v in values)))
+    if kinds == {str}:
+        texts = ["" if v is None else v for v in values]
+        lengths = _le_bytes(array("I", map(len, texts)))
+        return CODEC_TEXT, mask + lengths + "".join(texts).encode("utf-8")
+    return CODEC_JSON, json.dumps(values, separators=(",", ":")).encode("utf-8")
+
+
+def decode_column(codec: int, payload: bytes, n: int) -> list:
+    """Inverse of encode_column for a block of `n` rows."""
+    if codec == CODEC_JSON:
+        return json.loads(payload)
+    mask, body = payload[:n], payload[n:]
+    if codec == CODEC_INT:
+        values = _from_le("q", body).tolist()
+    elif codec == CODEC_FLOAT:
+        values = _from_le("d", body).tolist()
+    elif codec == CODEC_TEXT:
+        width = array("I").itemsize * n
+        text = body[width:].decode("utf-8")
+        offsets = list(accumulate(_from_le("I", body[:width]), initial=0))
+        values = [text[a:b] for a, b in zip(offsets, offsets[1:])]
+    else:
+        raise SnapshotError(f"Unknown column codec {codec}")
+    if len(values) != n:
+        raise SnapshotError("Column length does not match its block")
+    if b"\x01" in mask:
+        values = [None if null else v for v, null in zip(values, mask)]
+    return values
+
+
+def _encode_block(table_index: int, rows: List[tuple]) -> bytes:
+    parts = [b"B", struct.pack("<HI", table_index, len(rows))]
+    for column in zip(*rows):
+        codec, payload = encode_column(list(column))
+        compressed = zlib.compress(payload, 1)
+        parts.append(struct.pack("<BI", codec, len(compressed)))
+        parts.append(compressed)
+    return b"".join(parts)
+
+
+def _framed_json(tag: bytes, data: dict) -> bytes:
+    body = json.dumps(data).encode("utf-8")
+    return tag + struct.pack("<I", len(body)) + body
+
+
+# --- Export ---
+def iter_snapshot(bind=None, chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Yield a snapshot as a stream of byte chunks.
+    Every table is read inside one transaction, so the snapshot is consistent.
+    """
+    raw = (bind or engine).raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("BEGIN")
+        schema_version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        change_version = max(
+            cursor.execute(f"SELECT COALESCE(MAX(change_version), 0) FROM {name}").fetchone()[0]
+            for name in ("incidents", "assets", "tombstones")
+        )
+        tables = [{"name": t.name, "columns": [c.name for c in t.columns]} for t in SNAPSHOT_TABLES]
+        yield MAGIC + _framed_json(b"", {
+            "created_at": datetime.utcnow().isoformat(),
+            "schema_version": schema_version,
+            "change_version": change_version,
+            "tables": tables,
+        })
+        counts = {}
+        for index, table in enumerate(tables):
+            columns = ", ".join(f'"{c}"' for c in table["columns"])
+            cursor.execute(f'SELECT {columns} FROM {table["name"]}')
+            counts[table["name"]] = 0
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                counts[table["name"]] += len(rows)
+                yield _encode_block(index, rows)
+        yield _framed_json(b"E", {"rows": counts})
+    finally:
+        raw.rollback()
+        raw.close()
+
+
+def write_snapshot(fileobj: BinaryIO, bind=None) -> Dict[str, int]:
+    """Write a snapshot to a binary file object. Returns the row count per table."""
+    trailer = b""
+    for chunk in iter_snapshot(bind):
+        fileobj.write(chunk)
+        trailer = chunk
+    return json.loads(trailer[5:])["rows"]
+
+
+# --- Restore ---
+class _Reader:
+    def __init__(self, fileobj: BinaryIO):
+        self.fileobj = fileobj
+
+    def read(self, n: int) -> bytes:
+        data = self.fileobj.read(n)
+        if len(data) != n:
+            raise SnapshotError("Snapshot is truncated")
+        return data
+
+    def unpack(self, fmt: str) -> tuple:
+        return struct.unpack(fmt, self.read(struct.calcsize(fmt)))
+
+    def json(self) -> dict:
+        (length,) = self.unpack("<I")
+        return json.loads(self.read(length))
+
+
+def _drop_indexes(cursor, tables: List[str]) -> List[str]:
+    """Drop the explicit indexes of `tables`, returning the SQL to recreate them."""
+    placeholders = ", ".join("?" * len(tables))
+    indexes = cursor.execute(
+        f"SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+        f"AND tbl_name IN ({placeholders})", tables
+    ).fetchall()
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX "{name}"')
+    return [sql for _, sql in indexes]
+
+
+def restore_snapshot(fileobj: BinaryIO, bind=None) -> Dict[str, int]:
+    """
+    Replace the contents of every table in the snapshot, in one transaction.
+
+    Rows go in with executemany on the raw connection, block by block. The
+    secondary indexes and search triggers are dropped during the load; the
+    indexes are rebuilt once at the end, each in a single sorted pass, and so
+    is the FTS index. Restored incidents and assets get a change version above
+    anything issued before, and ids that existed before the restore but are
+    not in the snapshot get tombstones, so delta-sync clients converge on the
+    restored state. Their optimistic-lock versions are offset past every
+    pre-restore version for the same reason.
+    Returns the row count per table. Callers must reload any cached state.
+    """
+    reader = _Reader(fileobj)
+    if reader.read(len(MAGIC)) != MAGIC:
+        raise SnapshotError("Not a snapshot file")
+    header = reader.json()
+    known = {t.name: t for t in SNAPSHOT_TABLES}
+    tables = [(t["name"], t["columns"]) for t in header["tables"]]
+
+    raw = (bind or engine).raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        live_change = max(
+            cursor.execute(f"SELECT COALESCE(MAX(change_version), 0) FROM {name}").fetchone()[0]
+            for name in ("incidents", "assets", "tombstones")
+        )
+        version_offset = max(
+            cursor.execute(f"SELECT COALESCE(MAX(version), 0) FROM {name}").fetchone()[0]
+            for name in REBASED_TABLES
+        )
+        change_version = max(live_change, header.get("change_version", 0)) + 1
+        cursor.execute("CREATE TEMP TABLE snapshot_previous (entity TEXT, entity_id TEXT)")
+        cursor.execute(
+            "INSERT INTO snapshot_previous SELECT 'incident', id FROM incidents "
+            "UNION ALL SELECT 'asset', id FROM assets"
+        )
+
+        drop_search_triggers(cursor)
+        drop_status_triggers(cursor)
+        loaded = [name for name, _ in tables if name in known]
+        indexes = _drop_indexes(cursor, loaded)
+        for name in loaded:
+            cursor.execute(f"DELETE FROM {name}")
+
+        counts = {name: 0 for name, _ in tables if name in known}
+        while True:
+            (tag,) = reader.unpack("<c")
+            if tag == b"E":
+                expected = reader.json()["rows"]
+                break
+            if tag != b"B":
+                raise SnapshotError("Corrupt snapshot block")
+            table_index, n = reader.unpack("<HI")
+            name, names = tables[table_index]
+            columns = {}
+            for column_name in names:
+                codec, length = reader.unpack("<BI")
+                columns[column_name] = decode_column(codec, zlib.decompress(reader.read(length)), n)
+            if name not in counts:
+                continue
+            columns = {c: v for c, v in columns.items() if c in known[name].c}
+            if name in REBASED_TABLES:
+                versions = columns.get("version")
+                columns["change_version"] = repeat(change_version, n)
+                columns["version"] = (
+                    [(v or 1) + version_offset for v in versions] if versions else repeat(1 + version_offset, n)
+                )
+            quoted = ", ".join(f'"{c}"' for c in columns)
+            cursor.executemany(
+                f"INSERT INTO {name} ({quoted}) VALUES ({', '.join('?' * len(columns))})",
+                zip(*columns.values())
+            )
+            counts[name] += n
+        if any(counts[name] != expected.get(name, 0) for name in counts):
+            raise SnapshotError("Row counts do not match the snapshot trailer")
+
+        cursor.execute(
+            "INSERT OR REPLACE INTO tombstones (entity, entity_id, change_version, deleted_at) "
+            "SELECT p.entity, p.entity_id, ?, ? FROM snapshot_previous p "
+            "WHERE NOT EXISTS (SELECT 1 FROM incidents i WHERE p.entity = 'incident' AND i.id = p.entity_id) "
+            "AND NOT EXISTS (SELECT 1 FROM assets a WHERE p.entity = 'asset' AND a.id = p.entity_id)",
+            (change_version, datetime.utcnow().isoformat(sep=" "))
+        )
+        cursor.execute("DROP TABLE snapshot_previous")
+        for sql in indexes:
+            cursor.execute(sql)
+        rebuild_search_index(cursor)
+        rebuild_incident_rollups(cursor)
+        if "asset_status_events" not in counts:
+            # Older snapshot without status history: the current history belongs to other assets
+            cursor.execute("DELETE FROM asset_status_events")
+        rebuild_status_history(cursor)
+        raw.commit()
+        return counts
+    except (zlib.error, struct.error, sqlite3.IntegrityError, KeyError, IndexError, ValueError) as e:
+        raw.rollback()
+        if isinstance(e, SnapshotError):
+            raise
+        raise SnapshotError(f"Corrupt snapshot: {e}") from e
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
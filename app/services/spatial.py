@@ -0,0 +1,167 @@
+"""
+Spatial indexing for incidents and assets.
+A uniform lat/lon grid answering k-nearest-neighbour queries without scanning every point.
+"""
+import math
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.195
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class SpatialGridIndex:
+    """
+    Uniform grid over latitude/longitude, optionally partitioned into groups.
+
+    Points are bucketed into square cells of `cell_size_deg` degrees. Each
+    point may carry a group key (e.g. asset type) so that filtered queries
+    only visit the relevant partition. Nearest-neighbour search expands ring
+    by ring around the query cell and stops as soon as no unvisited cell can
+    hold a closer point than the current k-th result.
+    """
+
+    def __init__(self, cell_size_deg: float = 0.01):
+        self.cell_size = cell_size_deg
+        self._cells: Dict[Tuple[Hashable, int, int], Set[str]] = defaultdict(set)
+        self._points: Dict[str, Tuple[float, float, Hashable]] = {}
+        # Bounding box of occupied cells, used to terminate the ring search
+        self._min_ci = self._max_ci = self._min_cj = self._max_cj = 0
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, point_id: str) -> bool:
+        return point_id in self._points
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_size)), int(math.floor(lon / self.cell_size))
+
+    def upsert(self, point_id: str, lat: float, lon: float, group: Hashable = None):
+        """Insert or move a point."""
+        previous = self._points.get(point_id)
+        ci, cj = self._cell(lat, lon)
+        if previous is not None:
+            prev_ci, prev_cj = self._cell(previous[0], previous[1])
+            if (prev_ci, prev_cj, previous[2]) == (ci, cj, group):
+                self._points[point_id] = (lat, lon, group)
+                return
+            self._discard(point_id, previous)
+        if not self._points:
+            self._min_ci = self._max_ci = ci
+            self._min_cj = self._max_cj = cj
+        else:
+            self._min_ci = min(self._min_ci, ci)
+            self._max_ci = max(self._max_ci, ci)
+            self._min_cj = min(self._min_cj, cj)
+            self._max_cj = max(self._max_cj, cj)
+        self._points[point_id] = (lat, lon, group)
+        self._cells[(group, ci, cj)].add(point_id)
+
+    def remove(self, point_id: str):
+        """Remove a point if present."""
+        previous = self._points.pop(point_id, None)
+        if previous is not None:
+            self._discard(point_id, previous)
+
+    def _discard(self, point_id: str, point: Tuple[float, float, Hashable]):
+        ci, cj = self._cell(point[0], point[1])
+        key = (point[2], ci, cj)
+        bucket = self._cells.get(key)
+        if bucket is not None:
+            bucket.discard(point_id)
+            if not bucket:
+                del self._cells[key]
+
+    def clear(self):
+        self._cells.clear()
+        self._points.clear()
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 5,
+        groups: Optional[List[Hashable]] = None,
+        predicate: Optional[Callable[[str], bool]] = None,
+        max_distance_km: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the k nearest points to (lat, lon).
+
+        Args:
+            lat, lon: Query position
+            k: Number of results
+            groups: Only consider points in these groups (None = all groups)
+            predicate: Optional filter called with the point id
+            max_distance_km: Ignore points further away than this
+
+        Returns:
+            List of (point_id, distance_km) sorted by distance
+        """
+        if not self._points or k <= 0:
+            return []
+        if groups is None:
+            groups = list({g for g, _, _ in self._cells.keys()})
+
+        qi, qj = self._cell(lat, lon)
+        # Rings beyond this one cannot contain any occupied cell
+        max_ring = max(
+            abs(qi - self._min_ci), abs(qi - self._max_ci),
+            abs(qj - self._min_cj), abs(qj - self._max_cj)
+        )
+        results: List[Tuple[float, str]] = []
+        points = self._points
+        cells = self._cells
+
+        for ring in range(max_ring + 1):
+            for ci, cj in self._ring_cells(qi, qj, ring):
+                for group in groups:
+                    bucket = cells.get((group, ci, cj))
+                    if not bucket:
+                        continue
+                    for point_id in bucket:
+                        if predicate is not None and not predicate(point_id):
+                            continue
+                        p_lat, p_lon, _ = points[point_id]
+                        dist = haversine_km(lat, lon, p_lat, p_lon)
+                        if max_distance_km is not None and dist > max_distance_km:
+                            continue
+                        results.append((dist, point_id))
+
+            # Every unvisited cell is at least `ring` whole cells away on one axis
+            edge_lat = min(89.9, abs(lat) + (ring + 1) * self.cell_size)
+            bound_km = ring * self.cell_size * KM_PER_DEGREE * math.cos(math.radians(edge_lat))
+            if max_distance_km is not None and bound_km > max_distance_km:
+                break
+            if len(results) >= k:
+                results.sort()
+                del results[k:]
+                if results[-1][0] <= bound_km:
+                    break
+
+        results.sort()
+        return [(point_id, dist) for dist, point_id in results[:k]]
+
+    @staticmethod
+    def _ring_cells(ci: int, cj: int, ring: int):
+        """Yield the cells at Chebyshev distance `ring` from (ci, cj)."""
+        if ring == 0:
+            yield ci, cj
+            return
+        for dj in range(-ring, ring + 1):
+            yield ci - ring, cj + dj
+            yield ci + ring, cj + dj
+        for di in range(-ring + 1, ring):
+            yield ci + di, cj - ring
+            yield ci + di, cj + ring
@@ -0,0 +1,302 @@
+"""
+In-memory operational state for the Emergency Coordination System.
+Holds the live incidents, assets and latest weather so reads never touch SQLite.
+"""
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models import Incident, IncidentType, Asset, WeatherData, AssetType, AssetStatus
+from .flood_zones import flood_zone_index
+from .positions import STATUSES, PositionStore
+from .spatial import SpatialGridIndex
+from .counters import SummaryCounters
+
+
+class OperationalStateStore:
+    """
+    Versioned write-through cache of the current operational picture.
+
+    The store is loaded once from the database and then kept current by the
+    DataFeedService after every committed write. Every mutation bumps
+    `version`, so callers can cheaply tell whether anything has changed;
+    `versions` tracks incidents, assets and weather separately, and
+    `generation` changes on every full load (e.g. a process restart).
+    Models handed out by the store are shared and must be treated as read-only.
+    Alongside each model the store keeps its JSON-mode dict, dumped once per
+    write, so list endpoints can encode straight to JSON without touching Pydantic.
+
+    Incident coordinates are mirrored into a spatial grid index partitioned
+    by incident type, and asset
+    positions, status and type into a PositionStore of NumPy arrays, which
+    also takes live telemetry between database flushes. Nearest-neighbour
+    and map queries read from these, and every write is folded into the
+    summary counters. Writes are version-guarded,
+    so a stale model can never replace a newer one.
+
+    Every incident and asset is tagged with the flood zone of its location:
+    the whole state in one vectorized pass on load, then only the models
+    whose location changed on each write.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.incidents: Dict[str, Incident] = {}
+        self.assets: Dict[str, Asset] = {}
+        self.incident_rows: Dict[str, dict] = {}
+        self.asset_rows: Dict[str, dict] = {}
+        self.weather: Optional[WeatherData] = None
+        self.asset_positions = PositionStore()
+        self.incident_index = SpatialGridIndex()
+        self.counters = SummaryCounters()
+        self.version = 0
+        self.versions = {"incidents": 0, "assets": 0, "weather": 0}
+        self.generation = uuid.uuid4().hex[:12]
+        self.loaded = False
+
+    def load(self, incidents: List[Incident], assets: List[Asset], weather: Optional[WeatherData],
+             counters: Optional[SummaryCounters] = None):
+        """Replace the whole state with a fresh load from the database."""
+        with self._lock:
+            if counters is None:
+                counters = SummaryCounters()
+                for incident in incidents:
+                    counters.apply_incident(None, incident)
+                for asset in assets:
+                    counters.apply_asset(None, asset)
+            self.counters = counters
+            flood_zone_index.tag(incidents)
+            flood_zone_index.tag(assets)
+            self.incidents = {i.id: i for i in incidents}
+            self.assets = {a.id: a for a in assets}
+            self.incident_rows = {i.id: i.model_dump(mode="json") for i in incidents}
+            self.asset_rows = {a.id: a.model_dump(mode="json") for a in assets}
+            self.weather = weather
+            self.asset_positions.clear()
+            self.incident_index.clear()
+            for incident in incidents:
+                self._index_incident(incident)
+            for asset in assets:
+                self._index_asset(None, asset)
+            self.version += 1
+            self.generation = uuid.uuid4().hex[:12]
+            self.loaded = True
+
+    # --- Reads ---
+    def summary(self) -> dict:
+        """Dashboard totals plus headline weather, in O(1)."""
+        with self._lock:
+            stats = self.counters.snapshot()
+            weather = self.weather
+        stats["weather"] = {
+            "hurricane_category": weather.hurricane_category if weather else 0,
+            "wind_speed_mph": round(weather.wind_speed_mph) if weather else 0,
+            "storm_surge_feet": round(weather.storm_surge_feet, 1) if weather else 0
+        }
+        return stats
+
+    def list_incidents(self) -> List[Incident]:
+        with self._lock:
+            return list(self.incidents.values())
+
+    def list_incident_rows(self) -> List[dict]:
+        with self._lock:
+            return list(self.incident_rows.values())
+
+    def get_incident(self, incident_id: str) -> Optional[Incident]:
+        return self.incidents.get(incident_id)
+
+    def list_assets(self) -> List[Asset]:
+        with self._lock:
+            return list(self.assets.values())
+
+    def list_asset_rows(self) -> List[dict]:
+        with self._lock:
+            return list(self.asset_rows.values())
+
+    def get_asset(self, asset_id: str) -> Optional[Asset]:
+        return self.assets.get(asset_id)
+
+    def list_assets_where(self, **filters) -> List[Asset]:
+        """Assets matching PositionStore.mask filters (types, statuses, bbox, since)."""
+        with self._lock:
+            return [self.assets[asset_id] for asset_id in self.asset_positions.select(**filters)]
+
+    def position_records(self, **filters) -> List[dict]:
+        """Live position, status and type of the matching assets, as plain dicts."""
+        with self._lock:
+            return self.asset_positions.records(self.asset_positions.mask(**filters))
+
+    def asset_position(self, asset_id: str) -> Optional[Tuple[float, float]]:
+        with self._lock:
+            return self.asset_positions.position(asset_id)
+
+    def nearest_assets(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 5,
+        asset_type: Optional[AssetType] = None,
+        status: Optional[AssetStatus] = None,
+        max_distance_km: Optional[float] = None
+    ) -> List[Tuple[Asset, float]]:
+        """Return the k assets closest to a position, nearest first."""
+        with self._lock:
+            hits = self.asset_positions.nearest(
+                latitude, longitude, k,
+                types=[asset_type] if asset_type is not None else None,
+                statuses=[status] if status is not None else None,
+                max_distance_km=max_distance_km
+            )
+            return [(self.assets[asset_id], dist) for asset_id, dist in hits]
+
+    def flood_zone_summary(self) -> dict:
+        """Active incidents, people affected and assets by status in each flood zone."""
+        with self._lock:
+            zones = {zone: {"active_incidents": 0, "affected_count": 0, "assets": {}}
+                     for zone in flood_zone_index.zones}
+            for incident in self.incidents.values():
+                zone = zones.get(incident.flood_zone)
+                if zone is not None and incident.status != "resolved":
+                    zone["active_incidents"] += 1
+                    zone["affected_count"] += incident.affected_count
+            positions = self.asset_positions
+            n = len(positions)
+            # One bincount over (zone, status) pairs instead of a loop over assets
+            pairs = np.bincount(
+                (positions.zone[:n].astype(np.intp) + 1) * len(STATUSES) + positions.status[:n],
+                minlength=(len(flood_zone_index.zones) + 1) * len(STATUSES)
+            ).reshape(-1, len(STATUSES))
+        for code, zone in enumerate(flood_zone_index.zones):
+            zones[zone]["assets"] = {
+                status.value: int(count) for status, count in zip(STATUSES, pairs[code + 1]) if count
+            }
+        return zones
+
+    @staticmethod
+    def _tag_flood_zone(previous, model):
+        """Carry the zone over when the location is unchanged, otherwise look it up."""
+        if previous is not None and previous.location == model.location:
+            model.flood_zone = previous.flood_zone
+        else:
+            model.flood_zone = flood_zone_index.zone_of(model.location.latitude, model.location.longitude)
+
+    def match_incident(
+        self,
+        incident_type: IncidentType,
+        latitude: float,
+        longitude: float,
+        reported_at: datetime,
+        radius_km: float,
+        window: timedelta
+    ) -> Optional[Incident]:
+        """
+        The nearest unresolved incident of this type within `radius_km` whose
+        reports, widened by `window` on both sides, cover `reported_at`.
+        Only the grid cells of that type around the point are visited.
+        """
+        def in_window(incident_id: str) -> bool:
+            incident = self.incidents[incident_id]
+            last = incident.last_reported_at or incident.reported_at
+            return (incident.status != "resolved"
+                    and incident.reported_at - window <= reported_at <= last + window)
+
+        with self._lock:
+            hits = self.incident_index.nearest(
+                latitude, longitude, 1, groups=[incident_type],
+                predicate=in_window, max_distance_km=radius_km
+            )
+            return self.incidents[hits[0][0]] if hits else None
+
+    def _index_incident(self, incident: Incident):
+        self.incident_index.upsert(
+            incident.id, incident.location.latitude, incident.location.longitude, incident.type
+        )
+
+    def _index_asset(self, previous: Optional[Asset], asset: Asset):
+        # Writes that leave the location alone must not overwrite a newer live fix
+        if previous is None or previous.location != asset.location:
+            self.asset_positions.upsert(
+                asset.id, asset.location.latitude, asset.location.longitude,
+                asset.type, asset.status, asset.last_updated, flood_zone_index.code(asset.flood_zone)
+            )
+        else:
+            self.asset_positions.set_codes(asset.id, asset.type, asset.status)
+
+    # --- Writes (called after the database commit succeeded) ---
+    # Puts carry the row's optimistic-lock version; one older than the stored
+    # model is a late apply of a superseded commit and is ignored.
+    def put_incident(self, incident: Incident):
+        with self._lock:
+            previous = self.incidents.get(incident.id)
+            if previous is not None and incident.version < previous.version:
+                return
+            self._tag_flood_zone(previous, incident)
+            self.counters.apply_incident(previous, incident)
+            self.incidents[incident.id] = incident
+            self.incident_rows[incident.id] = incident.model_dump(mode="json")
+            self._index_incident(incident)
+            self._bump("incidents")
+
+    def append_incident_note(self, incident_id: str, body: str):
+        with self._lock:
+            incident = self.incidents.get(incident_id)
+            if incident is not None:
+                self.put_incident(incident.model_copy(update={"notes": incident.notes + [body]}))
+
+    def remove_incident(self, incident_id: str):
+        with self._lock:
+            previous = self.incidents.pop(incident_id, None)
+            if previous is not None:
+                del self.incident_rows[incident_id]
+                self.counters.apply_incident(previous, None)
+                self.incident_index.remove(incident_id)
+                self._bump("incidents")
+
+    def put_asset(self, asset: Asset):
+        with self._lock:
+            previous = self.assets.get(asset.id)
+            if previous is not None and asset.version < previous.version:
+                return
+            self._tag_flood_zone(previous, asset)
+            self.counters.apply_asset(previous, asset)
+            self.assets[asset.id] = asset
+            self.asset_rows[asset.id] = asset.model_dump(mode="json")
+            self._index_asset(previous, asset)
+            self._bump("assets")
+
+    def move_assets(self, asset_ids: Sequence[str], latitudes: Sequence[float],
+                    longitudes: Sequence[float], recorded_at: Sequence[datetime]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply live position fixes to the position store only; the asset models
+        catch up when the fixes are written to the database. A fix that moves
+        an asset into another flood zone changes the zone summary at once, so
+        it bumps the assets scope. Returns PositionStore.bulk_update's (known, applied) masks.
+        """
+        with self._lock:
+            known, applied, rezoned = self.asset_positions.bulk_update(asset_ids, latitudes, longitudes, recorded_at)
+            if rezoned.any():
+                self._bump("assets")
+            return known, applied
+
+    def current_positions(self, asset_ids: Sequence[str], recorded_at: Sequence[datetime]) -> np.ndarray:
+        """Mask of the fixes that are still the latest position held for their asset."""
+        with self._lock:
+            return self.asset_positions.is_current(asset_ids, recorded_at)
+
+    def set_weather(self, weather: Optional[WeatherData]):
+        with self._lock:
+            self.weather = weather
+            self._bump("weather")
+
+    def _bump(self, scope: str):
+        self.version += 1
+        self.versions[scope] += 1
+
+    def etag_parts(self, *scopes: str) -> tuple:
+        """Generation plus the versions of the given scopes, for building ETags."""
+        with self._lock:
+            return (self.generation, *(self.versions[s] for s in scopes))
@@ -0,0 +1,147 @@
+"""
+Asset telemetry ingest.
+Position fixes are coalesced per asset in memory and written to SQLite in bulk.
+"""
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from ..config import settings
+from ..models import PositionFix
+from .data_feeds import data_feed_service
+from .websocket import manager
+
+
+class TelemetryService:
+    """
+    Coalescing buffer between GPS feeds and the database.
+
+    `ingest` applies the newest fix per asset straight to the in-memory
+    position store (a fix recorded before the position already held is
+    dropped as stale, one dated more than TELEMETRY_MAX_CLOCK_SKEW_SECONDS
+    ahead of server time as future), so it is visible at once through `get_positions`,
+    nearest-asset queries and the map. A background task writes the pending fixes
+    with DataFeedService.aapply_positions every TELEMETRY_FLUSH_INTERVAL_SECONDS,
+    so however often an asset reports between flushes, it costs one row update.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, PositionFix] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.received = 0
+        self.written = 0
+
+    # --- Ingest ---
+    def ingest(self, fixes: Iterable[PositionFix]) -> dict:
+        """
+        Apply and buffer a batch of fixes. Returns how many assets moved, how many
+        fixes were superseded by a newer one in the batch or were stale, the
+        unknown asset ids, and the ids of assets whose fixes were dropped as future.
+        """
+        # Newer fixes win, so one from the future would hold its asset in place until then
+        horizon = datetime.utcnow() + timedelta(seconds=settings.TELEMETRY_MAX_CLOCK_SKEW_SECONDS)
+        newest: Dict[str, PositionFix] = {}
+        future: List[PositionFix] = []
+        total = 0
+        for fix in fixes:
+            total += 1
+            if fix.recorded_at > horizon:
+                future.append(fix)
+                continue
+            held = newest.get(fix.asset_id)
+            if held is None or fix.recorded_at > held.recorded_at:
+                newest[fix.asset_id] = fix
+        batch = list(newest.values())
+        with self._lock:
+            known, applied = data_feed_service.move_assets(
+                [f.asset_id for f in batch],
+                [f.latitude for f in batch],
+                [f.longitude for f in batch],
+                [f.recorded_at for f in batch]
+            )
+            for fix, ok in zip(batch, applied.tolist()):
+                if ok:
+                    self._pending[fix.asset_id] = fix
+            self.received += total
+        unknown = [f.asset_id for f, ok in zip(batch, known.tolist()) if not ok]
+        accepted = int(applied.sum())
+        return {
+            "accepted": accepted,
+            "coalesced": total - len(future) - len(batch),
+            "stale": len(batch) - len(unknown) - accepted,
+            "unknown": unknown,
+            "future": list(dict.fromkeys(f.asset_id for f in future)),
+        }
+
+    def get_positions(self, **filters) -> List[dict]:
+        """
+        Latest position of every asset (or those matching `filters`, see
+        PositionStore.mask), including fixes not yet written to the database.
+        """
+        return data_feed_service.get_asset_positions(**filters)
+
+    # --- Flush ---
+    async def flush(self) -> int:
+        """Write every pending fix in one transaction and push them to dashboards."""
+        with self._lock:
+            batch = dict(self._pending)
+        if not batch:
+            return 0
+        moved = await data_feed_service.aapply_positions(batch)
+        with self._lock:
+            # Fixes that arrived during the write stay pending for the next flush
+            for asset_id, fix in batch.items():
+                if self._pending.get(asset_id) is fix:
+                    del self._pending[asset_id]
+            self.written += moved
+        await manager.broadcast({
+            "type": "positions",
+            "positions": [
+                {"asset_id": f.asset_id, "latitude": f.latitude, "longitude": f.longitude,
+                 "recorded_at": f.recorded_at.isoformat()}
+                for f in batch.values()
+            ]
+        })
+        return moved
+
+    async def _run(self, interval_seconds: float):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Telemetry flush failed: {e}")
+
+    def start(self, interval_seconds: float = None):
+        """Start the background flush task on the running event loop."""
+        if self._task is None or self._task.done():
+            interval = interval_seconds or settings.TELEMETRY_FLUSH_INTERVAL_SECONDS
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        """Stop the flush task and write whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def discard_pending(self) -> int:
+        """Drop fixes not yet written, e.g. after the database was replaced under them."""
+        with self._lock:
+            dropped = len(self._pending)
+            self._pending.clear()
+            return dropped
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {"received": self.received, "written": self.written, "pending": len(self._pending)}
+
+
+# Global instance
+telemetry_service = TelemetryService()
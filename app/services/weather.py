@@ -0,0 +1,226 @@
+"""
+Weather observation time series.
+Background ingest of simulated readings, downsampled range queries and retention.
+"""
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import AsyncSessionLocal
+from ..db_models import WeatherDB, WeatherRollupDB
+from ..models import WeatherData
+from .data_feeds import data_feed_service
+
+# (raw column, rollup column prefix, API name)
+METRICS = (
+    ("wind_speed_mph", "wind_speed", "wind_speed_mph"),
+    ("rainfall_inches", "rainfall", "rainfall_inches"),
+    ("storm_surge_feet", "storm_surge", "storm_surge_feet"),
+)
+
+
+def _bucket_epoch(column, bucket_seconds: int):
+    """SQL expression flooring a DATETIME column to a bucket, as epoch seconds."""
+    epoch = cast(func.strftime("%s", column), Integer)
+    return epoch.op("/")(bucket_seconds).op("*")(bucket_seconds)
+
+
+class WeatherService:
+    """
+    Weather feed backed by an append-only observation table.
+
+    A background task appends a new simulated reading every
+    WEATHER_INGEST_INTERVAL_SECONDS and compacts raw points older than
+    WEATHER_RAW_RETENTION_HOURS into per-bucket rollups. The latest reading
+    is cached in the operational state store, so /api/weather never hits SQLite.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._last_compaction: Optional[datetime] = None
+
+    # --- Ingest ---
+    def next_observation(self, previous: Optional[WeatherData]) -> Optional[WeatherData]:
+        """Simulate the next reading as a small random walk from the previous one."""
+        if previous is None:
+            return None
+        return previous.model_copy(update={
+            "timestamp": datetime.utcnow(),
+            "wind_speed_mph": max(0.0, previous.wind_speed_mph + random.uniform(-0.5, 0.5)),
+            "storm_surge_feet": max(0.0, previous.storm_surge_feet + random.uniform(-0.05, 0.05)),
+            "rainfall_inches": max(0.0, previous.rainfall_inches + random.uniform(0.0, 0.02)),
+        })
+
+    async def ingest_once(self) -> Optional[WeatherData]:
+        observation = self.next_observation(data_feed_service.get_weather())
+        if observation is not None:
+            await data_feed_service.arecord_weather(observation)
+        return observation
+
+    async def _run(self, interval_seconds: float):
+        while True:
+            try:
+                await self.ingest_once()
+                now = datetime.utcnow()
+                if self._last_compaction is None or now - self._last_compaction >= timedelta(hours=1):
+                    await self.acompact()
+                    self._last_compaction = now
+            except Exception as e:
+                print(f"Weather ingest failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    def start(self, interval_seconds: float = None):
+        """Start the background ingest task on the running event loop."""
+        if self._task is None or self._task.done():
+            interval = interval_seconds or settings.WEATHER_INGEST_INTERVAL_SECONDS
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # --- Range queries ---
+    async def aget_history(self, start: datetime, end: datetime, bucket_seconds: int) -> List[Dict[str, Any]]:
+        async with AsyncSessionLocal() as db:
+            return await db.run_sync(self.get_history, start, end, bucket_seconds)
+
+    def get_history(self, db: Session, start: datetime, end: datetime, bucket_seconds: int) -> List[Dict[str, Any]]:
+        """
+        Downsample observations in [start, end) to min/max/avg per bucket.
+        Raw points and compacted rollups are both aggregated in SQL, then merged.
+        """
+        buckets: Dict[int, Dict[str, Any]] = {}
+
+        raw_bucket = _bucket_epoch(WeatherDB.timestamp, bucket_seconds).label("bucket")
+        raw_cols = [raw_bucket, func.count().label("n"), func.max(WeatherDB.hurricane_category)]
+        for column, _, _ in METRICS:
+            col = getattr(WeatherDB, column)
+            raw_cols += [func.min(col), func.max(col), func.avg(col)]
+        raw = select(*raw_cols).where(
+            WeatherDB.timestamp >= start, WeatherDB.timestamp < end
+        ).group_by(raw_bucket)
+
+        roll_bucket = _bucket_epoch(WeatherRollupDB.bucket_start, bucket_seconds).label("bucket")
+        roll_cols = [roll_bucket, func.sum(WeatherRollupDB.sample_count), func.max(WeatherRollupDB.hurricane_category)]
+        for _, prefix, _ in METRICS:
+            roll_cols += [
+                func.min(getattr(WeatherRollupDB, f"{prefix}_min")),
+                func.max(getattr(WeatherRollupDB, f"{prefix}_max")),
+                # Weighted mean of bucket means
+                func.sum(getattr(WeatherRollupDB, f"{prefix}_avg") * WeatherRollupDB.sample_count)
+                / func.sum(WeatherRollupDB.sample_count),
+            ]
+        rolled = select(*roll_cols).where(
+            WeatherRollupDB.bucket_start >= start, WeatherRollupDB.bucket_start < end
+        ).group_by(roll_bucket)
+
+        for row in list(db.execute(rolled)) + list(db.execute(raw)):
+            self._merge_bucket(buckets, row)
+
+        return [
+            {"bucket_start": datetime.utcfromtimestamp(epoch).isoformat(), **buckets[epoch]}
+            for epoch in sorted(buckets)
+        ]
+
+    @staticmethod
+    def _merge_bucket(buckets: Dict[int, Dict[str, Any]], row):
+        epoch, count, category = row[0], row[1] or 0, row[2]
+        if not count:
+            return
+        values = row[3:]
+        current = buckets.get(epoch)
+        if current is None:
+            current = buckets[epoch] = {"count": 0, "hurricane_category": category}
+            for _, _, name in METRICS:
+                current[name] = {"min": None, "max": None, "avg": 0.0}
+        elif category is not None:
+            current["hurricane_category"] = max(current["hurricane_category"] or 0, category)
+        total = current["count"] + count
+        for i, (_, _, name) in enumerate(METRICS):
+            lo, hi, avg = values[i * 3:i * 3 + 3]
+            metric = current[name]
+            lo, hi = round(lo, 3), round(hi, 3)
+            metric["min"] = lo if metric["min"] is None else min(metric["min"], lo)
+            metric["max"] = hi if metric["max"] is None else max(metric["max"], hi)
+            metric["avg"] = round((metric["avg"] * current["count"] + avg * count) / total, 3)
+        current["count"] = total
+
+    # --- Retention ---
+    async def acompact(self, now: datetime = None) -> int:
+        async with AsyncSessionLocal() as db:
+            return await db.run_sync(self.compact, now)
+
+    def compact(self, db: Session, now: datetime = None) -> int:
+        """
+        Fold raw observations older than the retention window into rollups and
+        delete them. The most recent raw observation is always kept.
+        Returns the number of raw rows compacted.
+        """
+        bucket_seconds = settings.WEATHER_ROLLUP_BUCKET_MINUTES * 60
+        cutoff = (now or datetime.utcnow()) - timedelta(hours=settings.WEATHER_RAW_RETENTION_HOURS)
+        # Align to a bucket boundary so no bucket is split between raw and rollup
+        cutoff_epoch = int((cutoff - datetime(1970, 1, 1)).total_seconds()) // bucket_seconds * bucket_seconds
+        cutoff = datetime.utcfromtimestamp(cutoff_epoch)
+
+        latest_id = db.execute(select(func.max(WeatherDB.id))).scalar()
+        if latest_id is None:
+            return 0
+        expired = (WeatherDB.timestamp < cutoff, WeatherDB.id < latest_id)
+
+        bucket = _bucket_epoch(WeatherDB.timestamp, bucket_seconds).label("bucket")
+        cols = [bucket, func.count(), func.max(WeatherDB.hurricane_category)]
+        for column, _, _ in METRICS:
+            col = getattr(WeatherDB, column)
+            cols += [func.min(col), func.max(col), func.avg(col)]
+        rows = db.execute(select(*cols).where(*expired).group_by(bucket)).all()
+        if not rows:
+            return 0
+
+        compacted = 0
+        table = WeatherRollupDB.__table__
+        for row in rows:
+            epoch, count, category = row[0], row[1], row[2]
+            values = {
+                "bucket_start": datetime.utcfromtimestamp(epoch),
+                "bucket_seconds": bucket_seconds,
+                "sample_count": count,
+                "hurricane_category": category,
+            }
+            for i, (_, prefix, _) in enumerate(METRICS):
+                values[f"{prefix}_min"], values[f"{prefix}_max"], values[f"{prefix}_avg"] = row[3 + i * 3:6 + i * 3]
+            stmt = sqlite_insert(table).values(**values)
+            # A bucket may be compacted in several passes; merge into the existing rollup
+            excluded = stmt.excluded
+            merged_count = table.c.sample_count + excluded.sample_count
+            set_ = {
+                "sample_count": merged_count,
+                "hurricane_category": func.max(table.c.hurricane_category, excluded.hurricane_category),
+            }
+            for _, prefix, _ in METRICS:
+                set_[f"{prefix}_min"] = func.min(table.c[f"{prefix}_min"], excluded[f"{prefix}_min"])
+                set_[f"{prefix}_max"] = func.max(table.c[f"{prefix}_max"], excluded[f"{prefix}_max"])
+                set_[f"{prefix}_avg"] = (
+                    table.c[f"{prefix}_avg"] * table.c.sample_count
+                    + excluded[f"{prefix}_avg"] * excluded.sample_count
+                ) / merged_count
+            db.execute(stmt.on_conflict_do_update(index_elements=["bucket_start"], set_=set_))
+            compacted += count
+
+        db.query(WeatherDB).filter(*expired).delete(synchronize_session=False)
+        db.commit()
+        return compacted
+
+
+# Singleton instance
+weather_service = WeatherService()
@@ -0,0 +1,41 @@
+"""
+Conditional GET helpers.
+Strong ETags derived from state-store versions, and If-None-Match handling.
+"""
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from version components."""
+    return '"' + "-".join(str(p) for p in parts) + '"'
+
+
+def etag_headers(etag: str) -> dict:
+    """Headers for a response carrying `etag`; no-cache makes browsers revalidate every time."""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored."""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Return a 304 response if the client already holds this version, else None.
+    Call it before doing any database or serialization work.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
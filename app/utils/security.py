@@ -22,6 +22,19 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def seed_default_users(db: Session) -> bool:
+    """Create the default admin, dispatcher and viewer accounts if there are no users."""
+    if db.query(UserDB).first():
+        return False
+    db.add_all([
+        UserDB(username="admin", hashed_password=get_password_hash("admin"), role="admin"),
+        UserDB(username="operator", hashed_password=get_password_hash("operator"), role="dispatcher"),
+        UserDB(username="viewer", hashed_password=get_password_hash("viewer"), role="viewer"),
+    ])
+    db.commit()
+    print("Default users created: admin/admin, operator/operator")
+    return True
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -57,3 +70,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
 
 async def get_current_active_user(current_user: UserDB = Depends(get_current_user)):
     return current_user
+
+def require_role(*roles: str):
+    """Dependency that only lets through active users with one of `roles`."""
+    async def check_role(current_user: UserDB = Depends(get_current_active_user)):
+        if current_user.role not in roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Requires the {' or '.join(roles)} role"
+            )
+        return current_user
+    return check_role
@@ -0,0 +1,43 @@
+"""
+Fast-path JSON serialization for large list responses.
+Encodes plain dicts with orjson when available, bypassing FastAPI's per-object encoder.
+"""
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode plain Python data (dicts, lists, datetimes, enums) to JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for trusted, already JSON-shaped content.
+
+    Unlike returning data from a route, the content is not run through
+    response_model validation or jsonable_encoder; it is encoded in one pass.
+    Only pass plain dicts/lists (e.g. projected rows or cached row dicts).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,104 @@
+"""
+Benchmark: resolution-time analytics over a large incident history.
+
+Seeds N resolved incidents into the archive (plus a hot slice) and times:
+  window      p50/p90/p99 by type and priority with ROW_NUMBER() over the
+              UNION ALL of both tables (sorts every row)
+  indexed     AnalyticsService.get_resolution_stats (index walks, no sort)
+  dashboard   the whole get_dashboard_stats call
+
+Usage:
+    python -m benchmarks.bench_analytics [--incidents 1000000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_sqlite_engine
+from app.services.analytics import analytics_service
+from app.services.data_feeds import migrate_database
+
+PRIORITIES = ["critical", "high", "medium", "low"]
+TYPES = ["flood_rescue", "medical_emergency", "structural_collapse", "evacuation", "utility_failure", "road_blockage"]
+HOT_SHARE = 100  # one in this many resolved incidents is still in the hot table
+
+WINDOW_SQL = """
+WITH history AS (
+    SELECT type, priority, (julianday(resolved_at) - julianday(reported_at)) * 1440 AS m
+    FROM incidents WHERE status = 'resolved' AND resolved_at IS NOT NULL
+    UNION ALL
+    SELECT type, priority, (julianday(resolved_at) - julianday(reported_at)) * 1440
+    FROM incidents_archive WHERE resolved_at IS NOT NULL
+), ranked AS (
+    SELECT type, priority, m,
+           ROW_NUMBER() OVER (PARTITION BY type, priority ORDER BY m) AS rn,
+           COUNT(*) OVER (PARTITION BY type, priority) AS n
+    FROM history
+)
+SELECT type, priority, COUNT(*), AVG(m),
+       MIN(CASE WHEN rn * 100 >= n * 50 THEN m END),
+       MIN(CASE WHEN rn * 100 >= n * 90 THEN m END),
+       MIN(CASE WHEN rn * 100 >= n * 99 THEN m END)
+FROM ranked GROUP BY type, priority
+"""
+
+
+def seed(engine, n: int):
+    rng = random.Random(1)
+    t0 = datetime(2024, 9, 1)
+    hot, archived = [], []
+    for i in range(n):
+        reported = t0 + timedelta(seconds=i * 20)
+        resolved = reported + timedelta(minutes=rng.expovariate(1 / 90))
+        row = (f"INC-{i:07d}", rng.choice(TYPES), rng.choice(PRIORITIES), "Resolved incident", 1,
+               "resolved", str(reported), str(resolved), 27.9, -82.5)
+        (hot if i % HOT_SHARE == 0 else archived).append(row)
+    columns = "id, type, priority, description, affected_count, status, reported_at, resolved_at, latitude, longitude"
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for table, rows in (("incidents", hot), ("incidents_archive", archived)):
+            cursor.executemany(f"INSERT INTO {table} ({columns}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--incidents", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="hops-analytics-")
+    engine = create_sqlite_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+    migrate_database(engine)
+    seed(engine, args.incidents)
+    db = sessionmaker(bind=engine)()
+
+    window, window_s = timed(lambda: db.execute(text(WINDOW_SQL)).all())
+    indexed, indexed_s = timed(lambda: analytics_service.get_resolution_stats(db))
+    _, dashboard_s = timed(lambda: analytics_service.get_dashboard_stats(db))
+
+    expected = {(t, p): round(p99, 1) for t, p, _, _, _, _, p99 in window}
+    assert all(expected[(r["type"], r["priority"])] == r["p99_mins"] for r in indexed)
+
+    print(f"{args.incidents} resolved incidents, {len(indexed)} type/priority groups")
+    print(f"  window functions   {window_s * 1e3:8.0f} ms")
+    print(f"  indexed            {indexed_s * 1e3:8.0f} ms")
+    print(f"  full dashboard     {dashboard_s * 1e3:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: clustering duplicate incident reports.
+
+Simulates `--events` real incidents, each reported by `--calls` callers
+scattered up to ~100 m around it over half an hour, and feeds every call
+through add_incident (one incident per call) and report_incident (calls
+merged into a matching nearby incident). Reports incidents created and
+time per report.
+
+Usage:
+    python -m benchmarks.bench_clustering [--events 200] [--calls 20]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_sqlite_engine
+from app.models import Incident, IncidentType, Location, Priority
+from app.services.data_feeds import DataFeedService, migrate_database
+
+
+def make_service() -> DataFeedService:
+    tmp = tempfile.mkdtemp(prefix="hops-cluster-")
+    engine = create_sqlite_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+    migrate_database(engine)
+    service = DataFeedService()
+    service.get_db = sessionmaker(bind=engine)
+    service.reload_state()
+    return service
+
+
+def calls(n_events: int, per_event: int):
+    rng = random.Random(3)
+    types = list(IncidentType)
+    t0 = datetime.utcnow()
+    events = [
+        (rng.uniform(27.85, 28.05), rng.uniform(-82.60, -82.35), rng.choice(types))
+        for _ in range(n_events)
+    ]
+    reports = []
+    for lat, lon, incident_type in events:
+        for _ in range(per_event):
+            reports.append(Incident(
+                type=incident_type, priority=rng.choice(list(Priority)),
+                location=Location(latitude=lat + rng.uniform(-0.0009, 0.0009),
+                                  longitude=lon + rng.uniform(-0.0009, 0.0009)),
+                description="Caller report", affected_count=rng.randint(1, 4),
+                reported_at=t0 + timedelta(seconds=rng.uniform(0, 1800))
+            ))
+    rng.shuffle(reports)
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=20, help="Reports per real incident")
+    args = parser.parse_args()
+    reports = calls(args.events, args.calls)
+
+    results = {}
+    for label, method in (("add_incident", "add_incident"), ("report_incident", "report_incident")):
+        service = make_service()
+        start = time.perf_counter()
+        for report in reports:
+            getattr(service, method)(report)
+        elapsed = time.perf_counter() - start
+        incidents = service.get_all_incidents()
+        results[label] = (len(incidents), elapsed, sum(i.affected_count for i in incidents))
+
+    print(f"{len(reports)} calls about {args.events} incidents")
+    for label, (count, elapsed, affected) in results.items():
+        print(f"  {label:<16} {count:6d} incidents  {affected:6d} affected  "
+              f"{elapsed / len(reports) * 1e3:6.2f} ms/report")
+
+
+if __name__ == "__main__":
+    main()
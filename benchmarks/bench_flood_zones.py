@@ -0,0 +1,78 @@
+"""
+Benchmark: tagging points with their flood zone.
+
+Classifies N random points around Tampa against data/flood_zones.geojson,
+comparing a per-point ray-casting loop in Python with FloodZoneIndex.classify
+(bounding-box prefilter plus one vectorized crossing test per polygon).
+
+Usage:
+    python -m benchmarks.bench_flood_zones [--points 100000] [--sample 5000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services.flood_zones import NO_ZONE, FloodZoneIndex
+
+LAT_RANGE = (27.80, 28.15)
+LON_RANGE = (-82.70, -82.25)
+
+
+def point_in_rings(lat: float, lon: float, edges) -> bool:
+    inside = False
+    for x1, y1, x2, y2 in edges:
+        if (y1 > lat) != (y2 > lat) and lon < x1 + (lat - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+    return inside
+
+
+def loop_classifier(index: FloodZoneIndex):
+    polygons = [
+        (p.code, [(x1, y1, x1 + (y2 - y1) * s, y2) for x1, y1, y2, s in zip(
+            p.x1.tolist(), p.y1.tolist(), p.y2.tolist(), p.slope.tolist())])
+        for p in index._polygons
+    ]
+
+    def classify(lats, lons):
+        codes = []
+        for lat, lon in zip(lats, lons):
+            code = NO_ZONE
+            for zone, edges in polygons:
+                if point_in_rings(lat, lon, edges):
+                    code = zone
+                    break
+            codes.append(code)
+        return codes
+    return classify
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=5000, help="Points timed on the loop path")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    lats = rng.uniform(*LAT_RANGE, args.points)
+    lons = rng.uniform(*LON_RANGE, args.points)
+    index = FloodZoneIndex().load()
+
+    classify = loop_classifier(index)
+    sample_lats, sample_lons = lats[:args.sample].tolist(), lons[:args.sample].tolist()
+    start = time.perf_counter()
+    expected = classify(sample_lats, sample_lons)
+    per_point = (time.perf_counter() - start) / args.sample
+
+    start = time.perf_counter()
+    codes = index.classify(lats, lons)
+    vectorized = time.perf_counter() - start
+    assert codes[:args.sample].tolist() == expected
+
+    print(f"{args.points} points, {len(index)} polygons, {len(index.zones)} zones")
+    print(f"  python loop   {per_point * 1e6:7.2f} us/point -> {per_point * args.points * 1e3:8.1f} ms")
+    print(f"  vectorized    {vectorized / args.points * 1e6:7.2f} us/point -> {vectorized * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: live asset positions as Asset models vs the array-backed PositionStore.
+
+Measures, for N assets:
+  memory       Asset models with nested Location vs the position arrays
+  tick update  moving every asset once: model_copy per asset (how a
+               location write updates the store) vs one bulk_update
+  filter       ids of available boats inside a bounding box
+
+Usage:
+    python -m benchmarks.bench_positions [--assets 50000]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from app.models import Asset, AssetStatus, AssetType, Location
+from app.services.positions import PositionStore
+
+LAT_RANGE = (27.60, 28.20)
+LON_RANGE = (-82.80, -82.20)
+BBOX = (27.8, -82.6, 28.0, -82.4)
+
+
+def make_assets(n: int):
+    rng = random.Random(42)
+    types, statuses = list(AssetType), list(AssetStatus)
+    return [
+        Asset(
+            id=f"A-{i:06d}", name=f"Asset {i}", type=rng.choice(types), status=rng.choice(statuses),
+            location=Location(latitude=rng.uniform(*LAT_RANGE), longitude=rng.uniform(*LON_RANGE)),
+        )
+        for i in range(n)
+    ]
+
+
+def make_store(assets) -> PositionStore:
+    store = PositionStore()
+    for a in assets:
+        store.upsert(a.id, a.location.latitude, a.location.longitude, a.type, a.status, a.last_updated)
+    return store
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--assets", type=int, default=50_000)
+    args = parser.parse_args()
+
+    assets, models_mb = measure_memory(lambda: make_assets(args.assets))
+    # Ids are shared with the models, so this is the arrays plus the id index
+    store, store_mb = measure_memory(lambda: make_store(assets))
+
+    rng = random.Random(7)
+    ids = [a.id for a in assets]
+    lats = [rng.uniform(*LAT_RANGE) for _ in ids]
+    lons = [rng.uniform(*LON_RANGE) for _ in ids]
+    now = datetime.utcnow() + timedelta(seconds=1)
+
+    start = time.perf_counter()
+    by_id = {a.id: a for a in assets}
+    for asset_id, lat, lon in zip(ids, lats, lons):
+        asset = by_id[asset_id]
+        by_id[asset_id] = asset.model_copy(update={
+            "location": asset.location.model_copy(update={"latitude": lat, "longitude": lon}),
+            "last_updated": now,
+        })
+    models_tick = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store.bulk_update(ids, lats, lons, [now] * len(ids))
+    store_tick = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scan = [
+        a.id for a in by_id.values()
+        if a.type == AssetType.BOAT and a.status == AssetStatus.AVAILABLE
+        and BBOX[0] <= a.location.latitude <= BBOX[2] and BBOX[1] <= a.location.longitude <= BBOX[3]
+    ]
+    models_filter = time.perf_counter() - start
+
+    start = time.perf_counter()
+    selected = store.select(types=[AssetType.BOAT], statuses=[AssetStatus.AVAILABLE], bbox=BBOX)
+    store_filter = time.perf_counter() - start
+    assert sorted(selected) == sorted(scan)
+
+    print(f"{args.assets} assets            Asset models   PositionStore")
+    print(f"  memory (MB)           {models_mb:12.1f}   {store_mb:6.1f}")
+    print(f"  tick update (ms)      {models_tick * 1e3:12.1f}   {store_tick * 1e3:6.1f}")
+    print(f"  bbox+type+status (ms) {models_filter * 1e3:12.1f}   {store_filter * 1e3:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: serializing a 10k-row incident list.
+
+Compares the previous path (validated Incident per row, then FastAPI's
+jsonable_encoder and json.dumps, plus a response_model re-validation) with
+the fast path (projected rows / cached row dicts encoded by FastJSONResponse).
+
+Usage:
+    python -m benchmarks.bench_serialization [--rows 10000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_sqlite_engine, migrate_schema
+from app.db_models import IncidentDB
+from app.models import Incident, Location
+from app.services.data_feeds import INCIDENT_FIELDS, DataFeedService, data_feed_service
+from app.services.state_store import OperationalStateStore
+from app.utils.serialization import FastJSONResponse
+
+PRIORITIES = ["critical", "high", "medium", "low"]
+TYPES = ["flood_rescue", "medical_emergency", "structural_collapse", "evacuation"]
+
+
+def seed(engine, n_rows: int):
+    migrate_schema(engine)
+    rng = random.Random(1)
+    with engine.begin() as conn:
+        conn.execute(IncidentDB.__table__.insert(), [
+            {
+                "id": f"INC-{i:06d}",
+                "type": rng.choice(TYPES),
+                "priority": rng.choice(PRIORITIES),
+                "description": "Benchmark incident",
+                "affected_count": rng.randint(0, 20),
+                "status": "active",
+                "latitude": 27.9 + rng.random() / 10,
+                "longitude": -82.5 + rng.random() / 10,
+                "address": f"{i} Bayshore Blvd",
+                "assigned_assets": [],
+                "notes": ["Reported by caller"],
+            }
+            for i in range(n_rows)
+        ])
+
+
+def validated_model(db_obj: IncidentDB) -> Incident:
+    """The per-row conversion used before the fast path."""
+    return Incident(
+        id=db_obj.id,
+        type=db_obj.type,
+        priority=db_obj.priority,
+        location=Location(latitude=db_obj.latitude, longitude=db_obj.longitude, address=db_obj.address),
+        description=db_obj.description,
+        affected_count=db_obj.affected_count,
+        status=db_obj.status,
+        reported_at=db_obj.reported_at,
+        assigned_assets=db_obj.assigned_assets or [],
+        notes=db_obj.notes or []
+    )
+
+
+def best_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="hops-ser-")
+    engine = create_sqlite_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+    seed(engine, args.rows)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    rows = db.query(IncidentDB).all()
+    list_adapter = TypeAdapter(List[Incident])
+
+    # End-to-end from the database
+    def legacy_from_db():
+        models = [validated_model(r) for r in db.query(IncidentDB).all()]
+        return JSONResponse(jsonable_encoder(models)).body
+
+    def legacy_response_model():
+        models = [validated_model(r) for r in db.query(IncidentDB).all()]
+        validated = list_adapter.validate_python(jsonable_encoder(models))
+        return JSONResponse(jsonable_encoder(validated)).body
+
+    def fast_from_db():
+        items, _ = DataFeedService._page(
+            db, INCIDENT_FIELDS, list(INCIDENT_FIELDS), [],
+            order_by=(IncidentDB.reported_at, IncidentDB.id), limit=args.rows
+        )
+        return FastJSONResponse(items).body
+
+    # Serving the full list from the in-memory store
+    store = OperationalStateStore()
+    store.load([data_feed_service._to_incident_model(r) for r in rows], [], None)
+
+    def store_legacy():
+        return JSONResponse(jsonable_encoder(store.list_incidents())).body
+
+    def store_fast():
+        return FastJSONResponse(store.list_incident_rows()).body
+
+    assert len(fast_from_db()) > 0 and store_fast().count(b'"id"') == args.rows
+
+    results = [
+        ("db -> validated models -> jsonable_encoder", legacy_from_db),
+        ("  + response_model re-validation", legacy_response_model),
+        ("db -> projected dicts -> FastJSONResponse", fast_from_db),
+        ("store models -> jsonable_encoder", store_legacy),
+        ("store row dicts -> FastJSONResponse", store_fast),
+    ]
+    print(f"{args.rows} incidents, best of {args.repeat}")
+    for label, fn in results:
+        print(f"  {label:<46} {best_ms(fn, args.repeat):8.1f} ms")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
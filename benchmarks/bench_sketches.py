@@ -0,0 +1,55 @@
+"""
+Benchmark: response-time percentiles from a quantile sketch.
+
+Feeds N simulated response times (log-normal minutes) into a DDSketch and
+compares p50/p95/p99 per request from the sketch with sorting the full
+history, reporting the worst relative error and the sketch size.
+
+Usage:
+    python -m benchmarks.bench_sketches [--observations 1000000] [--accuracy 0.01]
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.services.sketches import DDSketch
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--observations", type=int, default=1_000_000)
+    parser.add_argument("--accuracy", type=float, default=0.01)
+    args = parser.parse_args()
+
+    values = np.random.default_rng(7).lognormal(3.0, 1.2, args.observations)
+    history = values.tolist()
+
+    sketch = DDSketch(args.accuracy)
+    start = time.perf_counter()
+    for value in history:
+        sketch.add(value)
+    add_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ordered = sorted(history)
+    exact = {q: ordered[int(q * (len(ordered) - 1))] for q in QUANTILES}
+    sort_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    approx = sketch.quantiles(QUANTILES)
+    sketch_s = time.perf_counter() - start
+
+    error = max(abs(approx[q] - exact[q]) / exact[q] for q in QUANTILES)
+    size = len(json.dumps(sketch.to_dict()))
+    print(f"{args.observations} observations, {len(sketch.bins)} buckets, {size / 1024:.1f} KiB persisted")
+    print(f"  add              {add_s / args.observations * 1e6:8.2f} us/value")
+    print(f"  sort history     {sort_s * 1e3:8.1f} ms/request")
+    print(f"  sketch           {sketch_s * 1e3:8.3f} ms/request   max relative error {error:.4f}")
+
+
+if __name__ == "__main__":
+    main()
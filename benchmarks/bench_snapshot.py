@@ -0,0 +1,119 @@
+"""
+Benchmark: snapshot export and bulk restore of a large incident table.
+
+Seeds N incidents (with notes), exports a snapshot, restores it into the same
+database and compares restore throughput with per-row ORM inserts
+(`db.add` per row, as the demo data seeding does), measured on a sample.
+
+Usage:
+    python -m benchmarks.bench_snapshot [--incidents 1000000] [--orm-sample 20000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_sqlite_engine
+from app.db_models import IncidentDB
+from app.services.data_feeds import migrate_database
+from app.services.search import drop_search_triggers, rebuild_search_index
+from app.services.snapshot import restore_snapshot, write_snapshot
+
+PRIORITIES = ["critical", "high", "medium", "low"]
+TYPES = ["flood_rescue", "medical_emergency", "structural_collapse", "evacuation"]
+WORDS = "water rising family trapped roof shelter power outage road blocked injured elderly boat".split()
+
+
+def incident_rows(n: int, start: int = 0):
+    rng = random.Random(start)
+    t0 = datetime(2024, 9, 1)
+    for i in range(start, start + n):
+        yield (
+            f"INC-{i:07d}", rng.choice(TYPES), rng.choice(PRIORITIES),
+            " ".join(rng.choices(WORDS, k=8)), rng.randint(1, 40),
+            rng.choice(["active", "active", "resolved"]), str(t0 + timedelta(seconds=i)),
+            27.6 + rng.random() * 0.6, -82.8 + rng.random() * 0.6, f"{i} Bay St", i + 1, 1, i + 1,
+        )
+
+
+def seed(engine, n: int):
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("BEGIN")
+        drop_search_triggers(cursor)
+        cursor.executemany(
+            "INSERT INTO incidents (id, type, priority, description, affected_count, status, reported_at, "
+            "latitude, longitude, address, search_rowid, version, change_version) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            incident_rows(n)
+        )
+        cursor.execute(
+            "INSERT INTO incident_notes (incident_id, author, body, created_at) "
+            "SELECT id, 'ops', 'Crew on scene, ' || description, reported_at FROM incidents WHERE rowid % 4 = 0"
+        )
+        rebuild_search_index(cursor)
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def orm_rate(engine, n: int) -> float:
+    """Rows per second inserting incidents one ORM object at a time."""
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    try:
+        start = time.perf_counter()
+        for row in incident_rows(n, start=10_000_000):
+            db.add(IncidentDB(
+                id=row[0], type=row[1], priority=row[2], description=row[3], affected_count=row[4],
+                status=row[5], reported_at=datetime.fromisoformat(row[6]),
+                latitude=row[7], longitude=row[8], address=row[9]
+            ))
+        db.commit()
+        return n / (time.perf_counter() - start)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--incidents", type=int, default=1_000_000)
+    parser.add_argument("--orm-sample", type=int, default=20_000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="hops-snap-")
+    engine = create_sqlite_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+    migrate_database(engine)
+
+    start = time.perf_counter()
+    seed(engine, args.incidents)
+    print(f"Seeded {args.incidents} incidents in {time.perf_counter() - start:.1f}s")
+
+    path = os.path.join(tmp, "state.snap")
+    start = time.perf_counter()
+    with open(path, "wb") as f:
+        counts = write_snapshot(f, engine)
+    export_s = time.perf_counter() - start
+    size_mb = os.path.getsize(path) / 1e6
+    db_mb = os.path.getsize(os.path.join(tmp, "bench.db")) / 1e6
+    print(f"Export   {sum(counts.values())} rows in {export_s:.1f}s, {size_mb:.1f} MB (database file {db_mb:.1f} MB)")
+
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        restored = restore_snapshot(f, engine)
+    restore_s = time.perf_counter() - start
+    assert restored == counts
+    print(f"Restore  {sum(restored.values())} rows in {restore_s:.1f}s "
+          f"({restored['incidents'] / restore_s:,.0f} incidents/s incl. notes and search index)")
+
+    rate = orm_rate(engine, args.orm_sample)
+    print(f"ORM db.add per row: {rate:,.0f} incidents/s -> {args.incidents / rate:.0f}s for {args.incidents}")
+
+
+if __name__ == "__main__":
+    main()
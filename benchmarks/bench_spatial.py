@@ -0,0 +1,92 @@
+"""
+Benchmark: nearest-available-asset queries against the array-backed position store.
+
+Usage:
+    python -m benchmarks.bench_spatial [--assets 50000] [--queries 2000]
+"""
+import argparse
+import random
+import time
+
+from app.models import Asset, AssetStatus, AssetType, Location
+from app.services.spatial import haversine_km
+from app.services.state_store import OperationalStateStore
+
+# Rough bounding box of the Tampa Bay area
+LAT_RANGE = (27.60, 28.20)
+LON_RANGE = (-82.80, -82.20)
+
+
+def build_store(n_assets: int) -> OperationalStateStore:
+    rng = random.Random(42)
+    types = list(AssetType)
+    statuses = list(AssetStatus)
+    assets = [
+        Asset(
+            id=f"A-{i:06d}",
+            name=f"Asset {i}",
+            type=rng.choice(types),
+            status=rng.choice(statuses),
+            location=Location(latitude=rng.uniform(*LAT_RANGE), longitude=rng.uniform(*LON_RANGE)),
+        )
+        for i in range(n_assets)
+    ]
+    store = OperationalStateStore()
+    store.load([], assets, None)
+    return store
+
+
+def brute_force(store, lat, lon, k, asset_type, status):
+    candidates = [
+        (haversine_km(lat, lon, a.location.latitude, a.location.longitude), a.id)
+        for a in store.assets.values()
+        if a.type == asset_type and a.status == status
+    ]
+    candidates.sort()
+    return [asset_id for _, asset_id in candidates[:k]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--assets", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    store = build_store(args.assets)
+    print(f"Indexed {args.assets} assets in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rng = random.Random(7)
+    queries = [
+        (rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE), rng.choice(list(AssetType)))
+        for _ in range(args.queries)
+    ]
+
+    # Correctness check against a full scan on a sample of queries
+    for lat, lon, asset_type in queries[:20]:
+        got = [a.id for a, _ in store.nearest_assets(lat, lon, args.k, asset_type, AssetStatus.AVAILABLE)]
+        assert got == brute_force(store, lat, lon, args.k, asset_type, AssetStatus.AVAILABLE)
+
+    timings = []
+    for lat, lon, asset_type in queries:
+        t0 = time.perf_counter()
+        store.nearest_assets(lat, lon, args.k, asset_type, AssetStatus.AVAILABLE)
+        timings.append(time.perf_counter() - t0)
+    timings.sort()
+
+    def pct(p):
+        return timings[min(len(timings) - 1, int(p * len(timings)))] * 1e6
+
+    t0 = time.perf_counter()
+    for lat, lon, asset_type in queries[:50]:
+        brute_force(store, lat, lon, args.k, asset_type, AssetStatus.AVAILABLE)
+    scan_us = (time.perf_counter() - t0) / 50 * 1e6
+
+    print(f"k={args.k} nearest available assets of one type over {args.queries} queries")
+    print(f"  positions   p50={pct(0.50):8.1f} us  p99={pct(0.99):8.1f} us")
+    print(f"  full scan   avg={scan_us:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark: SQLite storage profiles under concurrent dispatch writes and dashboard reads.
+
+Runs the same mixed workload against a fresh database for each profile:
+writer threads update single incident rows (one commit each) while reader
+threads run the dashboard-style queries. Reports throughput and lock errors.
+
+Usage:
+    python -m benchmarks.bench_sqlite_profile [--incidents 20000] [--seconds 5]
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, create_sqlite_engine
+from app.db_models import IncidentDB, AssetDB
+
+PRIORITIES = ["critical", "high", "medium", "low"]
+TYPES = ["flood_rescue", "medical_emergency", "structural_collapse", "evacuation"]
+
+
+def seed(engine, n_incidents: int):
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(1)
+    with engine.begin() as conn:
+        conn.execute(IncidentDB.__table__.insert(), [
+            {
+                "id": f"INC-{i:06d}",
+                "type": rng.choice(TYPES),
+                "priority": rng.choice(PRIORITIES),
+                "description": "Benchmark incident",
+                "affected_count": rng.randint(0, 20),
+                "status": "active",
+                "latitude": 27.9 + rng.random() / 10,
+                "longitude": -82.5 + rng.random() / 10,
+            }
+            for i in range(n_incidents)
+        ])
+
+
+def run_profile(profile: str, n_incidents: int, seconds: float, writers: int, readers: int) -> dict:
+    tmp = tempfile.mkdtemp(prefix=f"hops-{profile}-")
+    engine = create_sqlite_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", profile=profile)
+    seed(engine, n_incidents)
+    Session = sessionmaker(bind=engine)
+
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+
+    def writer(seed_value):
+        rng = random.Random(seed_value)
+        while not stop.is_set():
+            db = Session()
+            try:
+                inc = db.get(IncidentDB, f"INC-{rng.randrange(n_incidents):06d}")
+                inc.priority = rng.choice(PRIORITIES)
+                inc.affected_count = rng.randint(0, 20)
+                db.commit()
+                key = "writes"
+            except OperationalError:
+                db.rollback()
+                key = "locked"
+            finally:
+                db.close()
+            with lock:
+                counts[key] += 1
+
+    def reader(seed_value):
+        rng = random.Random(seed_value)
+        while not stop.is_set():
+            db = Session()
+            try:
+                db.query(IncidentDB.priority, func.count()).group_by(IncidentDB.priority).all()
+                db.query(func.sum(IncidentDB.affected_count)).scalar()
+                db.get(IncidentDB, f"INC-{rng.randrange(n_incidents):06d}")
+                db.query(AssetDB).count()
+                key = "reads"
+            except OperationalError:
+                key = "locked"
+            finally:
+                db.close()
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(100 + i,)) for i in range(readers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+
+    return {
+        "profile": profile,
+        "reads_per_s": counts["reads"] / elapsed,
+        "writes_per_s": counts["writes"] / elapsed,
+        "locked": counts["locked"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--incidents", type=int, default=20_000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{args.writers} writers / {args.readers} readers, {args.incidents} incidents, {args.seconds:.0f}s per profile")
+    print(f"{'profile':<10}{'reads/s':>12}{'writes/s':>12}{'locked':>10}")
+    for profile in ("default", "tuned"):
+        r = run_profile(profile, args.incidents, args.seconds, args.writers, args.readers)
+        print(f"{r['profile']:<10}{r['reads_per_s']:>12.0f}{r['writes_per_s']:>12.0f}{r['locked']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: cold start of an API worker.
+
+Every sample runs in a fresh interpreter against a database prepared once
+with `python -m app.cli init`, and measures:
+
+  import         `import app.main`
+  ready          import plus the startup hooks (schema check, state store load)
+  first request  ready plus one GET /api/incidents
+
+The import cost of FastAPI, SQLAlchemy and Pydantic alone is shown as the floor.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FLOOR = """
+import time
+t0 = time.perf_counter()
+import fastapi, sqlalchemy, pydantic, aiosqlite
+print(json.dumps({"floor": time.perf_counter() - t0}))
+"""
+
+WORKER = """
+import time
+t0 = time.perf_counter()
+import app.main
+t_import = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    t_ready = time.perf_counter()
+    assert client.get("/api/incidents").status_code == 200
+    t_first = time.perf_counter()
+print(json.dumps({"import": t_import - t0, "ready": t_ready - t0, "first request": t_first - t0}))
+"""
+
+
+def run(code: str, env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", "import json\n" + code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=ROOT, AUTO_MIGRATE="false",
+               DATABASE_PATH=os.path.join(tempfile.mkdtemp(prefix="hops-start-"), "bench.db"))
+    subprocess.run([sys.executable, "-m", "app.cli", "init"], cwd=ROOT, env=env,
+                   capture_output=True, check=True)
+
+    samples = {}
+    for _ in range(args.repeat):
+        for result in (run(FLOOR, env), run(WORKER, env)):
+            for name, seconds in result.items():
+                samples.setdefault(name, []).append(seconds * 1000)
+
+    print(f"Worker cold start, median of {args.repeat} fresh interpreters")
+    for name, values in samples.items():
+        print(f"  {name:<14} {statistics.median(values):7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
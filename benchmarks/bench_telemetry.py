@@ -0,0 +1,83 @@
+"""
+Benchmark: writing asset position reports.
+
+N assets each report `--fixes` GPS positions within one flush interval.
+Compares one update_asset call per fix (what PATCH /api/assets/{id} does)
+with coalescing to the newest fix per asset and one apply_positions call.
+
+Usage:
+    python -m benchmarks.bench_telemetry [--assets 5000] [--fixes 5] [--sample 2000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_sqlite_engine
+from app.db_models import AssetDB
+from app.models import PositionFix
+from app.services.data_feeds import DataFeedService, migrate_database
+
+
+def make_service(n_assets: int) -> DataFeedService:
+    tmp = tempfile.mkdtemp(prefix="hops-tele-")
+    engine = create_sqlite_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+    migrate_database(engine)
+    with engine.begin() as conn:
+        conn.execute(AssetDB.__table__.insert(), [
+            {"id": f"BOAT-{i:05d}", "name": f"Boat {i}", "type": "boat", "status": "available",
+             "latitude": 27.9, "longitude": -82.5, "capacity": 6, "crew_size": 2}
+            for i in range(n_assets)
+        ])
+    service = DataFeedService()
+    service.get_db = sessionmaker(bind=engine)
+    service.reload_state()
+    return service
+
+
+def fixes(n_assets: int, per_asset: int):
+    rng = random.Random(1)
+    t0 = datetime.utcnow()
+    for round_ in range(per_asset):
+        for i in range(n_assets):
+            yield PositionFix(
+                asset_id=f"BOAT-{i:05d}",
+                latitude=27.9 + rng.random() / 10, longitude=-82.5 + rng.random() / 10,
+                recorded_at=t0 + timedelta(seconds=round_)
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--assets", type=int, default=5000)
+    parser.add_argument("--fixes", type=int, default=5, help="Fixes per asset per flush interval")
+    parser.add_argument("--sample", type=int, default=2000, help="Fixes timed on the per-fix path")
+    args = parser.parse_args()
+    reports = list(fixes(args.assets, args.fixes))
+
+    service = make_service(args.assets)
+    start = time.perf_counter()
+    for fix in reports[:args.sample]:
+        service.update_asset(fix.asset_id, {"location": {"latitude": fix.latitude, "longitude": fix.longitude}})
+    per_fix = (time.perf_counter() - start) / args.sample
+
+    service = make_service(args.assets)
+    start = time.perf_counter()
+    pending = {}
+    for fix in reports:
+        pending[fix.asset_id] = fix
+    moved = service.apply_positions(pending)
+    batched = time.perf_counter() - start
+
+    print(f"{len(reports)} fixes from {args.assets} assets")
+    print(f"  update_asset per fix  {per_fix * 1e3:6.2f} ms/fix -> {per_fix * len(reports):6.2f} s")
+    print(f"  coalesced bulk write  {batched:6.2f} s for {moved} rows "
+          f"({len(reports) / batched:,.0f} fixes/s)")
+
+
+if __name__ == "__main__":
+    main()
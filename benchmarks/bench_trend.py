@@ -0,0 +1,114 @@
+"""
+Benchmark: incident trend over a large incident history.
+
+Seeds N incidents (most archived, all resolved) spread over the last
+`--days` days, builds the hourly rollups, and times the 7-day trend in
+6-hour buckets split by type two ways:
+  raw       GROUP BY over the UNION ALL of reports and resolutions in
+            both incident tables (scans every row in the window)
+  rollups   AnalyticsService.get_trend (at most one row per hour, type and
+            priority)
+
+Usage:
+    python -m benchmarks.bench_trend [--incidents 1000000] [--days 30]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_sqlite_engine
+from app.services.analytics import analytics_service
+from app.services.data_feeds import migrate_database
+from app.services.rollups import backfill_incident_rollups, hour_of
+
+PRIORITIES = ["critical", "high", "medium", "low"]
+TYPES = ["flood_rescue", "medical_emergency", "structural_collapse", "evacuation", "utility_failure", "road_blockage"]
+HOT_SHARE = 100  # one in this many incidents is still in the hot table
+
+RAW_SQL = """
+SELECT bucket, type, SUM(reported), SUM(resolved) FROM (
+    SELECT CAST((julianday(reported_at) - julianday(:start)) * 24 AS INTEGER) / :bucket AS bucket,
+           type, 1 AS reported, 0 AS resolved
+    FROM incidents WHERE reported_at >= :start AND reported_at < :end
+    UNION ALL
+    SELECT CAST((julianday(reported_at) - julianday(:start)) * 24 AS INTEGER) / :bucket, type, 1, 0
+    FROM incidents_archive WHERE reported_at >= :start AND reported_at < :end
+    UNION ALL
+    SELECT CAST((julianday(resolved_at) - julianday(:start)) * 24 AS INTEGER) / :bucket, type, 0, 1
+    FROM incidents WHERE status = 'resolved' AND resolved_at >= :start AND resolved_at < :end
+    UNION ALL
+    SELECT CAST((julianday(resolved_at) - julianday(:start)) * 24 AS INTEGER) / :bucket, type, 0, 1
+    FROM incidents_archive WHERE resolved_at >= :start AND resolved_at < :end
+) GROUP BY bucket, type
+"""
+
+
+def seed(engine, n: int, end: datetime, days: int):
+    rng = random.Random(1)
+    span = days * 86400
+    hot, archived = [], []
+    for i in range(n):
+        reported = end - timedelta(seconds=span * (i + 1) / (n + 1))
+        resolved = min(reported + timedelta(minutes=rng.expovariate(1 / 90)), end - timedelta(seconds=1))
+        row = (f"INC-{i:07d}", rng.choice(TYPES), rng.choice(PRIORITIES), "Resolved incident", 1,
+               "resolved", str(reported), str(resolved), 27.9, -82.5)
+        (hot if i % HOT_SHARE == 0 else archived).append(row)
+    columns = "id, type, priority, description, affected_count, status, reported_at, resolved_at, latitude, longitude"
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for table, rows in (("incidents", hot), ("incidents_archive", archived)):
+            cursor.executemany(f"INSERT INTO {table} ({columns}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        raw.commit()
+    finally:
+        raw.close()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--incidents", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=30, help="Days of history the incidents span")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="hops-trend-")
+    engine = create_sqlite_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+    migrate_database(engine)
+    end = hour_of(datetime.utcnow()) + timedelta(hours=1)
+    seed(engine, args.incidents, end, args.days)
+    _, build_s = timed(lambda: backfill_incident_rollups(engine))
+    db = sessionmaker(bind=engine)()
+
+    start, bucket = end - timedelta(days=7), 6
+    params = {"start": str(start), "end": str(end), "bucket": bucket}
+    raw, raw_s = timed(lambda: db.execute(text(RAW_SQL), params).all())
+    trend, rollup_s = timed(lambda: analytics_service.get_trend(db, start, end, bucket, group_by="type"))
+
+    expected = {}
+    for index, incident_type, reported, resolved in raw:
+        expected[(index, incident_type)] = {"reported": reported, "resolved": resolved}
+    actual = {
+        (i, incident_type): counts
+        for i, point in enumerate(trend["points"]) for incident_type, counts in point["groups"].items()
+    }
+    assert actual == expected
+
+    rollups = db.execute(text("SELECT COUNT(*) FROM incident_rollups")).scalar()
+    print(f"{args.incidents} incidents over {args.days} days, {rollups} rollup rows (built in {build_s:.1f} s)")
+    print(f"  7-day trend, raw scan   {raw_s * 1e3:8.1f} ms")
+    print(f"  7-day trend, rollups    {rollup_s * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
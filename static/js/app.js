@@ -56,6 +56,7 @@ let incidentMarkers = {};
 let assetMarkers = {};
 let incidents = [];
 let assets = [];
+let syncVersion = 0; // Last change version received from /api/sync
 let showIncidents = true;
 let showAssets = true;
 let agentSessionActive = false;
@@ -295,24 +296,43 @@ function createAssetPopup(asset) {
 async function loadData() {
     if (!authToken) return; // Don't load if not active
     try {
-        const [incidentsRes, assetsRes, summaryRes] = await Promise.all([
-            authenticatedFetch(`${API_BASE}/incidents`),
-            authenticatedFetch(`${API_BASE}/assets`),
+        // Only fetch incidents/assets changed since the last sync
+        const [syncRes, summaryRes] = await Promise.all([
+            authenticatedFetch(`${API_BASE}/sync?since=${syncVersion}`),
             authenticatedFetch(`${API_BASE}/summary`)
         ]);
-        incidents = await incidentsRes.json();
-        assets = await assetsRes.json();
+        const delta = await syncRes.json();
         const summary = await summaryRes.json();
-        updateIncidentsList();
-        updateAssetsList();
+        const changed = applyDelta(delta);
+        if (changed) {
+            updateIncidentsList();
+            updateAssetsList();
+            updateMapMarkers();
+        }
         updateStats(summary);
         updateWeather(summary.weather);
-        updateMapMarkers();
     } catch (error) {
         console.error('Error loading data:', error);
     }
 }
 
+function mergeById(items, changed, deleted, full) {
+    const byId = new Map(full ? [] : items.map(item => [item.id, item]));
+    deleted.forEach(id => byId.delete(id));
+    changed.forEach(item => byId.set(item.id, item));
+    return Array.from(byId.values());
+}
+
+// Apply a /api/sync response; returns true if anything changed
+function applyDelta(delta) {
+    const changed = delta.full || delta.incidents.length || delta.assets.length ||
+        delta.deleted.incidents.length || delta.deleted.assets.length;
+    incidents = mergeById(incidents, delta.incidents, delta.deleted.incidents, delta.full);
+    assets = mergeById(assets, delta.assets, delta.deleted.assets, delta.full);
+    syncVersion = delta.version;
+    return Boolean(changed);
+}
+
 function updateIncidentsList() {
     const container = document.getElementById('incidents-list');
     document.getElementById('incident-count').textContent = incidents.filter(i => i.status !== 'resolved').length;
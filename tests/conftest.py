@@ -0,0 +1,67 @@
+"""
+Shared fixtures. The app reads its settings at import time, so the
+database and flood-zone paths are pointed at a scratch directory and the
+bundled map before anything from `app` is imported.
+"""
+import os
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_TMP = tempfile.mkdtemp(prefix="hops-test-")
+os.environ["DATABASE_PATH"] = os.path.join(_TMP, "app.db")
+os.environ["FLOOD_ZONES_PATH"] = os.path.join(ROOT, "data", "flood_zones.geojson")
+# Tests flush telemetry themselves
+os.environ["TELEMETRY_FLUSH_INTERVAL_SECONDS"] = "3600"
+
+from datetime import datetime  # noqa: E402
+
+import pytest  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.database import create_sqlite_engine  # noqa: E402
+from app.models import Incident, IncidentType, Location, Priority  # noqa: E402
+from app.services.data_feeds import DataFeedService, migrate_database  # noqa: E402
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """A migrated database of its own for each test."""
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    migrate_database(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def service(engine) -> DataFeedService:
+    """A data feed service (and state store) on the test's database."""
+    service = DataFeedService()
+    service.get_db = sessionmaker(bind=engine)
+    service.reload_state()
+    return service
+
+
+@pytest.fixture(scope="session")
+def client():
+    """The app, started up (migrated and seeded with the demo data) on the scratch database."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client) -> dict:
+    """Bearer token of the default admin account."""
+    token = client.post("/api/auth/token", data={"username": "admin", "password": "admin"}).json()
+    return {"Authorization": f"Bearer {token['access_token']}"}
+
+
+def make_incident(incident_type=IncidentType.FLOOD_RESCUE, priority=Priority.HIGH,
+                  reported_at: datetime = None, description: str = "Test incident", **fields) -> Incident:
+    return Incident(
+        type=incident_type, priority=priority,
+        location=Location(latitude=27.95, longitude=-82.46),
+        description=description, reported_at=reported_at or datetime.utcnow(), **fields
+    )
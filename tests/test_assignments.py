@@ -0,0 +1,83 @@
+"""Assignments: one live incident per asset, and resolved incidents keep the assets that served them."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_sqlite_engine
+from app.services.archive import incident_archive_service
+from app.services.data_feeds import DataFeedService, migrate_database
+
+
+def listed(service, incident_id: str) -> dict:
+    """assigned_assets as served by the store, the paged query and delta sync."""
+    rows, _ = service.query_incidents(fields="id,assigned_assets", limit=500)
+    changes = service.get_changes()["incidents"]
+    return {
+        "store": service.get_incident(incident_id).assigned_assets,
+        "query": next(r["assigned_assets"] for r in rows if r["id"] == incident_id),
+        "sync": next(r["assigned_assets"] for r in changes if r["id"] == incident_id),
+    }
+
+
+def test_resolved_incident_keeps_its_assets(service):
+    service.seed_demo_data()
+    service.reload_state()
+    service.assign_asset("BOAT-001", "INC-003")
+    service.assign_asset("HELI-001", "INC-003")
+    service.release_asset("HELI-001")
+    for source, assets in listed(service, "INC-003").items():
+        assert assets == ["BOAT-001"], source
+
+    service.update_incident("INC-003", {"status": "resolved"})
+    assert service.get_asset("BOAT-001").status == "available"
+    for source, assets in listed(service, "INC-003").items():
+        assert sorted(assets) == ["BOAT-001", "HELI-001"], source
+
+    # The released asset can serve another incident; the history stays
+    service.assign_asset("BOAT-001", "INC-004")
+    service.reload_state()
+    assert sorted(service.get_incident("INC-003").assigned_assets) == ["BOAT-001", "HELI-001"]
+    assert "BOAT-001" in service.get_incident("INC-004").assigned_assets
+
+    # Reopened, it lists only what is assigned to it now
+    service.update_incident("INC-003", {"status": "active"})
+    assert service.get_incident("INC-003").assigned_assets == []
+
+
+def test_upgrade_keeps_live_assignments(tmp_path):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE assignments (asset_id VARCHAR PRIMARY KEY, "
+                          "incident_id VARCHAR NOT NULL, assigned_at DATETIME)"))
+        conn.execute(text("CREATE INDEX ix_assignments_incident_id ON assignments (incident_id, asset_id)"))
+        conn.execute(text("INSERT INTO assignments VALUES ('BOAT-001', 'INC-001', '2026-10-01 00:00:00.000000')"))
+    migrate_database(engine)
+    migrate_database(engine)
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT asset_id, incident_id, released_at FROM assignments")).all()
+    assert rows == [("BOAT-001", "INC-001", None)]
+
+    service = DataFeedService()
+    service.get_db = sessionmaker(bind=engine)
+    service.seed_demo_data()
+    service.reload_state()
+    assert service.get_incident("INC-001").assigned_assets == ["BOAT-001"]
+    engine.dispose()
+
+
+def test_archived_incident_keeps_its_assets(service):
+    service.seed_demo_data()
+    service.reload_state()
+    service.assign_asset("BOAT-001", "INC-003")
+    service.update_incident("INC-003", {"status": "resolved"})
+    assert service.archive_resolved_incidents(datetime.utcnow() + timedelta(minutes=1)) == 1
+
+    db = service.get_db()
+    try:
+        rows, _ = incident_archive_service.query_history(db, fields="id,assigned_assets")
+        remaining = db.execute(text("SELECT COUNT(*) FROM assignments WHERE incident_id = 'INC-003'")).scalar()
+    finally:
+        db.close()
+    assert rows == [{"id": "INC-003", "assigned_assets": ["BOAT-001"]}]
+    assert remaining == 0
@@ -0,0 +1,74 @@
+"""Optimistic locking: stale versions conflict, and retries recover from changes made elsewhere."""
+import asyncio
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Priority
+from app.services.concurrency import ConcurrencyConflict, retry_on_conflict
+from app.services.data_feeds import DataFeedService
+
+from .conftest import make_incident
+
+
+@pytest.fixture
+def other_process(engine) -> DataFeedService:
+    """A second service with its own state store on the same database, like another worker."""
+    service = DataFeedService()
+    service.get_db = sessionmaker(bind=engine)
+    service.reload_state()
+    return service
+
+
+def test_stale_version_conflicts(service):
+    incident = service.add_incident(make_incident())
+    updated = service.update_incident(incident.id, {"affected_count": 3}, expected_version=incident.version)
+    assert updated.version == incident.version + 1
+
+    with pytest.raises(ConcurrencyConflict) as caught:
+        service.update_incident(incident.id, {"affected_count": 5}, expected_version=incident.version)
+    assert caught.value.current_version == updated.version
+    assert service.get_incident(incident.id).affected_count == 3
+
+
+def test_retry_sees_a_change_made_by_another_process(service, other_process):
+    incident = service.add_incident(make_incident(priority=Priority.LOW))
+    other_process.reload_state()
+    other_process.update_incident(incident.id, {"priority": Priority.CRITICAL})
+    # This process's store still holds the old version
+    assert service.get_incident(incident.id).version == incident.version
+
+    seen = []
+
+    async def attempt():
+        current = service.get_incident(incident.id)
+        seen.append(current.priority)
+        return service.update_incident(incident.id, {"affected_count": current.affected_count + 1},
+                                       expected_version=current.version)
+
+    result = asyncio.run(retry_on_conflict(attempt, attempts=3))
+    assert seen == [Priority.LOW, Priority.CRITICAL]
+    assert result.priority == Priority.CRITICAL and result.affected_count == 2
+
+
+def test_asset_conflict_refreshes_the_store(service, other_process):
+    service.seed_demo_data()
+    service.reload_state()
+    other_process.reload_state()
+    asset = service.get_all_assets()[0]
+    changed = other_process.update_asset(asset.id, {"status": "maintenance"}, expected_version=asset.version)
+
+    with pytest.raises(ConcurrencyConflict):
+        service.update_asset(asset.id, {"status": "available"}, expected_version=asset.version)
+    held = service.get_asset(asset.id)
+    assert (held.version, held.status) == (changed.version, "maintenance")
+
+
+def test_stale_version_returns_409(client):
+    incident = client.get("/api/incidents/INC-003").json()
+    body = {"affected_count": incident["affected_count"] + 1, "version": incident["version"]}
+    assert client.patch("/api/incidents/INC-003", json=body).status_code == 200
+
+    response = client.patch("/api/incidents/INC-003", json=body)
+    assert response.status_code == 409
+    assert response.json()["current_version"] == incident["version"] + 1
@@ -0,0 +1,49 @@
+"""Response-time sketches from several workers add up in the database."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+
+from app.database import SessionLocal
+from app.db_models import ResponseSketchDB
+from app.services.response_times import FIRST_ASSIGNMENT, ResponseTimeService
+
+from .conftest import make_incident
+
+
+def count(service: ResponseTimeService) -> int:
+    return service.get_percentiles()["metrics"][FIRST_ASSIGNMENT]["overall"]["count"]
+
+
+def test_flushes_from_two_workers_merge(client):
+    db = SessionLocal()
+    db.execute(delete(ResponseSketchDB))
+    db.commit()
+    db.close()
+
+    incident = make_incident(reported_at=datetime.utcnow() - timedelta(minutes=30))
+    first, second = ResponseTimeService(), ResponseTimeService()
+    first.load(), second.load()
+    for _ in range(3):
+        first.observe(FIRST_ASSIGNMENT, incident, ["boat"])
+    for _ in range(2):
+        second.observe(FIRST_ASSIGNMENT, incident, ["helicopter"])
+
+    assert client.portal.call(first.flush) == 3
+    assert client.portal.call(second.flush) == 3
+    # The second flush merged on top of the first, and now sees it
+    assert (count(first), count(second)) == (3, 5)
+
+    first.observe(FIRST_ASSIGNMENT, incident)
+    client.portal.call(first.flush)
+    assert client.portal.call(first.flush) == 0
+    assert count(first) == 6
+    # Its flush re-read every slice, including one only the second worker observed
+    by_asset_type = first.get_percentiles("asset_type")["metrics"][FIRST_ASSIGNMENT]["by_asset_type"]
+    assert {k: v["count"] for k, v in by_asset_type.items()} == {"boat": 3, "helicopter": 2}
+
+    restarted = ResponseTimeService()
+    restarted.load()
+    summary = restarted.get_percentiles("asset_type")["metrics"][FIRST_ASSIGNMENT]
+    assert summary["overall"]["count"] == 6
+    assert {k: v["count"] for k, v in summary["by_asset_type"].items()} == {"boat": 3, "helicopter": 2}
+    assert 29 <= summary["overall"]["p50_mins"] <= 31
@@ -0,0 +1,81 @@
+"""Incrementally maintained incident rollups always match a full rebuild."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import IncidentType, Priority
+from app.services.rollups import rebuild_incident_rollups
+
+from .conftest import make_incident
+
+_ROWS = "SELECT hour, type, priority, reported, resolved, resolution_minutes FROM incident_rollups"
+
+
+def rollups(engine) -> dict:
+    with engine.connect() as conn:
+        return {row[:3]: row[3:] for row in conn.exec_driver_sql(_ROWS)}
+
+
+def rebuilt(engine) -> dict:
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        rebuild_incident_rollups(cursor)
+        rows = {row[:3]: row[3:] for row in cursor.execute(_ROWS)}
+        raw.rollback()
+    finally:
+        raw.close()
+    return rows
+
+
+def assert_matches_rebuild(engine):
+    incremental, expected = rollups(engine), rebuilt(engine)
+    assert incremental.keys() == expected.keys()
+    for key, (reported, resolved, minutes) in expected.items():
+        assert incremental[key][:2] == (reported, resolved), key
+        # julianday() arithmetic in the rebuild is good to about a millisecond
+        assert incremental[key][2] == pytest.approx(minutes, rel=1e-6, abs=1e-6), key
+
+
+def test_report_resolve_reopen_and_delete(service, engine):
+    t0 = datetime(2026, 9, 28, 10, 15)
+    first = service.add_incident(make_incident(reported_at=t0))
+    second = service.add_incident(make_incident(IncidentType.EVACUATION, Priority.LOW,
+                                                reported_at=t0 + timedelta(hours=1)))
+    assert_matches_rebuild(engine)
+
+    service.update_incident(first.id, {"status": "resolved", "resolved_at": t0 + timedelta(hours=2, minutes=5)})
+    service.update_incident(second.id, {"status": "resolved"})
+    assert_matches_rebuild(engine)
+
+    # Reopened with a new type and priority: both buckets come back out under the old ones
+    service.update_incident(first.id, {"status": "active", "type": IncidentType.MEDICAL_EMERGENCY,
+                                       "priority": Priority.CRITICAL})
+    assert_matches_rebuild(engine)
+
+    service.update_incident(first.id, {"status": "resolved", "resolved_at": t0 + timedelta(hours=3)})
+    service.delete_incident(second.id)
+    assert_matches_rebuild(engine)
+
+    service.delete_incident(first.id)
+    assert rollups(engine) == {}
+
+
+def test_priority_change_and_merge_escalation(service, engine):
+    t0 = datetime(2026, 9, 28, 10, 15)
+    incident = service.add_incident(make_incident(priority=Priority.LOW, reported_at=t0))
+    service.update_incident(incident.id, {"priority": Priority.MEDIUM})
+    assert_matches_rebuild(engine)
+
+    merged, was_merged = service.report_incident(make_incident(priority=Priority.CRITICAL,
+                                                               reported_at=t0 + timedelta(minutes=5)))
+    assert was_merged and merged.id == incident.id and merged.priority == Priority.CRITICAL
+    assert_matches_rebuild(engine)
+
+
+def test_archived_resolutions_stay_counted(service, engine):
+    t0 = datetime(2026, 9, 28, 10, 15)
+    incident = service.add_incident(make_incident(reported_at=t0))
+    service.update_incident(incident.id, {"status": "resolved", "resolved_at": t0 + timedelta(minutes=40)})
+    assert service.archive_resolved_incidents(t0 + timedelta(days=1)) == 1
+    assert_matches_rebuild(engine)
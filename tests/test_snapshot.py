@@ -0,0 +1,85 @@
+"""Snapshots round-trip the operational state, tombstones and versions included."""
+import io
+from datetime import datetime
+
+import pytest
+
+from app.db_models import UserDB
+from app.services.snapshot import restore_snapshot, write_snapshot
+from app.services.telemetry import telemetry_service
+from app.utils.security import get_current_user
+
+from .conftest import make_incident
+
+_INCIDENT_COLUMNS = "id, type, priority, description, affected_count, status, reported_at"
+
+
+def rows(engine, sql: str) -> list:
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(sql).fetchall()
+
+
+def test_round_trip_with_tombstones_and_versions(service, engine):
+    service.seed_demo_data()
+    service.reload_state()
+    kept = service.add_incident(make_incident(description="Kept"))
+    service.update_incident(kept.id, {"affected_count": 4})
+    service.delete_incident("INC-006")
+
+    buffer = io.BytesIO()
+    written = write_snapshot(buffer, engine)
+    incidents = rows(engine, f"SELECT {_INCIDENT_COLUMNS} FROM incidents ORDER BY id")
+    tombstones = rows(engine, "SELECT entity, entity_id FROM tombstones")
+    assert ("incident", "INC-006") in tombstones
+
+    # Changes after the snapshot that the restore must undo
+    since = service.get_changes()["version"]
+    added = service.add_incident(make_incident(description="After the snapshot"))
+    asset = service.get_all_assets()[0]
+    bumped = service.update_asset(asset.id, {"status": "maintenance"})
+    max_version = max(bumped.version, service.get_incident(kept.id).version)
+
+    buffer.seek(0)
+    restored = service.replace_all(restore_snapshot, buffer, engine)
+    assert restored == written
+    assert rows(engine, f"SELECT {_INCIDENT_COLUMNS} FROM incidents ORDER BY id") == incidents
+
+    # Old tombstones are kept and ids created after the snapshot get new ones
+    assert set(tombstones) < set(rows(engine, "SELECT entity, entity_id FROM tombstones"))
+    changes = service.get_changes(since)
+    assert changes["deleted"]["incidents"] == [added.id]
+    assert {i["id"] for i in changes["incidents"]} == {i[0] for i in incidents}
+
+    # Versions move past everything issued before, so stale writers conflict
+    assert all(v > max_version for (v,) in rows(engine, "SELECT version FROM incidents UNION ALL "
+                                                        "SELECT version FROM assets"))
+    assert service.get_asset(asset.id).status == asset.status
+    assert service.get_asset(asset.id).version > bumped.version
+    assert service.get_incident(added.id) is None
+    assert service.get_incident(kept.id).affected_count == 4
+
+
+def test_snapshot_routes_require_admin(client, auth_headers):
+    client.app.dependency_overrides[get_current_user] = lambda: UserDB(username="viewer", role="viewer")
+    try:
+        assert client.get("/api/snapshot", headers=auth_headers).status_code == 403
+        assert client.post("/api/snapshot/restore", content=b"HOPSNAP1", headers=auth_headers).status_code == 403
+    finally:
+        client.app.dependency_overrides.clear()
+
+
+def test_restore_discards_pending_telemetry(client, auth_headers):
+    snapshot = client.get("/api/snapshot", headers=auth_headers)
+    assert snapshot.status_code == 200
+    before = client.get("/api/assets/VEH-001").json()["location"]
+
+    fix = {"asset_id": "VEH-001", "latitude": 27.5, "longitude": -82.5, "recorded_at": datetime.utcnow().isoformat()}
+    assert client.post("/api/telemetry", json={"fixes": [fix]}).json()["accepted"] == 1
+    assert telemetry_service.get_stats()["pending"] >= 1
+
+    response = client.post("/api/snapshot/restore", content=snapshot.content, headers=auth_headers)
+    assert response.status_code == 200
+    assert telemetry_service.get_stats()["pending"] == 0
+    assert client.portal.call(telemetry_service.flush) == 0
+    location = client.get("/api/assets/VEH-001").json()["location"]
+    assert (location["latitude"], location["longitude"]) == pytest.approx((before["latitude"], before["longitude"]))
@@ -0,0 +1,62 @@
+"""Position fixes: newest wins, and a fix from the future is dropped rather than pinning its asset."""
+from datetime import datetime, timedelta
+
+from app.config import settings
+
+
+def fix(asset_id: str, latitude: float, recorded_at: datetime) -> dict:
+    return {"asset_id": asset_id, "latitude": latitude, "longitude": -82.5, "recorded_at": recorded_at.isoformat()}
+
+
+def position(client, asset_id: str) -> dict:
+    return {p["asset_id"]: p for p in client.get("/api/assets/positions").json()}[asset_id]
+
+
+def test_future_fixes_are_dropped(client):
+    now = datetime.utcnow()
+    skew = timedelta(seconds=settings.TELEMETRY_MAX_CLOCK_SKEW_SECONDS)
+    result = client.post("/api/telemetry", json={"fixes": [
+        fix("BOAT-002", 10.0, now + skew + timedelta(minutes=5)),
+        {**fix("BOAT-002", 11.0, now), "recorded_at": f"{(now + timedelta(days=1)).isoformat()}+00:00"},
+        fix("BOAT-002", 27.90, now - timedelta(seconds=1)),
+        fix("HELI-002", 27.95, now + skew / 2),
+    ]}).json()
+    assert result == {"accepted": 2, "coalesced": 0, "stale": 0, "unknown": [], "future": ["BOAT-002"]}
+    assert position(client, "BOAT-002")["latitude"] == 27.90
+
+    # The dropped fix did not pin the asset against fixes recorded before it
+    result = client.post("/api/telemetry", json={"fixes": [fix("BOAT-002", 27.91, datetime.utcnow())]}).json()
+    assert result["accepted"] == 1 and result["stale"] == 0
+    assert position(client, "BOAT-002")["latitude"] == 27.91
+
+
+def test_stale_and_superseded_fixes_are_dropped(client):
+    now = datetime.utcnow()
+    result = client.post("/api/telemetry", json={"fixes": [
+        fix("HELI-001", 27.95, now), fix("HELI-001", 27.90, now - timedelta(seconds=30))
+    ]}).json()
+    assert result == {"accepted": 1, "coalesced": 1, "stale": 0, "unknown": [], "future": []}
+
+    result = client.post("/api/telemetry", json={"fixes": [
+        fix("HELI-001", 1.0, now - timedelta(minutes=1)), fix("NOPE", 1.0, now)
+    ]}).json()
+    assert result == {"accepted": 0, "coalesced": 0, "stale": 1, "unknown": ["NOPE"], "future": []}
+    assert position(client, "HELI-001")["latitude"] == 27.95
+
+
+def test_move_into_another_zone_changes_the_etag(service):
+    service.seed_demo_data()
+    service.reload_state()
+    boat, vehicle = service.get_asset("BOAT-001"), service.get_asset("VEH-002")
+    assert boat.flood_zone != vehicle.flood_zone
+    etag = service.get_etag("incidents", "assets")
+
+    now = datetime.utcnow()
+    service.move_assets([boat.id], [boat.location.latitude + 1e-5], [boat.location.longitude], [now])
+    assert service.get_etag("incidents", "assets") == etag
+
+    before = service.get_flood_zone_summary()
+    service.move_assets([boat.id], [vehicle.location.latitude], [vehicle.location.longitude],
+                        [now + timedelta(seconds=1)])
+    assert service.get_etag("incidents", "assets") != etag
+    assert service.get_flood_zone_summary() != before